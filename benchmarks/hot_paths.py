@@ -0,0 +1,113 @@
+"""Benchmarks of the hot paths, each built from seeded inputs.
+
+Every benchmark is a setup function taking a ``random.Random`` and
+returning ``(run, operations)``: ``run()`` does one batch of work and
+``operations`` is the number of operations in the batch.
+"""
+from pokerhands.card import Card
+from pokerhands.deck import Deck
+from pokerhands.equity import exact_equity, monte_carlo_equity
+from pokerhands.hand import Hand
+
+BATCH = 1000
+FIND_BEST_HAND_SIZES = (5, 6, 7, 9, 13, 20, 30, 52)
+
+
+def _hands(rng, number_of_cards, count=BATCH):
+    return [sorted(rng.sample(range(52), number_of_cards)) for _ in range(count)]
+
+
+def hand_rank(rng):
+    codes = _hands(rng, 5)
+
+    def run():
+        # Fresh hands each time, so the cached ranking is not what is timed
+        for hand_codes in codes:
+            Hand.from_codes(hand_codes).get_hand_rank()
+
+    return run, len(codes)
+
+
+def describe_hand_rank(rng):
+    codes = _hands(rng, 5)
+
+    def run():
+        for hand_codes in codes:
+            Hand.from_codes(hand_codes).describe_hand_rank()
+
+    return run, len(codes)
+
+
+def compare_to(rng):
+    codes = _hands(rng, 5, 2 * BATCH)
+    pairs = list(zip(codes[::2], codes[1::2]))
+
+    def run():
+        for first, second in pairs:
+            Hand.from_codes(first).compare_to(Hand.from_codes(second))
+
+    return run, len(pairs)
+
+
+def _find_best_hand(number_of_cards):
+    def setup(rng):
+        count = max(BATCH * 7 // number_of_cards, 50)
+        hands = [
+            [Card.from_code(code) for code in codes]
+            for codes in _hands(rng, number_of_cards, count)
+        ]
+
+        def run():
+            for cards in hands:
+                Hand(cards).find_best_hand()
+
+        return run, len(hands)
+
+    return setup
+
+
+def deck_pick(rng):
+    def run():
+        for _ in range(BATCH):
+            Deck(rng).pick(5)
+
+    return run, BATCH
+
+
+def monte_carlo(rng):
+    holes = [
+        [Card.from_code(code) for code in codes]
+        for codes in ((48, 49), (44, 45), (30, 34))
+    ]
+    seed = rng.getrandbits(32)
+
+    def run():
+        monte_carlo_equity(holes, trials=2000, seed=seed, workers=1)
+
+    return run, 2000
+
+
+def exact_flop(rng):
+    codes = rng.sample(range(52), 8)
+    holes = [
+        [Card.from_code(code) for code in codes[start : start + 2]] for start in (0, 2)
+    ]
+    board = [Card.from_code(code) for code in codes[4:7]]
+
+    def run():
+        exact_equity(holes, board=board)
+
+    # Every turn and river card after the flop
+    return run, 990
+
+
+BENCHMARKS = {
+    "hand.get_hand_rank": hand_rank,
+    "hand.describe_hand_rank": describe_hand_rank,
+    "hand.compare_to": compare_to,
+    "deck.pick": deck_pick,
+    "equity.monte_carlo": monte_carlo,
+    "equity.exact_flop": exact_flop,
+}
+for _size in FIND_BEST_HAND_SIZES:
+    BENCHMARKS["hand.find_best_hand.{}".format(_size)] = _find_best_hand(_size)
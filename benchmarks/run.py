@@ -0,0 +1,136 @@
+"""Run the benchmarks and compare them with a stored baseline.
+
+    python -m benchmarks.run                       # run and compare
+    python -m benchmarks.run --save-baseline       # record a new baseline
+    python -m benchmarks.run -k find_best_hand -o results.json
+
+Each benchmark is timed as ``repeat`` batches after a warm-up batch. The
+throughput is the operations of a batch over its fastest time.
+``batch_p50_us`` and ``batch_p95_us`` are percentiles over the batches of
+their mean time per operation, not of single calls: they show how steady
+the batches were, while pokerhands.instrument samples real per-call
+latencies. A benchmark regresses when its throughput falls more than its
+threshold below the baseline: ``--threshold`` by default, or the value
+stored for it under ``"thresholds"`` in the baseline file. The exit status
+is 1 if any benchmark regressed.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from .hot_paths import BENCHMARKS
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 0.2
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(fraction * len(values)), len(values) - 1)]
+
+
+def run_benchmark(setup, seed=0, repeat=7):
+    run, operations = setup(random.Random(seed))
+    run()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    batch_means = [elapsed / operations * 1e6 for elapsed in times]
+    return {
+        "operations": operations,
+        "ops_per_sec": operations / min(times),
+        "batch_p50_us": _percentile(batch_means, 0.5),
+        "batch_p95_us": _percentile(batch_means, 0.95),
+    }
+
+
+def run_benchmarks(names, seed=0, repeat=7):
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": {
+            name: run_benchmark(BENCHMARKS[name], seed, repeat) for name in names
+        },
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return (name, baseline ops/s, ops/s, change) for every regression."""
+    thresholds = baseline.get("thresholds", {})
+    regressions = []
+    for name, result in results["results"].items():
+        if name not in baseline.get("results", {}):
+            continue
+        expected = baseline["results"][name]["ops_per_sec"]
+        change = result["ops_per_sec"] / expected - 1
+        if change < -thresholds.get(name, threshold):
+            regressions.append((name, expected, result["ops_per_sec"], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument("-k", "--filter", default="", help="run names containing this")
+    parser.add_argument("-o", "--output", help="write the results as JSON here")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if arguments.filter in name]
+    results = run_benchmarks(names, arguments.seed, arguments.repeat)
+    for name, result in results["results"].items():
+        print(
+            "{:32} {:>12,.0f} ops/s  batch p50 {:>9.2f}us  p95 {:>9.2f}us".format(
+                name,
+                result["ops_per_sec"],
+                result["batch_p50_us"],
+                result["batch_p95_us"],
+            )
+        )
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+
+    if arguments.save_baseline:
+        thresholds = {}
+        if os.path.exists(arguments.baseline):
+            with open(arguments.baseline) as baseline_file:
+                thresholds = json.load(baseline_file).get("thresholds", {})
+        with open(arguments.baseline, "w") as baseline_file:
+            json.dump(
+                dict(results, thresholds=thresholds),
+                baseline_file,
+                indent=2,
+                sort_keys=True,
+            )
+            baseline_file.write("\n")
+        return 0
+
+    if not os.path.exists(arguments.baseline):
+        print("No baseline at {}".format(arguments.baseline))
+        return 0
+    with open(arguments.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = compare(results, baseline, arguments.threshold)
+    for name, expected, actual, change in regressions:
+        print(
+            "REGRESSION {}: {:,.0f} ops/s against {:,.0f} ({:+.1%})".format(
+                name, actual, expected, change
+            )
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,257 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
 import logging
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from pokerhands import instrument
+from pokerhands.card import parse_cards
+from pokerhands.eval import class_category
+from pokerhands.showdown import rank_players
 
-logFormatter = logging.Formatter(
-    "%(asctime)s [%(threadName)-12.12s] [%(levelname)-5.5s]  %(message)s"
-)
 log = logging.getLogger()
-log.setLevel(logging.DEBUG)
 
-consoleHandler = logging.StreamHandler(sys.stdout)
-consoleHandler.setFormatter(logFormatter)
-log.addHandler(consoleHandler)
+# Deals ranked per task, and tasks in flight per worker, which together bound
+# the memory used however large the input is
+DEFAULT_CHUNK_SIZE = 5000
+CHUNKS_PER_WORKER = 2
+
+
+def _deal(deal_id, board, holes):
+    board = parse_cards(board)
+    holes = [parse_cards(hole) for hole in holes]
+    if not holes:
+        raise ValueError("A deal needs at least one player")
+    codes = board + [code for hole in holes for code in hole]
+    if len(set(codes)) != len(codes):
+        raise ValueError("A card may only be dealt once")
+    if any(len(board) + len(hole) < 5 for hole in holes):
+        raise ValueError("Every player needs at least 5 cards with the board")
+    return deal_id, board, holes
+
+
+def _lines(lines):
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line_number, line
+
+
+def _csv_rows(lines):
+    for line_number, row in enumerate(csv.reader(lines), 1):
+        if row and not (line_number == 1 and row[0].strip().lower() == "id"):
+            yield line_number, row
+
+
+def _text_deal(line_number, line):
+    # board | hole | hole ..., or the cards of a single hand
+    parts = line.split("|")
+    if len(parts) == 1:
+        return _deal(line_number, "", parts)
+    return _deal(line_number, parts[0], parts[1:])
+
+
+def _csv_deal(line_number, row):
+    # id, board, hole, hole, ... with an optional header row
+    return _deal(
+        row[0], row[1] if len(row) > 1 else "", [hole for hole in row[2:] if hole]
+    )
+
+
+def _ndjson_deal(line_number, line):
+    # {"id": ..., "board": ..., "players": [...]} or {"id": ..., "cards": ...}
+    record = json.loads(line)
+    if "cards" in record:
+        return _deal(record.get("id", line_number), "", [record["cards"]])
+    return _deal(
+        record.get("id", line_number),
+        record.get("board", ""),
+        record.get("players", []),
+    )
+
+
+_FORMATS = {
+    "text": (_lines, _text_deal),
+    "csv": (_csv_rows, _csv_deal),
+    "ndjson": (_lines, _ndjson_deal),
+}
+
+
+def read_deals(lines, input_format, strict=False):
+    """Lazily yield (id, board codes, hole codes) for every deal in lines.
+
+    Lines that do not hold a valid deal are logged and skipped, or raise
+    ValueError when ``strict``.
+    """
+    records, parse = _FORMATS[input_format]
+    for line_number, record in records(lines):
+        try:
+            yield parse(line_number, record)
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            if strict:
+                raise ValueError("Line {}: {}".format(line_number, error)) from None
+            log.warning("Skipping line %d: %s", line_number, error)
+
+
+def rank_deals(deals):
+    """Return one NDJSON result line per deal: classes, ranks and winners."""
+    lines = []
+    for deal_id, board, holes in deals:
+        classes = rank_players(holes, board)
+        best = min(classes)
+        lines.append(
+            json.dumps(
+                {
+                    "id": deal_id,
+                    "classes": classes,
+                    "ranks": [class_category(eq_class) for eq_class in classes],
+                    "winners": [
+                        player
+                        for player, eq_class in enumerate(classes)
+                        if eq_class == best
+                    ],
+                }
+            )
+            + "\n"
+        )
+    return lines
+
+
+def _chunks(deals, chunk_size):
+    while True:
+        chunk = list(islice(deals, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def process(
+    lines, output, input_format, chunk_size=DEFAULT_CHUNK_SIZE, workers=1, strict=False
+):
+    """Rank every deal in lines, writing results to output as they are ready.
+
+    Deals are ranked in chunks of ``chunk_size``, on a pool of ``workers``
+    processes when there is more than one, with at most a few chunks in
+    flight per worker so memory stays bounded. Results keep the input order.
+    Returns the number of deals ranked.
+    """
+    chunks = _chunks(read_deals(lines, input_format, strict), chunk_size)
+    count = 0
+    if workers == 1:
+        for chunk in chunks:
+            output.writelines(rank_deals(chunk))
+            count += len(chunk)
+        return count
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for chunk in chunks:
+            pending.append((len(chunk), executor.submit(rank_deals, chunk)))
+            if len(pending) >= workers * CHUNKS_PER_WORKER:
+                size, future = pending.pop(0)
+                output.writelines(future.result())
+                count += size
+        for size, future in pending:
+            output.writelines(future.result())
+            count += size
+    return count
+
+
+def _input_format(path, input_format):
+    if input_format != "auto":
+        return input_format
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".ndjson", ".jsonl"):
+        return "ndjson"
+    if extension == ".csv":
+        return "csv"
+    return "text"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Rank poker hands and pick the winners of every deal."
+    )
+    parser.add_argument("input", nargs="?", default="-", help="input file, - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output file, - for stdout")
+    parser.add_argument(
+        "-f", "--format", default="auto", choices=["auto"] + sorted(_FORMATS)
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument(
+        "-w", "--workers", type=int, default=1, help="0 for one per CPU"
+    )
+    parser.add_argument("--strict", action="store_true", help="stop at a bad line")
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="log call counts and latencies of the ranking done in this process",
+    )
+    parser.add_argument("--profile", metavar="FILE", help="write cProfile stats here")
+    arguments = parser.parse_args(argv)
+    workers = arguments.workers or os.cpu_count() or 1
+
+    # Configured here rather than on import, and only when nothing else has
+    # configured logging; stdout is kept for the results when they go there
+    logging.basicConfig(
+        stream=sys.stderr if arguments.output == "-" else sys.stdout,
+        level=logging.DEBUG,
+        format="%(asctime)s [%(threadName)-12.12s] [%(levelname)-5.5s]  %(message)s",
+    )
+    # Open the input first, so a bad input path leaves the output untouched
+    try:
+        if arguments.input == "-":
+            lines = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+        else:
+            lines = open(arguments.input, encoding="utf-8", newline="")
+    except OSError as error:
+        log.error("Cannot read %s: %s", arguments.input, error)
+        return 1
+    if arguments.output == "-":
+        output = sys.stdout
+    else:
+        try:
+            output = open(arguments.output, "w", encoding="utf-8")
+        except OSError as error:
+            lines.close()
+            log.error("Cannot write %s: %s", arguments.output, error)
+            return 1
+    if arguments.stats:
+        instrument.enable()
+    profiler = (
+        instrument.profiled(arguments.profile)
+        if arguments.profile
+        else contextlib.nullcontext()
+    )
+    try:
+        with profiler:
+            count = process(
+                lines,
+                output,
+                _input_format(arguments.input, arguments.format),
+                chunk_size=arguments.chunk_size,
+                workers=workers,
+                strict=arguments.strict,
+            )
+    except ValueError as error:
+        log.error("%s", error)
+        return 1
+    finally:
+        lines.close()
+        if output is not sys.stdout:
+            output.close()
+        if arguments.stats:
+            instrument.disable()
+    log.info("Ranked %d deals", count)
+    if arguments.stats:
+        instrument.log_report(log)
+    return 0
+
 
 if __name__ == "__main__":
-    print("Hello world")
+    sys.exit(main())
@@ -0,0 +1,36 @@
+from itertools import permutations
+
+# Every way of relabelling the four suits
+_SUIT_PERMUTATIONS = list(permutations(range(4)))
+
+
+def _relabel(codes, suit_permutation):
+    return tuple(sorted((code & ~3) | suit_permutation[code & 3] for code in codes))
+
+
+def canonical_codes(hole_codes, board_codes=(), dead_codes=()):
+    """Return the suit-normalised form of a deal given as card codes.
+
+    Deals that differ only by a relabelling of the suits, for example AhKh
+    against QsQd and AsKs against QhQc, get the same result. Players keep
+    their order, while the order of cards within a hand, the board and the
+    dead cards does not matter.
+    """
+    best = None
+    for suit_permutation in _SUIT_PERMUTATIONS:
+        key = (
+            tuple(_relabel(hole, suit_permutation) for hole in hole_codes),
+            _relabel(board_codes, suit_permutation),
+            _relabel(dead_codes, suit_permutation),
+        )
+        if best is None or key < best:
+            best = key
+    return best
+
+
+def canonical_key(hole_cards, board=None, dead_cards=None):
+    return canonical_codes(
+        [[card.code for card in hole] for hole in hole_cards],
+        [card.code for card in board] if board is not None else (),
+        [card.code for card in dead_cards] if dead_cards is not None else (),
+    )
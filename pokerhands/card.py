@@ -1,30 +1,95 @@
 from functools import total_ordering
 
+from .rank import Rank
+from .suit import Suit
+
+# Short names such as "Ah" or "Td": a rank character then a suit character,
+# both in card code order
+_RANK_CHARACTERS = "23456789TJQKA"
+_SUIT_CHARACTERS = "shcd"
+
 
 @total_ordering
 class Card:
-    def __init__(self, rank, suit):
+    """A playing card, one of 52 interned instances.
+
+    ``Card(rank, suit)`` always returns the same object for the same rank and
+    suit, so equality is identity and copies are free. Each card also carries
+    a 6-bit ``code``: the rank index (deuce 0 to ace 12) in the high bits and
+    the suit index in the low two bits.
+    """
+
+    __slots__ = ("rank", "suit", "code")
+
+    def __new__(cls, rank, suit):
         if rank is None:
             raise ValueError("Rank of a Card may not be None")
         if suit is None:
             raise ValueError("Suit of a Card may not be None")
-        self.rank = rank
-        self.suit = suit
+        return _CARDS[(rank.value - 2) * 4 + (suit.value - 1)]
+
+    @staticmethod
+    def from_code(code):
+        return _CARDS[code]
+
+    @staticmethod
+    def parse(text):
+        """Return the card with a short name such as ``"Ah"`` or ``"Td"``."""
+        card = _SHORT_NAMES.get(text)
+        if card is None:
+            raise ValueError("Not a card: {}".format(text))
+        return card
+
+    def short_name(self):
+        return _RANK_CHARACTERS[self.code >> 2] + _SUIT_CHARACTERS[self.code & 3]
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Card is immutable")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return Card, (self.rank, self.suit)
+
+    def __hash__(self):
+        return self.code
 
     def compare_to(self, other):
         return self.rank.value - other.rank.value
 
-    def __eq__(self, other):
-        if not isinstance(other, Card):
-            return False
-        if self is other:
-            return True
-        if self.rank != other.rank:
-            return False
-        return self.suit == other.suit
-
     def __lt__(self, other):
-        return self.compare_to(other) < 0
+        return self.code >> 2 < other.code >> 2
 
     def __str__(self):
         return "{} of {}".format(self.rank, self.suit)
+
+
+def parse_cards(text):
+    """Return the codes of cards written as ``"AhKd"``, ``"Ah Kd"`` or a list
+    of short names."""
+    names = text if isinstance(text, list) else text.split()
+    if any(len(name) != 2 for name in names):
+        text = "".join(names)
+        if len(text) % 2:
+            raise ValueError("Not a list of cards: {}".format(text))
+        names = [text[start : start + 2] for start in range(0, len(text), 2)]
+    return [Card.parse(name).code for name in names]
+
+
+def _intern(rank, suit):
+    card = object.__new__(Card)
+    object.__setattr__(card, "rank", rank)
+    object.__setattr__(card, "suit", suit)
+    object.__setattr__(card, "code", (rank.value - 2) * 4 + (suit.value - 1))
+    return card
+
+
+_CARDS = sorted(
+    (_intern(rank, suit) for rank in Rank for suit in Suit),
+    key=lambda card: card.code,
+)
+_SHORT_NAMES = {card.short_name(): card for card in _CARDS}
@@ -1,26 +1,222 @@
 import random
+from itertools import count as count_from
 
 from .suit import Suit
 from .rank import Rank
 from .card import Card
 
+_ALL_CARDS = tuple(Card(rank, suit) for suit in Suit for rank in Rank)
+
+
+def _draw_function(rng):
+    # Return draw(low, high) giving a uniform int in [low, high) for either a
+    # random.Random-like rng or a numpy.random.Generator
+    if hasattr(rng, "randrange"):
+        return rng.randrange
+    if hasattr(rng, "integers"):
+        return lambda low, high: int(rng.integers(low, high))
+    raise ValueError("rng must provide randrange() or integers()")
+
 
 class Deck:
-    def __init__(self):
-        self._cards = []
-        for suit in Suit:
-            for rank in Rank:
-                self._cards.append(Card(rank, suit))
-        random.shuffle(self._cards)
+    """A deck of the 52 cards, shuffled lazily as cards are picked.
+
+    ``rng`` may be a seeded ``random.Random`` or ``numpy.random.Generator``
+    to make deals replayable; the global ``random`` module is used otherwise.
+    Each pick performs only the Fisher-Yates swaps for the cards it deals,
+    and ``reset`` returns every card to the deck without reallocating.
+    """
+
+    def __init__(self, rng=None):
+        self._draw = _draw_function(rng if rng is not None else random)
+        self._cards = list(_ALL_CARDS)
+        self._dealt = 0
+
+    def reset(self):
+        self._cards[:] = _ALL_CARDS
+        self._dealt = 0
+
+    def number_of_cards(self):
+        return len(self._cards) - self._dealt
+
+    def pick(self, number_of_cards):
+        if number_of_cards < 0:
+            raise ValueError("Cannot pick a negative number of cards")
+        start = self._dealt
+        end = start + number_of_cards
+        size = len(self._cards)
+        if end > size:
+            raise NotEnoughCardsException(
+                "Cannot pick {} card(s) from a deck of {}".format(
+                    number_of_cards, self.number_of_cards()
+                )
+            )
+        cards = self._cards
+        draw = self._draw
+        for index in range(start, end):
+            swap = draw(index, size)
+            cards[index], cards[swap] = cards[swap], cards[index]
+        self._dealt = end
+        return cards[start:end]
+
+    @classmethod
+    def deal_stream(
+        cls, number_of_players, cards_each, board=5, seed=None, count=None, rng=None
+    ):
+        """Lazily yield deals as (hole codes per player, board codes).
+
+        Every deal comes from one reused deck driven by ``rng``, or by a
+        ``random.Random(seed)``, so a seed replays the same stream. Yields
+        ``count`` deals, or forever when ``count`` is None.
+        """
+        cards_needed = _cards_needed(number_of_players, cards_each, board)
+        deck = cls(rng if rng is not None else random.Random(seed))
+        holes_end = number_of_players * cards_each
+        for _ in count_from() if count is None else range(count):
+            deck.reset()
+            codes = [card.code for card in deck.pick(cards_needed)]
+            holes = tuple(
+                tuple(codes[start : start + cards_each])
+                for start in range(0, holes_end, cards_each)
+            )
+            yield holes, tuple(codes[holes_end:])
+
+    @staticmethod
+    def deal_arrays(
+        number_of_players, cards_each, board=5, chunk_size=65536, seed=None, count=None
+    ):
+        """Lazily yield deals in chunks as NumPy arrays of card codes.
+
+        Each chunk is a ``(rows, number_of_players * cards_each + board)``
+        int8 array holding every player's hole cards in turn followed by the
+        board, ready for ``pokerhands.eval.batch``. The same buffer is
+        refilled for every chunk, so copy a chunk to keep it. Requires numpy.
+        """
+        import numpy as np
+
+        width = _cards_needed(number_of_players, cards_each, board)
+        rng = np.random.default_rng(seed)
+        deals = np.empty((chunk_size, width), dtype=np.int8)
+        remaining = count
+        while remaining is None or remaining > 0:
+            rows = chunk_size if remaining is None else min(chunk_size, remaining)
+            # Sorting uniform keys gives an independent permutation per row
+            keys = rng.random((rows, 52))
+            deals[:rows] = np.argsort(keys, axis=1)[:, :width]
+            yield deals[:rows]
+            if remaining is not None:
+                remaining -= rows
+
+
+class Shoe:
+    """One or more decks that known cards can be taken out of in O(1).
+
+    The remaining cards are kept as a dense list of codes together with the
+    positions of every copy of each card, so ``remove`` swaps the card with
+    the last one instead of scanning, and ``contains`` and ``count`` are
+    lookups. ``get_mask`` returns a 52-bit mask of the cards still present.
+    """
+
+    def __init__(self, number_of_decks=1, rng=None):
+        if number_of_decks < 1:
+            raise ValueError("A shoe needs at least one deck")
+        self._number_of_decks = number_of_decks
+        self._draw = _draw_function(rng if rng is not None else random)
+        self.reset()
+
+    def reset(self):
+        self._codes = [code for code in range(52) for _ in range(self._number_of_decks)]
+        self._positions = [[] for _ in range(52)]
+        for index, code in enumerate(self._codes):
+            self._positions[code].append(index)
+        self._mask = (1 << 52) - 1
+
+    def number_of_decks(self):
+        return self._number_of_decks
 
     def number_of_cards(self):
-        return len(self._cards)
+        return len(self._codes)
+
+    def count(self, card):
+        return len(self._positions[card.code])
+
+    def contains(self, card):
+        return bool(self._positions[card.code])
+
+    def __contains__(self, card):
+        return self.contains(card)
+
+    def get_mask(self):
+        return self._mask
+
+    def remaining_codes(self):
+        return list(self._codes)
+
+    def remove(self, card):
+        if not self._positions[card.code]:
+            raise ValueError("The {} is not in the shoe".format(card))
+        self._remove_code(card.code)
+
+    def _remove_code(self, code):
+        positions = self._positions[code]
+        index = positions.pop()
+        last = self._codes.pop()
+        if index < len(self._codes):
+            # Fill the gap with the last card and record where it moved
+            self._codes[index] = last
+            moved = self._positions[last]
+            moved[moved.index(len(self._codes))] = index
+        if not positions:
+            self._mask &= ~(1 << code)
 
     def pick(self, number_of_cards):
-        picked_cards = self._cards[:number_of_cards]
-        del self._cards[:number_of_cards]
+        if number_of_cards < 0:
+            raise ValueError("Cannot pick a negative number of cards")
+        if number_of_cards > len(self._codes):
+            raise NotEnoughCardsException(
+                "Cannot pick {} card(s) from a shoe of {}".format(
+                    number_of_cards, len(self._codes)
+                )
+            )
+        picked_cards = []
+        for _ in range(number_of_cards):
+            code = self._codes[self._draw(0, len(self._codes))]
+            self._remove_code(code)
+            picked_cards.append(Card.from_code(code))
         return picked_cards
 
+    def sample_codes(self, number_of_cards):
+        # Draw without replacement, leaving the shoe untouched
+        if number_of_cards < 0:
+            raise ValueError("Cannot sample a negative number of cards")
+        if number_of_cards > len(self._codes):
+            raise NotEnoughCardsException(
+                "Cannot sample {} card(s) from a shoe of {}".format(
+                    number_of_cards, len(self._codes)
+                )
+            )
+        codes = self._codes[:]
+        size = len(codes)
+        draw = self._draw
+        for index in range(number_of_cards):
+            swap = draw(index, size)
+            codes[index], codes[swap] = codes[swap], codes[index]
+        return codes[:number_of_cards]
+
+    def sample(self, number_of_cards):
+        return [Card.from_code(code) for code in self.sample_codes(number_of_cards)]
+
+
+def _cards_needed(number_of_players, cards_each, board):
+    cards_needed = number_of_players * cards_each + board
+    if cards_needed > len(_ALL_CARDS):
+        raise NotEnoughCardsException(
+            "Cannot deal {} card(s) from a deck of {}".format(
+                cards_needed, len(_ALL_CARDS)
+            )
+        )
+    return cards_needed
+
 
 class NotEnoughCardsException(Exception):
     def __init__(self, message):
@@ -0,0 +1,377 @@
+import math
+import os
+import random
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from .canonical import canonical_key
+from .card import Card
+from .deck import NotEnoughCardsException, Shoe
+from .eval import NUMBER_OF_CLASSES, best_class
+from .eval.seven_card import (
+    FLUSH_BITS,
+    FLUSH_CARRY,
+    RANK_KEYS,
+    SUIT_FIELDS,
+    flush_suit,
+    get_seven_card_tables,
+)
+
+# Trials are split into fixed-size chunks, each with its own RNG stream
+# derived from the seed, so results do not depend on the number of workers
+CHUNK_TRIALS = 5000
+
+
+class EquityResult:
+    """Win, tie and loss counts per player over a number of runouts.
+
+    A player's equity is their average share of the pot, a tied runout
+    paying each of its k winners 1/k. An ``exact`` result covers every
+    possible runout and so has no sampling error.
+    """
+
+    def __init__(
+        self, trials, wins, ties, losses, equity_sums, equity_squares, exact=False
+    ):
+        self.trials = trials
+        self.exact = exact
+        self.wins = wins
+        self.ties = ties
+        self.losses = losses
+        self._equity_sums = equity_sums
+        self._equity_squares = equity_squares
+
+    def number_of_players(self):
+        return len(self.wins)
+
+    def get_equities(self):
+        return [equity_sum / self.trials for equity_sum in self._equity_sums]
+
+    def get_standard_errors(self):
+        if self.exact:
+            return [0.0] * len(self.wins)
+        standard_errors = []
+        for equity_sum, equity_square in zip(self._equity_sums, self._equity_squares):
+            mean = equity_sum / self.trials
+            variance = max(equity_square / self.trials - mean * mean, 0.0)
+            standard_errors.append(math.sqrt(variance / self.trials))
+        return standard_errors
+
+    def merge(self, other):
+        return EquityResult(
+            self.trials + other.trials,
+            _add(self.wins, other.wins),
+            _add(self.ties, other.ties),
+            _add(self.losses, other.losses),
+            _add(self._equity_sums, other._equity_sums),
+            _add(self._equity_squares, other._equity_squares),
+        )
+
+
+def _add(left, right):
+    return [a + b for a, b in zip(left, right)]
+
+
+def _empty_result(number_of_players):
+    return EquityResult(
+        0,
+        [0] * number_of_players,
+        [0] * number_of_players,
+        [0] * number_of_players,
+        [0.0] * number_of_players,
+        [0.0] * number_of_players,
+    )
+
+
+def _to_codes(cards):
+    return [card.code for card in cards] if cards is not None else []
+
+
+def _validate(hole_cards, board, dead_cards):
+    if len(hole_cards) < 2:
+        raise ValueError("At least two players are needed to compute equity")
+    if len(board) > 5:
+        raise ValueError("A board may not have more than 5 cards")
+    shoe = Shoe()
+    for code in [code for hole in hole_cards for code in hole] + board + dead_cards:
+        card = Card.from_code(code)
+        if not shoe.contains(card):
+            raise ValueError("The {} may only be dealt once".format(card))
+        shoe.remove(card)
+    if shoe.number_of_cards() < 5 - len(board):
+        raise NotEnoughCardsException("Not enough cards left to complete the board")
+    # Enumerate and sample in card order whatever order cards were removed in
+    return sorted(shoe.remaining_codes())
+
+
+def _record(classes, wins, ties, losses, equity_sums, equity_squares):
+    best = min(classes)
+    winners = classes.count(best)
+    for player, eq_class in enumerate(classes):
+        if eq_class != best:
+            losses[player] += 1
+            continue
+        if winners == 1:
+            wins[player] += 1
+            equity_sums[player] += 1.0
+            equity_squares[player] += 1.0
+        else:
+            share = 1.0 / winners
+            ties[player] += 1
+            equity_sums[player] += share
+            equity_squares[player] += share * share
+
+
+def _simulate(hole_codes, board_codes, remaining, trials, stream_seed):
+    rng = random.Random(stream_seed)
+    result = _empty_result(len(hole_codes))
+    result.trials = trials
+    missing = 5 - len(board_codes)
+    for _ in range(trials):
+        runout = board_codes + rng.sample(remaining, missing)
+        _record(
+            [best_class(hole + runout) for hole in hole_codes],
+            result.wins,
+            result.ties,
+            result.losses,
+            result._equity_sums,
+            result._equity_squares,
+        )
+    return result
+
+
+def _stream_seed(seed, chunk_index):
+    return (seed << 32) | chunk_index
+
+
+def monte_carlo_equity(
+    hole_cards,
+    board=None,
+    dead_cards=None,
+    trials=100000,
+    target_error=None,
+    seed=None,
+    workers=None,
+):
+    """Estimate each player's equity by sampling board runouts.
+
+    Runs ``trials`` random runouts of the cards not held by a player, on the
+    board or in ``dead_cards``. With ``target_error`` set, sampling stops as
+    soon as every player's standard error is at most that value, ``trials``
+    then being the upper limit. Chunks of trials are spread over a process
+    pool of ``workers`` processes (one per CPU by default, in-process for 1)
+    and the same ``seed`` always gives the same result.
+    """
+    if trials < 1:
+        raise ValueError("trials must be at least 1")
+    if target_error is not None and target_error <= 0:
+        raise ValueError("target_error must be positive")
+    hole_codes = [_to_codes(hole) for hole in hole_cards]
+    board_codes = _to_codes(board)
+    remaining = _validate(hole_codes, board_codes, _to_codes(dead_cards))
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(32)
+    workers = workers or os.cpu_count() or 1
+
+    chunks = []
+    for chunk_index, start in enumerate(range(0, trials, CHUNK_TRIALS)):
+        chunk_trials = min(CHUNK_TRIALS, trials - start)
+        chunks.append(
+            (
+                hole_codes,
+                board_codes,
+                remaining,
+                chunk_trials,
+                _stream_seed(seed, chunk_index),
+            )
+        )
+
+    result = _empty_result(len(hole_codes))
+    if workers == 1:
+        for chunk in chunks:
+            result = result.merge(_simulate(*chunk))
+            if _converged(result, target_error):
+                break
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Submit a round of chunks per worker at a time and merge them in
+        # chunk order, so that the stopping rule sees the same sequence of
+        # results whatever the number of workers
+        for round_start in range(0, len(chunks), workers):
+            futures = [
+                executor.submit(_simulate, *chunk)
+                for chunk in chunks[round_start : round_start + workers]
+            ]
+            for future in futures:
+                result = result.merge(future.result())
+                if _converged(result, target_error):
+                    for pending in futures:
+                        pending.cancel()
+                    return result
+    return result
+
+
+def _converged(result, target_error):
+    if target_error is None:
+        return False
+    return max(result.get_standard_errors()) <= target_error
+
+
+def exact_equity(hole_cards, board=None, dead_cards=None):
+    """Compute each player's equity over every possible board completion.
+
+    Boards are enumerated in a fixed order and outcomes are tallied as
+    integer counts, so the result is exactly reproducible. Hold'em hands are
+    evaluated incrementally: the rank key and suit counts of every board
+    prefix are shared by all its completions, leaving one addition and one
+    table lookup per player for each board.
+    """
+    hole_codes = [_to_codes(hole) for hole in hole_cards]
+    board_codes = _to_codes(board)
+    remaining = _validate(hole_codes, board_codes, _to_codes(dead_cards))
+    if all(len(hole) == 2 for hole in hole_codes):
+        outcomes = _enumerate_seven_card(hole_codes, board_codes, remaining)
+    else:
+        outcomes = _enumerate(hole_codes, board_codes, remaining)
+    return _outcomes_result(outcomes, len(hole_codes))
+
+
+def _enumerate(hole_codes, board_codes, remaining):
+    outcomes = {}
+    for runout in combinations(remaining, 5 - len(board_codes)):
+        full_board = board_codes + list(runout)
+        classes = [best_class(hole + full_board) for hole in hole_codes]
+        best = min(classes)
+        winners = 0
+        for player, eq_class in enumerate(classes):
+            if eq_class == best:
+                winners |= 1 << player
+        outcomes[winners] = outcomes.get(winners, 0) + 1
+    return outcomes
+
+
+def _enumerate_seven_card(hole_codes, board_codes, remaining):
+    tables = get_seven_card_tables()
+    rank_classes = tables.ranks
+    flush_classes = tables.flushes
+    players = range(len(hole_codes))
+    hole_keys = [RANK_KEYS[first] + RANK_KEYS[second] for first, second in hole_codes]
+    hole_suits = [
+        SUIT_FIELDS[first] + SUIT_FIELDS[second] for first, second in hole_codes
+    ]
+
+    outcomes = {}
+    missing = 5 - len(board_codes)
+    if missing == 0:
+        # The board is complete: score it as a prefix with one empty card
+        prefixes = [()]
+    else:
+        prefixes = combinations(range(len(remaining)), missing - 1)
+    for prefix in prefixes:
+        prefix_codes = board_codes + [remaining[index] for index in prefix]
+        prefix_key = 0
+        prefix_suits = 0
+        for code in prefix_codes:
+            prefix_key += RANK_KEYS[code]
+            prefix_suits += SUIT_FIELDS[code]
+        keys = [prefix_key + hole_key for hole_key in hole_keys]
+        suits = [prefix_suits + hole_suit for hole_suit in hole_suits]
+
+        if missing == 0:
+            last_cards = [None]
+        else:
+            last_cards = remaining[prefix[-1] + 1 if prefix else 0 :]
+        for code in last_cards:
+            card_key = RANK_KEYS[code] if code is not None else 0
+            card_suit = SUIT_FIELDS[code] if code is not None else 0
+            best = NUMBER_OF_CLASSES + 1
+            winners = 0
+            for player in players:
+                suit_field = suits[player] + card_suit
+                if (suit_field + FLUSH_CARRY) & FLUSH_BITS:
+                    suit = flush_suit(suit_field)
+                    mask = 0
+                    for card in prefix_codes + hole_codes[player] + [code]:
+                        if card is not None and card & 3 == suit:
+                            mask |= 1 << (card >> 2)
+                    eq_class = flush_classes[mask]
+                else:
+                    eq_class = rank_classes[keys[player] + card_key]
+                if eq_class < best:
+                    best = eq_class
+                    winners = 1 << player
+                elif eq_class == best:
+                    winners |= 1 << player
+            outcomes[winners] = outcomes.get(winners, 0) + 1
+    return outcomes
+
+
+def _outcomes_result(outcomes, number_of_players):
+    result = _empty_result(number_of_players)
+    result.exact = True
+    # Tally in a fixed order so that float shares always sum the same way
+    for winners in sorted(outcomes):
+        count = outcomes[winners]
+        number_of_winners = bin(winners).count("1")
+        result.trials += count
+        for player in range(number_of_players):
+            if not winners >> player & 1:
+                result.losses[player] += count
+            elif number_of_winners == 1:
+                result.wins[player] += count
+                result._equity_sums[player] += count
+            else:
+                result.ties[player] += count
+                result._equity_sums[player] += count / number_of_winners
+    return result
+
+
+class EquityCache:
+    """A size-bounded LRU cache of equity results keyed by suit-normalised deal.
+
+    Queries that are the same up to a relabelling of the suits share one
+    entry (see pokerhands.canonical). ``compute`` is called as
+    ``compute(hole_cards, board, dead_cards, **options)`` on a miss and
+    defaults to exact_equity; the options are part of the cache key.
+    """
+
+    def __init__(self, compute=None, max_size=10000):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._compute = compute if compute is not None else exact_equity
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def equity(self, hole_cards, board=None, dead_cards=None, **options):
+        key = (
+            canonical_key(hole_cards, board, dead_cards),
+            tuple(sorted(options.items())),
+        )
+        result = self._entries.get(key)
+        if result is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = self._compute(hole_cards, board, dead_cards, **options)
+        self._entries[key] = result
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+        return result
+
+    def size(self):
+        return len(self._entries)
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,35 @@
+from .best_hand import best_class, best_hand
+from .evaluator import (
+    class_category,
+    class_score,
+    describe_class,
+    evaluate5,
+    evaluate_cards,
+    hand_rank,
+    hand_strength,
+    score_class,
+)
+from .low import NUMBER_OF_LOW_CLASSES, hi_lo_hand, low_class, low_rank
+from .omaha import omaha_best_class, omaha_best_hand, omaha_hi_lo
+from .tables import NUMBER_OF_CLASSES
+
+__all__ = [
+    "NUMBER_OF_CLASSES",
+    "NUMBER_OF_LOW_CLASSES",
+    "best_class",
+    "best_hand",
+    "class_category",
+    "class_score",
+    "describe_class",
+    "evaluate5",
+    "evaluate_cards",
+    "hand_rank",
+    "hand_strength",
+    "hi_lo_hand",
+    "low_class",
+    "low_rank",
+    "omaha_best_class",
+    "omaha_best_hand",
+    "omaha_hi_lo",
+    "score_class",
+]
@@ -0,0 +1,215 @@
+"""Evaluator tables stored as a versioned, checksummed binary file.
+
+Building the 5-card tables takes about 0.1s and the 7-card tables about a
+second, so they ship prebuilt in ``pokerhands/data/evaluator.bin``. The file
+is a header followed by little-endian arrays, each 8-byte aligned. It is
+mapped read-only and the arrays are used in place as typed memoryviews;
+only the two hash tables (rank products and 7-card rank keys) are turned
+into dicts. A file with the wrong magic, version or checksum is ignored
+and the tables are built in memory instead.
+
+Rebuild the file with ``python -m pokerhands.eval.artifact [PATH]`` after
+changing how the tables are generated, and bump ``TABLES_VERSION``.
+"""
+import argparse
+import logging
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+from .seven_card import SevenCardTables, build_seven_card_tables
+from .tables import EvaluatorTables, build_tables
+
+DEFAULT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "evaluator.bin"
+)
+
+FORMAT_VERSION = 1
+# Bump whenever build_tables or build_seven_card_tables change their output
+TABLES_VERSION = 1
+
+_MAGIC = b"PKEV"
+# Section names and memoryview formats, in file order
+_SECTIONS = (
+    ("flushes", "H"),
+    ("unique5", "H"),
+    ("product_keys", "I"),
+    ("product_classes", "H"),
+    ("class_scores", "I"),
+    ("straight_high", "b"),
+    ("top_five", "H"),
+    ("bit_count", "B"),
+    ("seven_keys", "Q"),
+    ("seven_classes", "H"),
+    ("seven_flushes", "H"),
+)
+# Magic, format version, tables version, payload CRC-32, then the number of
+# items in each section
+_HEADER = struct.Struct("<4sHHI" + "I" * len(_SECTIONS))
+
+log = logging.getLogger(__name__)
+
+
+def _padding(size):
+    return -size % 8
+
+
+def write_artifact(path=DEFAULT_PATH):
+    """Build every table in memory and write them to ``path``."""
+    from . import evaluator
+
+    tables = build_tables()
+    # Build the 7-card tables from the fresh 5-card tables, not from a
+    # possibly stale file
+    evaluator._install_tables(tables)
+    seven_card = build_seven_card_tables()
+
+    product_keys = sorted(tables.products)
+    seven_keys = sorted(seven_card.ranks)
+    arrays = {
+        "flushes": tables.flushes,
+        "unique5": tables.unique5,
+        "product_keys": product_keys,
+        "product_classes": [tables.products[key] for key in product_keys],
+        "class_scores": tables.class_scores,
+        "straight_high": tables.straight_high,
+        "top_five": tables.top_five,
+        "bit_count": tables.bit_count,
+        "seven_keys": seven_keys,
+        "seven_classes": [seven_card.ranks[key] for key in seven_keys],
+        "seven_flushes": seven_card.flushes,
+    }
+    payload = bytearray()
+    for name, item_format in _SECTIONS:
+        values = arrays[name]
+        payload += struct.pack("<{}{}".format(len(values), item_format), *values)
+        payload += bytes(_padding(len(payload)))
+
+    header = _HEADER.pack(
+        _MAGIC,
+        FORMAT_VERSION,
+        TABLES_VERSION,
+        zlib.crc32(payload),
+        *[len(arrays[name]) for name, _ in _SECTIONS],
+    )
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as artifact_file:
+        artifact_file.write(header)
+        artifact_file.write(bytes(_padding(len(header))))
+        artifact_file.write(payload)
+
+
+class TableArtifact:
+    """Read-only view of a table file mapped into memory.
+
+    Raises ValueError if the file is not a table file of the current
+    version or fails its checksum.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        if sys.byteorder != "little":
+            raise ValueError("Table files can only be mapped on little-endian hosts")
+        with open(path, "rb") as artifact_file:
+            self._map = mmap.mmap(artifact_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._sections = self._read_sections(path)
+        except (ValueError, struct.error):
+            self._map.close()
+            raise
+
+    def _read_sections(self, path):
+        if len(self._map) < _HEADER.size:
+            raise ValueError("{} is too short to be a table file".format(path))
+        magic, format_version, tables_version, checksum, *counts = _HEADER.unpack_from(
+            self._map
+        )
+        if magic != _MAGIC:
+            raise ValueError("{} is not a table file".format(path))
+        if format_version != FORMAT_VERSION or tables_version != TABLES_VERSION:
+            raise ValueError(
+                "{} holds tables of version {}.{}, expected {}.{}".format(
+                    path, format_version, tables_version, FORMAT_VERSION, TABLES_VERSION
+                )
+            )
+        offset = _HEADER.size + _padding(_HEADER.size)
+        layout = []
+        for (name, item_format), count in zip(_SECTIONS, counts):
+            end = offset + count * struct.calcsize(item_format)
+            layout.append((name, item_format, offset, end))
+            offset = end + _padding(end)
+        if offset != len(self._map):
+            raise ValueError("{} has the wrong size".format(path))
+        payload_start = layout[0][2]
+        with memoryview(self._map) as data:
+            valid = zlib.crc32(data[payload_start:]) == checksum
+        if not valid:
+            raise ValueError("{} failed its checksum".format(path))
+
+        data = memoryview(self._map)
+        return {
+            name: data[start:end].cast(item_format)
+            for name, item_format, start, end in layout
+        }
+
+    def get_section(self, name):
+        return self._sections[name]
+
+    def get_tables(self):
+        return EvaluatorTables(
+            self._sections["flushes"],
+            self._sections["unique5"],
+            dict(
+                zip(self._sections["product_keys"], self._sections["product_classes"])
+            ),
+            self._sections["class_scores"],
+            self._sections["straight_high"],
+            self._sections["top_five"],
+            self._sections["bit_count"],
+        )
+
+    def get_seven_card_tables(self):
+        return SevenCardTables(
+            dict(zip(self._sections["seven_keys"], self._sections["seven_classes"])),
+            self._sections["seven_flushes"],
+        )
+
+
+# False once the default file has failed to load, so it is only tried once
+_artifact = None
+
+
+def _get_artifact():
+    global _artifact
+    if _artifact is None:
+        try:
+            _artifact = TableArtifact()
+        except (OSError, ValueError) as error:
+            log.warning("Building evaluator tables in memory: %s", error)
+            _artifact = False
+    return _artifact
+
+
+def load_tables():
+    artifact = _get_artifact()
+    return artifact.get_tables() if artifact else build_tables()
+
+
+def load_seven_card_tables():
+    artifact = _get_artifact()
+    return artifact.get_seven_card_tables() if artifact else build_seven_card_tables()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pokerhands.eval.artifact")
+    parser.add_argument("path", nargs="?", default=DEFAULT_PATH)
+    arguments = parser.parse_args(argv)
+    write_artifact(arguments.path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Vectorised hand evaluation over NumPy arrays of card codes.
+
+Every function takes an ``(N, K)`` integer array of card codes (see
+``Card.code``) with K >= 5 and ranks the best 5-card hand in each row using
+the same tables as ``pokerhands.eval``, so the results agree with
+``Hand.get_equivalence_class``, ``Hand.get_hand_score`` and
+``Hand.get_hand_rank``.
+"""
+from itertools import combinations
+
+import numpy as np
+
+from ..handrank.score import CATEGORY_SHIFT
+from .evaluator import get_tables
+from .seven_card import RANK_KEYS, get_seven_card_tables
+from .tables import PRIMES
+
+_arrays = None
+_seven_card_arrays = None
+
+
+def _get_arrays():
+    global _arrays
+    if _arrays is None:
+        tables = get_tables()
+        codes = np.arange(52)
+        rank_indices = codes >> 2
+        card_bits = (
+            (1 << (16 + rank_indices))
+            | (1 << (12 + (codes & 3)))
+            | np.array(PRIMES, dtype=np.int64)[rank_indices]
+        ).astype(np.int64)
+        products = sorted(tables.products)
+        _arrays = (
+            card_bits,
+            np.array(tables.flushes, dtype=np.int32),
+            np.array(tables.unique5, dtype=np.int32),
+            np.array(products, dtype=np.int64),
+            np.array(
+                [tables.products[product] for product in products], dtype=np.int32
+            ),
+            np.array(tables.class_scores, dtype=np.int64),
+        )
+    return _arrays
+
+
+def _get_seven_card_arrays():
+    global _seven_card_arrays
+    if _seven_card_arrays is None:
+        tables = get_seven_card_tables()
+        keys = sorted(tables.ranks)
+        _seven_card_arrays = (
+            np.array(RANK_KEYS, dtype=np.int64),
+            np.array(keys, dtype=np.int64),
+            np.array([tables.ranks[key] for key in keys], dtype=np.int32),
+            np.array(tables.flushes, dtype=np.int32),
+        )
+    return _seven_card_arrays
+
+
+def _evaluate_seven(codes):
+    # One lookup per hand through the 7-card tables instead of ranking all
+    # 21 five-card combinations
+    rank_keys, keys, rank_classes, flushes = _get_seven_card_arrays()
+    suits = codes & 3
+    ranks = codes >> 2
+    # Rows holding a card twice have no valid key; clip them to any class
+    key_index = np.minimum(
+        np.searchsorted(keys, rank_keys[codes].sum(axis=1)), len(keys) - 1
+    )
+    eq_classes = rank_classes[key_index]
+    for suit in range(4):
+        in_suit = suits == suit
+        is_flush = in_suit.sum(axis=1) >= 5
+        if is_flush.any():
+            masks = np.bitwise_or.reduce(
+                (1 << ranks[is_flush]) * in_suit[is_flush], axis=1
+            )
+            eq_classes[is_flush] = flushes[masks]
+    return eq_classes
+
+
+def _evaluate5_columns(bits, columns):
+    _, flushes, unique5, product_keys, product_classes, _ = _get_arrays()
+    a, b, c, d, e = (bits[:, column] for column in columns)
+    mask = (a | b | c | d | e) >> 16
+    is_flush = (a & b & c & d & e & 0xF000) != 0
+    product = (a & 0xFF) * (b & 0xFF) * (c & 0xFF) * (d & 0xFF) * (e & 0xFF)
+    product_index = np.minimum(
+        np.searchsorted(product_keys, product), len(product_keys) - 1
+    )
+    eq_classes = unique5[mask]
+    eq_classes = np.where(eq_classes == 0, product_classes[product_index], eq_classes)
+    return np.where(is_flush, flushes[mask], eq_classes)
+
+
+def evaluate_classes(codes):
+    """Return the ``(N,)`` equivalence classes (1 best, 7462 worst)."""
+    codes = np.asarray(codes, dtype=np.intp)
+    if codes.ndim != 2 or codes.shape[1] < 5:
+        raise ValueError("codes must be an (N, K) array with K >= 5")
+    if codes.shape[1] == 7:
+        return _evaluate_seven(codes)
+    bits = _get_arrays()[0][codes]
+    best = None
+    for columns in combinations(range(codes.shape[1]), 5):
+        eq_classes = _evaluate5_columns(bits, columns)
+        best = eq_classes if best is None else np.minimum(best, eq_classes)
+    return best
+
+
+def evaluate(codes):
+    """Return ``(scores, categories)`` as two ``(N,)`` arrays.
+
+    Scores are packed hand scores as from ``Hand.get_hand_score`` and
+    categories run from 1 (high card) to 10 (royal flush) as from
+    ``Hand.get_hand_rank``.
+    """
+    scores = _get_arrays()[5][evaluate_classes(codes)]
+    return scores, scores >> CATEGORY_SHIFT
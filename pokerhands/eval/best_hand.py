@@ -0,0 +1,122 @@
+from .evaluator import evaluate5, get_tables
+
+
+# Indexed by a 13-bit rank mask: the rank index at the top of its highest
+# straight (or -1), the mask of its five highest ranks and its rank count.
+# Taken from the evaluator tables on first use.
+_STRAIGHT_HIGH = None
+_TOP_FIVE = None
+_BIT_COUNT = None
+
+
+def _load_mask_tables():
+    global _STRAIGHT_HIGH, _TOP_FIVE, _BIT_COUNT
+    tables = get_tables()
+    _STRAIGHT_HIGH = tables.straight_high
+    _TOP_FIVE = tables.top_five
+    _BIT_COUNT = tables.bit_count
+
+
+def _straight_ranks(high):
+    # Rank indices of the straight topped by high, the ace (12) playing low
+    # in the wheel
+    return [(high - offset) % 13 for offset in range(5)]
+
+
+def _mask_ranks(mask):
+    return [rank_index for rank_index in range(12, -1, -1) if mask >> rank_index & 1]
+
+
+def best_hand(codes):
+    """Return (equivalence class, five codes) of the best hand in codes.
+
+    Works directly from per-rank card lists and per-suit rank masks built in
+    one pass over the cards instead of ranking every 5-card combination.
+    """
+    if len(codes) < 5:
+        raise ValueError("Not enough cards to form a hand")
+
+    by_rank = [[] for _ in range(13)]
+    suit_masks = [0, 0, 0, 0]
+    for code in codes:
+        by_rank[code >> 2].append(code)
+        suit_masks[code & 3] |= 1 << (code >> 2)
+    return _best_of(by_rank, suit_masks)
+
+
+def _best_of(by_rank, suit_masks):
+    # The best hand from the cards of each rank and the ranks of each suit
+    if _BIT_COUNT is None:
+        _load_mask_tables()
+    flush_suit = -1
+    flush_mask = 0
+    straight_flush_high = -1
+    straight_flush_suit = -1
+    for suit in range(4):
+        suit_mask = suit_masks[suit]
+        if _BIT_COUNT[suit_mask] < 5:
+            continue
+        high = _STRAIGHT_HIGH[suit_mask]
+        if high > straight_flush_high:
+            straight_flush_high = high
+            straight_flush_suit = suit
+        if _TOP_FIVE[suit_mask] > flush_mask:
+            flush_mask = _TOP_FIVE[suit_mask]
+            flush_suit = suit
+
+    if straight_flush_high >= 0:
+        five = [
+            rank_index * 4 + straight_flush_suit
+            for rank_index in _straight_ranks(straight_flush_high)
+        ]
+        return evaluate5(*five), five
+
+    quads = []
+    trips = []
+    pairs = []
+    singles = []
+    for rank_index in range(12, -1, -1):
+        count = len(by_rank[rank_index])
+        if count >= 4:
+            quads.append(rank_index)
+        elif count == 3:
+            trips.append(rank_index)
+        elif count == 2:
+            pairs.append(rank_index)
+        elif count == 1:
+            singles.append(rank_index)
+
+    if quads:
+        quad = quads[0]
+        kicker = max(quads[1:] + trips[:1] + pairs[:1] + singles[:1])
+        five = by_rank[quad][:4] + by_rank[kicker][:1]
+    elif trips and len(trips) + len(pairs) >= 2:
+        pair = max(trips[1:2] + pairs[:1])
+        five = by_rank[trips[0]][:3] + by_rank[pair][:2]
+    elif flush_suit >= 0:
+        five = [rank_index * 4 + flush_suit for rank_index in _mask_ranks(flush_mask)]
+    else:
+        rank_mask = suit_masks[0] | suit_masks[1] | suit_masks[2] | suit_masks[3]
+        straight_high = _STRAIGHT_HIGH[rank_mask]
+        if straight_high >= 0:
+            five = [
+                by_rank[rank_index][0] for rank_index in _straight_ranks(straight_high)
+            ]
+        elif trips:
+            five = by_rank[trips[0]][:3] + [
+                by_rank[rank_index][0] for rank_index in singles[:2]
+            ]
+        elif len(pairs) >= 2:
+            kicker = max(pairs[2:3] + singles[:1])
+            five = by_rank[pairs[0]][:2] + by_rank[pairs[1]][:2] + by_rank[kicker][:1]
+        elif pairs:
+            five = by_rank[pairs[0]][:2] + [
+                by_rank[rank_index][0] for rank_index in singles[:3]
+            ]
+        else:
+            five = [by_rank[rank_index][0] for rank_index in singles[:5]]
+    return evaluate5(*five), five
+
+
+def best_class(codes):
+    return best_hand(codes)[0]
@@ -0,0 +1,318 @@
+"""Rank every possible hand and count the results per category.
+
+All 2,598,960 five-card hands are ranked one at a time, and all
+133,784,560 seven-card hands (the best five of seven) in a vectorised fast
+mode that needs numpy. The counts are checked against the well-known
+reference distribution, which makes a full run both a correctness oracle
+for an evaluator and a throughput benchmark:
+
+    python -m pokerhands.eval.distribution [--seven] [--workers N]
+
+The work is split into ranges of combinations sharing their lowest cards,
+which run on a process pool. The 7-card mode keeps sums over all
+2,118,760 five-card suffixes, about 38 MB. They are built once, and with
+more than one worker they are saved to temporary files that every worker
+maps read-only, so the pages are shared rather than copied.
+
+Any function of five ascending card codes returning a category from 1
+(high card) to 10 (royal flush) can be checked in place of the table
+evaluator, for example ``hand_category``.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, islice
+
+from ..handrank.hand_strength import HandStrength
+from .evaluator import class_category, evaluate5
+from .seven_card import RANK_KEYS, SUIT_FIELDS
+from .tables import NUMBER_OF_CLASSES
+
+# Hands per category, royal flush first, so not counting royal flushes as
+# straight flushes
+REFERENCE_COUNTS = {
+    5: {
+        10: 4,
+        9: 36,
+        8: 624,
+        7: 3744,
+        6: 5108,
+        5: 10200,
+        4: 54912,
+        3: 123552,
+        2: 1098240,
+        1: 1302540,
+    },
+    7: {
+        10: 4324,
+        9: 37260,
+        8: 224848,
+        7: 3473184,
+        6: 4047644,
+        5: 6180020,
+        4: 6461620,
+        3: 31433400,
+        2: 58627800,
+        1: 23294460,
+    },
+}
+
+# Rows of seven-card hands ranked per numpy call, which bounds the memory
+CHUNK_ROWS = 1 << 18
+
+# Rank key, suit counts and suit masks of the 5-card combinations of codes 2
+# to 51 in lexicographic order, which the 7-card fast mode extends by two
+# prefix cards
+_SUFFIX_NAMES = ("keys", "suits", "masks")
+_suffixes = None
+# Directory of saved suffix arrays, set in pool workers
+_suffix_directory = None
+
+
+class DistributionResult:
+    """Hands counted per category by an exhaustive enumeration."""
+
+    def __init__(self, number_of_cards, counts, seconds):
+        self.number_of_cards = number_of_cards
+        self.counts = counts
+        self.seconds = seconds
+
+    def get_total(self):
+        return sum(self.counts.values())
+
+    def get_hands_per_second(self):
+        return self.get_total() / self.seconds if self.seconds else 0.0
+
+    def get_mismatches(self):
+        """Return (category, counted, expected) wherever they differ."""
+        expected = REFERENCE_COUNTS[self.number_of_cards]
+        return [
+            (category, self.counts.get(category, 0), count)
+            for category, count in expected.items()
+            if self.counts.get(category, 0) != count
+        ]
+
+    def is_correct(self):
+        return not self.get_mismatches()
+
+
+def hand_category(codes):
+    """Rank five codes through Hand, the slow but public path."""
+    from ..hand import Hand
+
+    return Hand.from_codes(codes).get_hand_rank()
+
+
+def _five_card_range(first, rank=None):
+    # Count every 5-card hand whose lowest card is first, per class with the
+    # table evaluator or per category with rank
+    counts = [0] * (NUMBER_OF_CLASSES + 1 if rank is None else 11)
+    for second in range(first + 1, 49):
+        for third in range(second + 1, 50):
+            for fourth in range(third + 1, 51):
+                for fifth in range(fourth + 1, 52):
+                    if rank is None:
+                        counts[evaluate5(first, second, third, fourth, fifth)] += 1
+                    else:
+                        counts[rank((first, second, third, fourth, fifth))] += 1
+    return counts
+
+
+def _build_suffixes(np):
+    # Built a block of combinations at a time, so only the results (8 bytes
+    # of rank key and 10 of suit counts and masks per row) are ever whole
+    number_of_rows = _combinations_count(50, 5)
+    keys = np.empty(number_of_rows, dtype=np.int64)
+    suits = np.empty(number_of_rows, dtype=np.uint16)
+    masks = np.empty((4, number_of_rows), dtype=np.uint16)
+    rank_keys = np.array(RANK_KEYS, dtype=np.int64)
+    suit_fields = np.array(SUIT_FIELDS, dtype=np.uint16)
+    fives = combinations(range(2, 52), 5)
+    for start in range(0, number_of_rows, 1 << 16):
+        size = min(1 << 16, number_of_rows - start)
+        rows = np.fromiter(
+            (code for five in islice(fives, size) for code in five),
+            dtype=np.intp,
+            count=size * 5,
+        ).reshape(-1, 5)
+        block = slice(start, start + size)
+        keys[block] = rank_keys[rows].sum(axis=1)
+        suits[block] = suit_fields[rows].sum(axis=1, dtype=np.uint16)
+        rank_bits = (1 << (rows >> 2)).astype(np.uint16)
+        for suit in range(4):
+            # 13-bit rank mask of the cards in each suit
+            masks[suit, block] = np.bitwise_or.reduce(
+                rank_bits * ((rows & 3) == suit), axis=1
+            )
+    return keys, suits, masks
+
+
+def _save_suffixes(np, directory):
+    for name, values in zip(_SUFFIX_NAMES, _get_suffixes(np)):
+        np.save(os.path.join(directory, name + ".npy"), values)
+
+
+def _use_suffix_directory(directory):
+    # Pool initializer: map the parent's suffixes instead of building them
+    global _suffix_directory
+    _suffix_directory = directory
+
+
+def _get_suffixes(np):
+    global _suffixes
+    if _suffixes is None:
+        if _suffix_directory is not None:
+            _suffixes = tuple(
+                np.load(os.path.join(_suffix_directory, name + ".npy"), mmap_mode="r")
+                for name in _SUFFIX_NAMES
+            )
+        else:
+            _suffixes = _build_suffixes(np)
+    return _suffixes
+
+
+def _seven_card_range(prefix):
+    # Count per class every 7-card hand whose two lowest cards are prefix
+    import numpy as np
+
+    from .batch import _get_seven_card_arrays
+
+    first, second = prefix
+    _, keys, rank_classes, flushes = _get_seven_card_arrays()
+    rest_keys, rest_suits, rest_masks = _get_suffixes(np)
+    number_of_rows = len(rest_keys)
+    # Suffixes of cards above second are the last C(51 - second, 5) rows
+    start = number_of_rows - _combinations_count(51 - second, 5)
+    prefix_key = RANK_KEYS[first] + RANK_KEYS[second]
+    prefix_suits = SUIT_FIELDS[first] + SUIT_FIELDS[second]
+    prefix_masks = [0, 0, 0, 0]
+    for code in prefix:
+        prefix_masks[code & 3] |= 1 << (code >> 2)
+
+    counts = np.zeros(NUMBER_OF_CLASSES + 1, dtype=np.int64)
+    for chunk_start in range(start, number_of_rows, CHUNK_ROWS):
+        rows = slice(chunk_start, min(chunk_start + CHUNK_ROWS, number_of_rows))
+        eq_classes = rank_classes[np.searchsorted(keys, rest_keys[rows] + prefix_key)]
+        suit_fields = rest_suits[rows] + prefix_suits
+        for suit in range(4):
+            is_flush = (suit_fields >> (4 * suit) & 0xF) >= 5
+            if is_flush.any():
+                masks = rest_masks[suit][rows][is_flush] | prefix_masks[suit]
+                eq_classes[is_flush] = flushes[masks]
+        counts += np.bincount(eq_classes, minlength=NUMBER_OF_CLASSES + 1)
+    return counts.tolist()
+
+
+def _combinations_count(n, k):
+    count = 1
+    for index in range(k):
+        count = count * (n - index) // (index + 1)
+    return count
+
+
+def _run(task, arguments, workers, initializer=None, initargs=()):
+    # Sum the count lists of every task; the tasks come biggest first, so the
+    # pool finishes them together
+    if workers == 1:
+        return _sum_counts(map(task, *zip(*arguments)))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=initializer, initargs=initargs
+    ) as executor:
+        return _sum_counts(executor.map(task, *zip(*arguments)))
+
+
+def _sum_counts(results):
+    # Add up as the results arrive, keeping one count list alive at a time
+    totals = None
+    for counts in results:
+        totals = (
+            counts
+            if totals is None
+            else [total + count for total, count in zip(totals, counts)]
+        )
+    return totals
+
+
+def hand_distribution(number_of_cards=5, rank=None, workers=None):
+    """Rank every hand of 5 or 7 cards and return a DistributionResult.
+
+    ``rank`` replaces the table evaluator for 5-card hands: a function of a
+    tuple of five ascending codes returning the category, picklable to run
+    on more than one worker. Seven-card hands need numpy.
+    """
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    if number_of_cards == 5:
+        counts = _run(_five_card_range, [(first, rank) for first in range(48)], workers)
+    elif number_of_cards == 7:
+        if rank is not None:
+            raise ValueError("Only 5-card hands can be ranked by a custom function")
+        prefixes = [(prefix,) for prefix in combinations(range(47), 2)]
+        if workers == 1:
+            counts = _run(_seven_card_range, prefixes, workers)
+        else:
+            import numpy as np
+
+            with tempfile.TemporaryDirectory() as directory:
+                _save_suffixes(np, directory)
+                counts = _run(
+                    _seven_card_range,
+                    prefixes,
+                    workers,
+                    _use_suffix_directory,
+                    (directory,),
+                )
+    else:
+        raise ValueError("number_of_cards must be 5 or 7")
+    seconds = time.perf_counter() - start
+
+    if rank is None:
+        categories = {}
+        for eq_class in range(1, NUMBER_OF_CLASSES + 1):
+            category = class_category(eq_class)
+            categories[category] = categories.get(category, 0) + counts[eq_class]
+    else:
+        categories = {category: count for category, count in enumerate(counts) if count}
+    return DistributionResult(number_of_cards, categories, seconds)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pokerhands.eval.distribution")
+    parser.add_argument(
+        "--seven", action="store_true", help="rank all 7-card hands (needs numpy)"
+    )
+    parser.add_argument(
+        "--hand", action="store_true", help="rank 5-card hands through Hand"
+    )
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    arguments = parser.parse_args(argv)
+
+    result = hand_distribution(
+        7 if arguments.seven else 5,
+        rank=hand_category if arguments.hand else None,
+        workers=arguments.workers,
+    )
+    expected = REFERENCE_COUNTS[result.number_of_cards]
+    for category in sorted(expected, reverse=True):
+        count = result.counts.get(category, 0)
+        print(
+            "{:16} {:>12,} {:>12,} {}".format(
+                HandStrength(category - 1).name,
+                count,
+                expected[category],
+                "ok" if count == expected[category] else "MISMATCH",
+            )
+        )
+    print(
+        "{:,} hands in {:.1f}s, {:,.0f} hands/s".format(
+            result.get_total(), result.seconds, result.get_hands_per_second()
+        )
+    )
+    return 0 if result.is_correct() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
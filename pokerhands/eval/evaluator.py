@@ -0,0 +1,118 @@
+from ..card import Card
+from ..handrank.hand_strength import HandStrength
+from ..handrank.score import (
+    HIGH_CARD,
+    ROYAL_FLUSH,
+    hand_rank_from_score,
+    score_category,
+)
+from .tables import NUMBER_OF_CLASSES, PRIMES
+
+# Loaded on first use by get_tables(), so importing the package stays cheap
+_TABLES = None
+_FLUSHES = None
+_UNIQUE5 = None
+_PRODUCTS = None
+_CLASS_SCORES = None
+
+# Descriptions by eq_class * 4 + suit, filled in as they are asked for. Only
+# high card (its top card) and royal flush descriptions name a suit; every
+# other class is stored under suit 0.
+_DESCRIPTIONS = [None] * ((NUMBER_OF_CLASSES + 1) * 4)
+
+
+def get_tables():
+    """Return the evaluator tables, mapping them from the shipped artifact.
+
+    The tables are read from ``pokerhands/data/evaluator.bin`` on first use
+    and built in memory instead if that file is missing or stale.
+    """
+    if _TABLES is None:
+        from .artifact import load_tables
+
+        _install_tables(load_tables())
+    return _TABLES
+
+
+def _install_tables(tables):
+    global _TABLES, _FLUSHES, _UNIQUE5, _PRODUCTS, _CLASS_SCORES
+    _TABLES = tables
+    _FLUSHES = tables.flushes
+    _UNIQUE5 = tables.unique5
+    _PRODUCTS = tables.products
+    _CLASS_SCORES = tables.class_scores
+
+
+def _card_bits(code):
+    # Card codes hold the rank index in the high bits and the suit in the low
+    # two (see Card.code). Rank bit in bits 16-28, suit bit in bits 12-15 and
+    # the rank prime in the low byte, so that one AND detects a flush and one
+    # OR the ranks
+    rank_index = code >> 2
+    return (1 << (16 + rank_index)) | (1 << (12 + (code & 3))) | PRIMES[rank_index]
+
+
+_CARD_BITS = [_card_bits(code) for code in range(52)]
+
+
+def evaluate5(c1, c2, c3, c4, c5):
+    """Return the equivalence class (1 best, 7462 worst) of five card codes."""
+    if _FLUSHES is None:
+        get_tables()
+    a = _CARD_BITS[c1]
+    b = _CARD_BITS[c2]
+    c = _CARD_BITS[c3]
+    d = _CARD_BITS[c4]
+    e = _CARD_BITS[c5]
+    mask = (a | b | c | d | e) >> 16
+    if a & b & c & d & e & 0xF000:
+        return _FLUSHES[mask]
+    eq_class = _UNIQUE5[mask]
+    if eq_class:
+        return eq_class
+    return _PRODUCTS[(a & 0xFF) * (b & 0xFF) * (c & 0xFF) * (d & 0xFF) * (e & 0xFF)]
+
+
+def evaluate_cards(cards):
+    if len(cards) != 5:
+        raise ValueError("cards must be set to a list of 5 cards")
+    return evaluate5(*[card.code for card in cards])
+
+
+def class_score(eq_class):
+    return get_tables().class_scores[eq_class]
+
+
+def score_class(score):
+    return get_tables().get_score_classes()[score]
+
+
+def class_category(eq_class):
+    return score_category(class_score(eq_class))
+
+
+def hand_strength(eq_class):
+    return HandStrength(class_category(eq_class) - 1)
+
+
+def hand_rank(eq_class, cards):
+    return hand_rank_from_score(class_score(eq_class), cards)
+
+
+def describe_class(eq_class, codes):
+    """Describe the hand of an equivalence class held by five card codes.
+
+    The same string is returned for every hand of the class (and suit, when
+    the description names one), built through hand_rank only the first time.
+    """
+    index = eq_class * 4
+    category = score_category(class_score(eq_class))
+    if category == HIGH_CARD or category == ROYAL_FLUSH:
+        # The suit of the highest card
+        index += max(codes) & 3
+    description = _DESCRIPTIONS[index]
+    if description is None:
+        cards = [Card.from_code(code) for code in codes]
+        description = hand_rank(eq_class, cards).describe_hand()
+        _DESCRIPTIONS[index] = description
+    return description
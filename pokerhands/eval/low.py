@@ -0,0 +1,73 @@
+"""Ace-to-five low hands for eight-or-better split pot games.
+
+A low needs five different ranks from the ace (playing as one) to the
+eight; pairs are skipped and straights and flushes do not count. The best
+low from any set of ranks is simply its five lowest, so a 256-entry table
+indexed by the 8-bit mask of low ranks held gives the low class directly:
+1 for five-four-three-two-ace down to 56 for eight-seven-six-five-four, and
+0 when the hand does not qualify.
+"""
+from itertools import combinations
+
+from ..handrank.low_rank import LowRank
+from ..rank import Rank
+from .best_hand import _best_of
+
+NUMBER_OF_LOW_CLASSES = 56
+
+
+def _build_low_tables():
+    # The 56 qualifying lows, best first: compare the highest card, then the
+    # next highest and so on
+    lows = sorted(combinations(range(8), 5), key=lambda low: low[::-1])
+    low_ranks = [None] + [
+        [Rank(bit + 1) if bit else Rank.ACE for bit in low[::-1]] for low in lows
+    ]
+    classes = {low: eq_class for eq_class, low in enumerate(lows, 1)}
+    low_classes = [0] * 256
+    for mask in range(256):
+        bits = [bit for bit in range(8) if mask >> bit & 1]
+        if len(bits) >= 5:
+            low_classes[mask] = classes[tuple(bits[:5])]
+    return low_classes, low_ranks
+
+
+LOW_CLASSES, _LOW_RANKS = _build_low_tables()
+
+
+def low_mask(rank_mask):
+    """Return the 8-bit low mask (ace first) of a 13-bit rank mask."""
+    return ((rank_mask & 0x7F) << 1) | (rank_mask >> 12)
+
+
+def low_class(codes):
+    """Return the best low class (1 best, 56 worst) of any five codes, or 0."""
+    rank_mask = 0
+    for code in codes:
+        rank_mask |= 1 << (code >> 2)
+    return LOW_CLASSES[low_mask(rank_mask)]
+
+
+def low_rank(eq_class):
+    """Return the LowRank of a low class, or None for 0 (no low)."""
+    if eq_class == 0:
+        return None
+    return LowRank(list(_LOW_RANKS[eq_class]))
+
+
+def hi_lo_hand(codes):
+    """Return (high class, five codes, low class) of the best hands in codes.
+
+    Both come out of the same pass over the cards: the low is read from the
+    rank mask the high hand is built from.
+    """
+    if len(codes) < 5:
+        raise ValueError("Not enough cards to form a hand")
+    by_rank = [[] for _ in range(13)]
+    suit_masks = [0, 0, 0, 0]
+    for code in codes:
+        by_rank[code >> 2].append(code)
+        suit_masks[code & 3] |= 1 << (code >> 2)
+    eq_class, five = _best_of(by_rank, suit_masks)
+    rank_mask = suit_masks[0] | suit_masks[1] | suit_masks[2] | suit_masks[3]
+    return eq_class, five, LOW_CLASSES[low_mask(rank_mask)]
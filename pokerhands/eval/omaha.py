@@ -0,0 +1,116 @@
+"""Omaha hands: exactly two hole cards and exactly three board cards.
+
+A hand is ranked from every pair of hole cards with every triple of board
+cards, 60 combinations for four hole cards and a full board, 100 for five.
+Each side is first reduced to its OR of rank bits, product of rank primes
+and AND of suit bits, so a combination costs two ORs, one multiplication
+and a table lookup. Sides with the same ranks and no flush draw are
+evaluated once, and a flush is only looked up when a suited hole pair meets
+a board triple of its suit.
+"""
+from itertools import combinations
+
+from .evaluator import _CARD_BITS, get_tables
+from .low import LOW_CLASSES, NUMBER_OF_LOW_CLASSES, low_mask
+
+
+def _sides(codes, size):
+    # (rank mask, prime product, suit bits, codes, low mask) of every subset
+    # of size cards, keeping one subset per rank multiset unless it is
+    # single-suited
+    sides = {}
+    for subset in combinations(codes, size):
+        rank_bits = 0
+        product = 1
+        suit_bits = 0xF000
+        for code in subset:
+            card_bits = _CARD_BITS[code]
+            rank_bits |= card_bits
+            product *= card_bits & 0xFF
+            suit_bits &= card_bits
+        key = (product, suit_bits)
+        if key not in sides:
+            rank_mask = rank_bits >> 16
+            sides[key] = (rank_mask, product, suit_bits, subset, low_mask(rank_mask))
+    return list(sides.values())
+
+
+def board_triples(board_codes):
+    """Precompute the board side, to share between every player's hand."""
+    if not 3 <= len(board_codes) <= 5:
+        raise ValueError("An Omaha board has 3 to 5 cards")
+    return _sides(board_codes, 3)
+
+
+def omaha_best_hand(hole_codes, board_codes, triples=None):
+    """Return (equivalence class, five codes) of the best Omaha hand.
+
+    ``triples`` may be the result of board_triples(board_codes), to share
+    the board side between players.
+    """
+    if len(hole_codes) < 2:
+        raise ValueError("An Omaha hand needs at least 2 hole cards")
+    if triples is None:
+        triples = board_triples(board_codes)
+    tables = get_tables()
+    flushes = tables.flushes
+    unique5 = tables.unique5
+    products = tables.products
+
+    best = 0x7FFFFFFF
+    best_five = None
+    for pair_mask, pair_product, pair_suit, pair, _ in _sides(hole_codes, 2):
+        for triple_mask, triple_product, triple_suit, triple, _ in triples:
+            mask = pair_mask | triple_mask
+            if pair_suit & triple_suit:
+                eq_class = flushes[mask]
+            else:
+                eq_class = unique5[mask] or products[pair_product * triple_product]
+            if eq_class < best:
+                best = eq_class
+                best_five = pair + triple
+    return best, list(best_five)
+
+
+def omaha_best_class(hole_codes, board_codes, triples=None):
+    return omaha_best_hand(hole_codes, board_codes, triples)[0]
+
+
+def omaha_classes(hole_codes, board_codes):
+    """Return the best class of every player's hole cards on one board."""
+    triples = board_triples(board_codes)
+    return [omaha_best_hand(hole, board_codes, triples)[0] for hole in hole_codes]
+
+
+def omaha_hi_lo(hole_codes, board_codes, triples=None):
+    """Return (high class, low class) of an Omaha eight-or-better hand.
+
+    Both halves use exactly two hole and three board cards and come from the
+    same pass over the combinations. The low class is 0 without a low.
+    """
+    if len(hole_codes) < 2:
+        raise ValueError("An Omaha hand needs at least 2 hole cards")
+    if triples is None:
+        triples = board_triples(board_codes)
+    tables = get_tables()
+    flushes = tables.flushes
+    unique5 = tables.unique5
+    products = tables.products
+
+    best = 0x7FFFFFFF
+    best_low = 0x7FFFFFFF
+    for pair_mask, pair_product, pair_suit, _, pair_low in _sides(hole_codes, 2):
+        for triple_mask, triple_product, triple_suit, _, triple_low in triples:
+            mask = pair_mask | triple_mask
+            if pair_suit & triple_suit:
+                eq_class = flushes[mask]
+            else:
+                eq_class = unique5[mask] or products[pair_product * triple_product]
+            if eq_class < best:
+                best = eq_class
+            # Five different low ranks only when neither side has a pair or
+            # a high card and they share no rank
+            low = LOW_CLASSES[pair_low | triple_low]
+            if low and low < best_low:
+                best_low = low
+    return best, best_low if best_low <= NUMBER_OF_LOW_CLASSES else 0
@@ -0,0 +1,73 @@
+from itertools import combinations, combinations_with_replacement
+
+from .best_hand import best_class
+
+# Incremental 7-card evaluation: a hand is summarised by a rank key (3 bits
+# per rank holding its count) and a suit field (4 bits per suit holding its
+# count). Both are sums over the cards, so a board prefix can be extended by
+# one addition per card, and the best class is then one table lookup.
+RANK_KEYS = [1 << (3 * (code >> 2)) for code in range(52)]
+SUIT_FIELDS = [1 << (4 * (code & 3)) for code in range(52)]
+
+# Adding 3 to every 4-bit suit count sets that field's top bit exactly when
+# the count is at least 5
+FLUSH_CARRY = 0x3333
+FLUSH_BITS = 0x8888
+
+
+def flush_suit(suit_field):
+    """Return the suit index with five or more cards, or -1."""
+    flush_bits = (suit_field + FLUSH_CARRY) & FLUSH_BITS
+    if not flush_bits:
+        return -1
+    return (flush_bits.bit_length() - 4) >> 2
+
+
+class SevenCardTables:
+    """Best equivalence class of seven cards by rank key or flush mask.
+
+    ``ranks`` maps the rank key of seven cards without a flush to their best
+    class and ``flushes`` maps the 13-bit rank mask of the five to seven
+    cards of a flush suit to the best straight flush or flush among them.
+    With seven cards a flush always beats any pair-based hand left over.
+    """
+
+    def __init__(self, ranks, flushes):
+        self.ranks = ranks
+        self.flushes = flushes
+
+
+def build_seven_card_tables():
+    ranks = {}
+    for rank_indices in combinations_with_replacement(range(13), 7):
+        if any(rank_indices.count(rank_index) > 4 for rank_index in set(rank_indices)):
+            continue
+        # Cycle through the suits so no suit holds more than two cards and
+        # equal ranks never share a suit
+        codes = [
+            rank_index * 4 + index % 4 for index, rank_index in enumerate(rank_indices)
+        ]
+        ranks[sum(RANK_KEYS[code] for code in codes)] = best_class(codes)
+
+    flushes = [0] * 8192
+    for number_of_cards in (5, 6, 7):
+        for rank_indices in combinations(range(13), number_of_cards):
+            mask = 0
+            for rank_index in rank_indices:
+                mask |= 1 << rank_index
+            flushes[mask] = best_class([rank_index * 4 for rank_index in rank_indices])
+    return SevenCardTables(ranks, flushes)
+
+
+_tables = None
+
+
+def get_seven_card_tables():
+    # Mapped from the shipped artifact, or built (about a second) if it is
+    # missing or stale
+    global _tables
+    if _tables is None:
+        from .artifact import load_seven_card_tables
+
+        _tables = load_seven_card_tables()
+    return _tables
@@ -0,0 +1,130 @@
+from itertools import combinations, combinations_with_replacement
+
+from ..handrank.score import score_ranks
+
+# One prime per rank (deuce to ace) so that the product of five ranks
+# identifies the rank multiset regardless of order
+PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+
+NUMBER_OF_CLASSES = 7462
+
+
+class EvaluatorTables:
+    """Lookup tables mapping 5-card rank patterns to equivalence classes.
+
+    Classes run from 1 (royal flush) to 7462 (seven-five-four-three-two
+    high). ``flushes`` and ``unique5`` are indexed by the 13-bit mask of the
+    ranks present, ``products`` by the product of the rank primes and
+    ``class_scores`` maps a class back to its packed hand score. For any
+    13-bit rank mask, ``straight_high`` holds the rank index at the top of
+    its highest straight (or -1), ``top_five`` the mask of its five highest
+    ranks and ``bit_count`` its number of ranks.
+    """
+
+    def __init__(
+        self,
+        flushes,
+        unique5,
+        products,
+        class_scores,
+        straight_high,
+        top_five,
+        bit_count,
+    ):
+        self.flushes = flushes
+        self.unique5 = unique5
+        self.products = products
+        self.class_scores = class_scores
+        self.straight_high = straight_high
+        self.top_five = top_five
+        self.bit_count = bit_count
+        self._score_classes = None
+
+    def get_score_classes(self):
+        if self._score_classes is None:
+            self._score_classes = {
+                score: eq_class
+                for eq_class, score in enumerate(self.class_scores)
+                if eq_class
+            }
+        return self._score_classes
+
+
+def _rank_mask(rank_indices):
+    mask = 0
+    for rank_index in rank_indices:
+        mask |= 1 << rank_index
+    return mask
+
+
+def _prime_product(rank_indices):
+    product = 1
+    for rank_index in rank_indices:
+        product *= PRIMES[rank_index]
+    return product
+
+
+def _straight_high(mask):
+    # The ace also plays low, so mirror it below the deuce before looking for
+    # five consecutive ranks
+    wheel_mask = (mask << 1) | ((mask >> 12) & 1)
+    run = (
+        wheel_mask
+        & (wheel_mask >> 1)
+        & (wheel_mask >> 2)
+        & (wheel_mask >> 3)
+        & (wheel_mask >> 4)
+    )
+    if not run:
+        return -1
+    return run.bit_length() + 2
+
+
+def _top_five(mask):
+    while bin(mask).count("1") > 5:
+        mask &= mask - 1
+    return mask
+
+
+def build_tables():
+    flush_scores = {}
+    unique5_scores = {}
+    product_scores = {}
+    for rank_indices in combinations(range(13), 5):
+        rank_values = [rank_index + 2 for rank_index in rank_indices]
+        mask = _rank_mask(rank_indices)
+        flush_scores[mask] = score_ranks(rank_values, True)
+        unique5_scores[mask] = score_ranks(rank_values, False)
+    for rank_indices in combinations_with_replacement(range(13), 5):
+        distinct = len(set(rank_indices))
+        if distinct == 5 or distinct == 1:
+            # Distinct ranks go through the mask tables and five of a kind
+            # cannot be dealt from a single deck
+            continue
+        rank_values = [rank_index + 2 for rank_index in rank_indices]
+        product_scores[_prime_product(rank_indices)] = score_ranks(rank_values, False)
+
+    scores = set(flush_scores.values())
+    scores.update(unique5_scores.values())
+    scores.update(product_scores.values())
+    class_scores = [0] + sorted(scores, reverse=True)
+    score_classes = {score: eq_class for eq_class, score in enumerate(class_scores)}
+
+    flushes = [0] * 8192
+    unique5 = [0] * 8192
+    for mask, score in flush_scores.items():
+        flushes[mask] = score_classes[score]
+    for mask, score in unique5_scores.items():
+        unique5[mask] = score_classes[score]
+    products = {
+        product: score_classes[score] for product, score in product_scores.items()
+    }
+    return EvaluatorTables(
+        flushes,
+        unique5,
+        products,
+        class_scores,
+        [_straight_high(mask) for mask in range(8192)],
+        [_top_five(mask) for mask in range(8192)],
+        [bin(mask).count("1") for mask in range(8192)],
+    )
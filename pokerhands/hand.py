@@ -1,26 +1,100 @@
-from copy import deepcopy
-from collections import Counter
-from itertools import combinations
-from .rank import Rank
-from .handrank.ranks import (
-    HighCard,
-    OnePair,
-    TwoPair,
-    ThreeOfAKind,
-    StraightFlush,
-    Straight,
-    Flush,
-    FourOfAKind,
-    FullHouse,
-    RoyalFlush,
-    NotRankableHandRank,
+from operator import attrgetter
+from .card import Card
+from .eval import best_hand, class_score, describe_class, evaluate5, hand_rank
+from .handrank.ranks import NotRankableHandRank
+from .handrank.score import (
+    ONE_PAIR,
+    TWO_PAIR,
+    THREE_OF_A_KIND,
+    STRAIGHT,
+    FLUSH,
+    FULL_HOUSE,
+    FOUR_OF_A_KIND,
+    STRAIGHT_FLUSH,
+    ROYAL_FLUSH,
+    score_category,
 )
 
+_card_code = attrgetter("code")
+
 
 class Hand:
+    """An immutable, hashable group of cards ordered by rank and then suit.
+
+    Cards are interned, so a hand only holds a tuple of references. Derived
+    data (codes, rank histogram, suit masks and the equivalence class) is
+    computed on first use and cached. The class is all a ranking needs: its
+    packed score holds the category and tiebreaks, and a HandRank is only
+    built by get_hand_rank_object().
+    """
+
+    __slots__ = (
+        "cards",
+        "_codes",
+        "_rank_histogram",
+        "_suit_masks",
+        "_classification",
+    )
+
     def __init__(self, cards):
-        cards = sorted(cards, key=lambda card: card.rank) if cards is not None else []
-        self.cards = deepcopy(cards) if len(cards) > 0 is not None else cards
+        _set = object.__setattr__
+        _set(
+            self,
+            "cards",
+            tuple(sorted(cards, key=_card_code)) if cards is not None else (),
+        )
+        _set(self, "_codes", None)
+        _set(self, "_rank_histogram", None)
+        _set(self, "_suit_masks", None)
+        _set(self, "_classification", None)
+
+    @classmethod
+    def from_codes(cls, codes):
+        # Trusted constructor for card codes that are already in ascending
+        # order, skipping the sort in __init__
+        hand = cls.__new__(cls)
+        _set = object.__setattr__
+        _set(hand, "cards", tuple(Card.from_code(code) for code in codes))
+        _set(hand, "_codes", tuple(codes))
+        _set(hand, "_rank_histogram", None)
+        _set(hand, "_suit_masks", None)
+        _set(hand, "_classification", None)
+        return hand
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Hand is immutable")
+
+    def __reduce__(self):
+        return Hand, (self.cards,)
+
+    def __eq__(self, other):
+        return isinstance(other, Hand) and self.cards == other.cards
+
+    def __hash__(self):
+        return hash(self.cards)
+
+    def get_codes(self):
+        if self._codes is None:
+            object.__setattr__(self, "_codes", tuple(card.code for card in self.cards))
+        return self._codes
+
+    def get_rank_histogram(self):
+        # Number of cards of each rank, deuce first
+        if self._rank_histogram is None:
+            histogram = [0] * 13
+            for code in self.get_codes():
+                histogram[code >> 2] += 1
+            object.__setattr__(self, "_rank_histogram", tuple(histogram))
+        return self._rank_histogram
+
+    def get_suit_masks(self):
+        # 13-bit mask of the ranks held in each suit, in Suit order
+        if self._suit_masks is None:
+            masks = [0, 0, 0, 0]
+            for code in self.get_codes():
+                masks[code & 3] |= 1 << (code >> 2)
+            object.__setattr__(self, "_suit_masks", tuple(masks))
+        return self._suit_masks
 
     def number_of_cards(self):
         return len(self.cards)
@@ -28,190 +102,84 @@ class Hand:
     def describe_hand_rank(self):
         if self.number_of_cards() != 5:
             return NotRankableHandRank(self.cards).describe_hand()
+        # Cached per equivalence class, so no HandRank is built once a hand
+        # of the class has been described
+        return describe_class(self._classify(), self.get_codes())
 
-        rank_counts = Counter(card.rank for card in self.cards)
-
-        # Check for specific hand rankings
-        if self.is_royal_flush():
-            return RoyalFlush(self.cards[0].suit).describe_hand()
-
-        elif self.is_straight_flush():
-            high_card_rank = max(self.cards, key=lambda card: card.rank).rank
-            return StraightFlush(high_card_rank).describe_hand()
-
-        elif self.is_four_of_a_kind():
-            card_rank = rank_counts.most_common()[0][0]
-            return FourOfAKind(card_rank).describe_hand()
-
-        elif self.is_full_house():
-            trips = rank_counts.most_common()[0][0]
-            pairs = rank_counts.most_common()[-1][0]
-            return FullHouse(trips, pairs).describe_hand()
-
-        elif self.is_flush():
-            return Flush(self.cards).describe_hand()
-
-        elif self.is_straight():
-            card_rank = self.cards[-1].rank
-            return Straight(card_rank).describe_hand()
-
-        elif self.is_three_of_a_kind():
-            card_rank = rank_counts.most_common()[0][0]
-            return ThreeOfAKind(card_rank).describe_hand()
-
-        elif self.is_two_pair():
-            low_pair = rank_counts.most_common()[0][0]
-            high_pair = rank_counts.most_common()[1][0]
-            kicker = rank_counts.most_common()[-1][0]
-            return TwoPair(high_pair, low_pair, kicker).describe_hand()
-
-        elif self.is_one_pair():
-            pair = rank_counts.most_common()[0][0]
-            rest = [card for card in self.cards if card.rank != pair]
-            return OnePair(pair, rest).describe_hand()
-        else:
-            return HighCard(self.cards).describe_hand()
-
-    def _contains_five_cards_in_sequence(self):
-        return all(
-            self.cards[i].rank.value == self.cards[i - 1].rank.value + 1
-            for i in range(1, len(self.cards))
-        )
+    def get_hand_rank_object(self):
+        if self.number_of_cards() != 5:
+            return NotRankableHandRank(self.cards)
+        return hand_rank(self._classify(), list(self.cards))
+
+    def _classify(self):
+        # Rank the hand with the lookup-table evaluator and cache the class
+        if self._classification is None:
+            object.__setattr__(self, "_classification", evaluate5(*self.get_codes()))
+        return self._classification
+
+    def get_equivalence_class(self) -> int:
+        # 1 for a royal flush down to 7462 for the worst high card, 0 if not
+        # rankable
+        if self.number_of_cards() != 5:
+            return 0
+        return self._classify()
+
+    def _category(self) -> int:
+        return score_category(self.get_hand_score())
 
     def is_straight_flush(self) -> bool:
-        # The hand contains five cards of the same suit
-        if len(set(card.suit for card in self.cards)) != 1:
-            return False
-
-        # Also the hand contains five cards of sequential rank and the highest card is ACE
-        return (
-            self._contains_five_cards_in_sequence()
-            and not max(self.cards, key=lambda card: card.rank).rank == Rank.ACE
-        )
+        return self._category() == STRAIGHT_FLUSH
 
     def is_royal_flush(self) -> bool:
-        # The hand contains five cards of the same suit
-        if len(set(card.suit for card in self.cards)) != 1:
-            return False
-
-        # Also the hand contains five cards of sequential rank
-        if not self._contains_five_cards_in_sequence():
-            return False
-
-        # The highest card is ACE
-        return max(self.cards, key=lambda card: card.rank).rank == Rank.ACE
+        return self._category() == ROYAL_FLUSH
 
     def is_four_of_a_kind(self) -> bool:
-        # The hand contains four cards of one rank
-        # and any other unmatched card
-        rank_counts = Counter(card.rank for card in self.cards)
-        return sorted([4, 1]) == sorted(rank_counts.values())
+        return self._category() == FOUR_OF_A_KIND
 
     def is_full_house(self) -> bool:
-        # The hand contains three matching cards of one rank
-        # and two matching cards of another rank
-        rank_counts = Counter(card.rank for card in self.cards)
-        return sorted([3, 2]) == sorted(rank_counts.values())
+        return self._category() == FULL_HOUSE
 
     def is_flush(self) -> bool:
-        # The hand contains five cards of the same suit
-        if len(set(card.suit for card in self.cards)) != 1:
-            return False
-        # also the hand contains five cards not in sequence
-        return not self._contains_five_cards_in_sequence()
+        return self._category() == FLUSH
 
     def is_straight(self) -> bool:
-        # The hand contains at least two different suits
-        if len(set(card.suit for card in self.cards)) < 2:
-            return False
-        # also the hand contains five cards of sequential rank
-        return self._contains_five_cards_in_sequence()
+        return self._category() == STRAIGHT
 
     def is_three_of_a_kind(self) -> bool:
-        # The hand contains three cards of one rank
-        # with two cards not of this rank nor the same as each other
-        rank_counts = Counter(card.rank for card in self.cards)
-        return sorted([3, 1, 1]) == sorted(rank_counts.values())
+        return self._category() == THREE_OF_A_KIND
 
     def is_two_pair(self) -> bool:
-        # The hand contains three cards of one rank
-        # with two cards of another rank
-        rank_counts = Counter(card.rank for card in self.cards)
-        return sorted([2, 2, 1]) == sorted(rank_counts.values())
+        return self._category() == TWO_PAIR
 
     def is_one_pair(self) -> bool:
-        # The hand contains two cards of one rank
-        # with three cards not of this rank nor the same as each other
-        rank_counts = Counter(card.rank for card in self.cards)
-        return sorted([2, 1, 1, 1]) == sorted(rank_counts.values())
+        return self._category() == ONE_PAIR
 
     def compare_to(self, other):
         if len(self.cards) != 5 or len(other.cards) != 5:
             return 0
 
-        # Compare hand ranks based on poker hand hierarchy
-        self_rank = self.get_hand_rank()
-        other_rank = other.get_hand_rank()
-
-        if self_rank < other_rank:
-            return -1
-        elif self_rank > other_rank:
-            return 1
-        else:
-            # If the hand ranks are the same, compare high cards
-            self_high_card = max(self.cards, key=lambda card: card.rank).rank
-            other_high_card = max(other.cards, key=lambda card: card.rank).rank
-
-            if self_high_card < other_high_card:
-                return -1
-            elif self_high_card > other_high_card:
-                return 1
-            else:
-                return 0
+        # The packed scores order hands by category and then by every kicker
+        self_score = self.get_hand_score()
+        other_score = other.get_hand_score()
+        return (self_score > other_score) - (self_score < other_score)
+
+    def get_hand_score(self) -> int:
+        # A single int that totally orders 5-card hands, 0 if not rankable.
+        # Use it as the key for sorted() or max() across many hands.
+        if self.number_of_cards() != 5:
+            return 0
+        return class_score(self._classify())
 
     def get_hand_rank(self) -> int:
-        if self.is_royal_flush():
-            return 10
-        elif self.is_straight_flush():
-            return 9
-        elif self.is_four_of_a_kind():
-            return 8
-        elif self.is_full_house():
-            return 7
-        elif self.is_flush():
-            return 6
-        elif self.is_straight():
-            return 5
-        elif self.is_three_of_a_kind():
-            return 4
-        elif self.is_two_pair():
-            return 3
-        elif self.is_one_pair():
-            return 2
-        else:
-            # High Card
-            return 1
+        # 10 for a royal flush down to 1 for a high card, 0 if not rankable
+        return self._category()
 
     def find_best_hand(self):
         # Ensure the input has at least 5 cards
         if len(self.cards) < 5:
             raise ValueError("Not enough cards to form a hand")
 
-        # Generate all combinations of 5 cards
-        all_combinations = list(combinations(self.cards, 5))
-
-        # Initialize variables to store the best hand and its rank
-        best_hand = None
-        best_rank = float("-inf")
-
-        # Iterate through all combinations and find the best hand
-        for combo in all_combinations:
-            current_hand = Hand(list(combo))
-            current_rank = current_hand.get_hand_rank()
-
-            # Update if the current hand has a higher rank
-            if current_rank > best_rank:
-                best_rank = current_rank
-                best_hand = current_hand
-
-        return best_hand
+        # Pick the best five cards straight from the rank and suit masks
+        # rather than ranking every combination of 5 cards
+        _, best_codes = best_hand(self.get_codes())
+        return Hand.from_codes(sorted(best_codes))
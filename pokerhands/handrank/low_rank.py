@@ -0,0 +1,33 @@
+from ..rank import Rank
+
+
+def _low_value(rank):
+    # The ace plays as one in an ace-to-five low
+    return 1 if rank == Rank.ACE else rank.value
+
+
+class LowRank:
+    """An ace-to-five low: five different ranks of eight or under.
+
+    The ace counts as one, straights and flushes do not count against the
+    hand, and the hand with the lower highest card wins, then the lower
+    second highest and so on.
+    """
+
+    def __init__(self, ranks):
+        if ranks is None or not isinstance(ranks, list) or len(set(ranks)) != 5:
+            raise ValueError("ranks must be set to a list of 5 different ranks")
+        if any(_low_value(rank) > 8 for rank in ranks):
+            raise ValueError("Only an ace to an eight can play low")
+        self.ranks = sorted(ranks, key=_low_value, reverse=True)
+
+    def compare_to(self, other):
+        # Positive when this low is the better (lower) one
+        for rank, other_rank in zip(self.ranks, other.ranks):
+            comparison = _low_value(other_rank) - _low_value(rank)
+            if comparison != 0:
+                return comparison
+        return 0
+
+    def describe_hand(self):
+        return "Low {}".format(", ".join(str(rank) for rank in self.ranks))
@@ -0,0 +1,133 @@
+from ..rank import Rank
+from .ranks import (
+    HighCard,
+    OnePair,
+    TwoPair,
+    ThreeOfAKind,
+    StraightFlush,
+    Straight,
+    Flush,
+    FourOfAKind,
+    FullHouse,
+    RoyalFlush,
+)
+
+# Hand categories as returned by Hand.get_hand_rank
+HIGH_CARD = 1
+ONE_PAIR = 2
+TWO_PAIR = 3
+THREE_OF_A_KIND = 4
+STRAIGHT = 5
+FLUSH = 6
+FULL_HOUSE = 7
+FOUR_OF_A_KIND = 8
+STRAIGHT_FLUSH = 9
+ROYAL_FLUSH = 10
+
+# A hand score packs the category above five 4-bit tiebreak ranks, most
+# significant first, so that comparing two 5-card hands is a single integer
+# comparison.
+CATEGORY_SHIFT = 20
+TIEBREAK_BITS = 4
+TIEBREAK_COUNT = 5
+
+_WHEEL = [
+    Rank.ACE.value,
+    Rank.FIVE.value,
+    Rank.FOUR.value,
+    Rank.THREE.value,
+    Rank.TWO.value,
+]
+
+
+def pack_score(category, tiebreaks):
+    score = category
+    for index in range(TIEBREAK_COUNT):
+        score <<= TIEBREAK_BITS
+        if index < len(tiebreaks):
+            score |= tiebreaks[index]
+    return score
+
+
+def score_category(score):
+    return score >> CATEGORY_SHIFT
+
+
+def score_tiebreaks(score):
+    tiebreaks = []
+    for index in range(TIEBREAK_COUNT - 1, -1, -1):
+        rank_value = (score >> (index * TIEBREAK_BITS)) & 0xF
+        if rank_value == 0:
+            break
+        tiebreaks.append(rank_value)
+    return tiebreaks
+
+
+def score_ranks(rank_values, is_flush):
+    """Score five rank values in a single pass over their multiplicities."""
+    rank_counts = {}
+    for rank_value in rank_values:
+        rank_counts[rank_value] = rank_counts.get(rank_value, 0) + 1
+
+    # Ranks ordered by multiplicity and then by rank, highest first
+    tiebreaks = sorted(
+        rank_counts,
+        key=lambda rank_value: (rank_counts[rank_value], rank_value),
+        reverse=True,
+    )
+    counts = [rank_counts[rank_value] for rank_value in tiebreaks]
+
+    straight_high = 0
+    if len(tiebreaks) == 5:
+        if tiebreaks[0] - tiebreaks[4] == 4:
+            straight_high = tiebreaks[0]
+        elif tiebreaks == _WHEEL:
+            # A-2-3-4-5: the ace plays low
+            straight_high = Rank.FIVE.value
+
+    if straight_high and is_flush:
+        if straight_high == Rank.ACE.value:
+            return pack_score(ROYAL_FLUSH, [straight_high])
+        return pack_score(STRAIGHT_FLUSH, [straight_high])
+    if counts[0] == 4:
+        return pack_score(FOUR_OF_A_KIND, tiebreaks)
+    if counts[0] == 3 and counts[1] == 2:
+        return pack_score(FULL_HOUSE, tiebreaks)
+    if is_flush:
+        return pack_score(FLUSH, tiebreaks)
+    if straight_high:
+        return pack_score(STRAIGHT, [straight_high])
+    if counts[0] == 3:
+        return pack_score(THREE_OF_A_KIND, tiebreaks)
+    if counts[0] == 2 and counts[1] == 2:
+        return pack_score(TWO_PAIR, tiebreaks)
+    if counts[0] == 2:
+        return pack_score(ONE_PAIR, tiebreaks)
+    return pack_score(HIGH_CARD, tiebreaks)
+
+
+def hand_rank_from_score(score, cards):
+    """Build the HandRank matching a score for the five cards it was given."""
+    category = score_category(score)
+    tiebreaks = [Rank(rank_value) for rank_value in score_tiebreaks(score)]
+
+    if category == ROYAL_FLUSH:
+        return RoyalFlush(cards[0].suit)
+    if category == STRAIGHT_FLUSH:
+        return StraightFlush(tiebreaks[0])
+    if category == FOUR_OF_A_KIND:
+        return FourOfAKind(tiebreaks[0])
+    if category == FULL_HOUSE:
+        return FullHouse(tiebreaks[0], tiebreaks[1])
+    if category == FLUSH:
+        return Flush(list(cards))
+    if category == STRAIGHT:
+        return Straight(tiebreaks[0])
+    if category == THREE_OF_A_KIND:
+        return ThreeOfAKind(tiebreaks[0])
+    if category == TWO_PAIR:
+        return TwoPair(tiebreaks[0], tiebreaks[1], tiebreaks[2])
+    if category == ONE_PAIR:
+        rest = [card for card in cards if card.rank != tiebreaks[0]]
+        return OnePair(tiebreaks[0], rest)
+    return HighCard(list(cards))
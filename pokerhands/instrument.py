@@ -0,0 +1,339 @@
+"""Opt-in call counters, latency histograms and profiling of the hot paths.
+
+Nothing is measured until enable() is called. It swaps the instrumented
+methods of Hand, Deck and Shoe and the evaluator and equity functions for
+timing wrappers, and disable() puts the originals back, so while disabled
+the cost is nil: the wrapped code is the code that was there before.
+
+    with instrumented():
+        rank_lots_of_hands()
+    log_report()
+
+Latencies go into histograms with power-of-two nanosecond buckets, and the
+classification cache of Hand and every EquityCache count their hits and
+misses. profiled() runs cProfile over a block, or a function when used as a
+decorator. Only calls made in this process are seen: work sent to a process
+pool is not counted.
+"""
+import cProfile
+import io
+import logging
+import pstats
+import sys
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter_ns
+
+log = logging.getLogger(__name__)
+
+NUMBER_OF_BUCKETS = 48
+
+_operations = {}
+_caches = {}
+# (owner, attribute name, original) of every attribute replaced by enable()
+_patches = []
+
+
+class OperationStats:
+    """Calls to one operation and a histogram of their latencies.
+
+    Bucket ``i`` counts the calls that took from ``2 ** (i - 1)`` up to
+    ``2 ** i`` nanoseconds.
+    """
+
+    __slots__ = ("calls", "total_ns", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.buckets = [0] * NUMBER_OF_BUCKETS
+
+    def record(self, elapsed_ns):
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        self.buckets[min(elapsed_ns.bit_length(), NUMBER_OF_BUCKETS - 1)] += 1
+
+    def get_mean_ns(self):
+        return self.total_ns / self.calls if self.calls else 0.0
+
+    def get_percentile_ns(self, fraction):
+        # Upper bound of the bucket holding the given fraction of the calls
+        if not self.calls:
+            return 0
+        wanted = fraction * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= wanted:
+                return 1 << bucket
+        return 1 << (NUMBER_OF_BUCKETS - 1)
+
+    def get_histogram(self):
+        # (upper bound in ns, calls) of every bucket that has calls
+        return [
+            (1 << bucket, count) for bucket, count in enumerate(self.buckets) if count
+        ]
+
+
+class CacheStats:
+    __slots__ = ("hits", "misses")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get_hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _timed_methods():
+    from .deck import Deck, Shoe
+    from .hand import Hand
+
+    return [
+        (Hand, "get_hand_rank", "hand.get_hand_rank"),
+        (Hand, "get_equivalence_class", "hand.get_equivalence_class"),
+        (Hand, "describe_hand_rank", "hand.describe_hand_rank"),
+        (Hand, "compare_to", "hand.compare_to"),
+        (Hand, "find_best_hand", "hand.find_best_hand"),
+        (Deck, "__init__", "deck.new"),
+        (Deck, "pick", "deck.pick"),
+        (Shoe, "pick", "shoe.pick"),
+        (Shoe, "sample_codes", "shoe.sample_codes"),
+    ]
+
+
+def _timed_functions():
+    from .equity import exact_equity, monte_carlo_equity
+    from .eval import (
+        best_class,
+        best_hand,
+        evaluate5,
+        hi_lo_hand,
+        omaha_best_hand,
+        omaha_hi_lo,
+    )
+    from .ranges import range_equity
+    from .showdown import rank_players
+
+    functions = [
+        (evaluate5, "eval.evaluate5"),
+        (best_hand, "eval.best_hand"),
+        (best_class, "eval.best_class"),
+        (hi_lo_hand, "eval.hi_lo_hand"),
+        (omaha_best_hand, "eval.omaha_best_hand"),
+        (omaha_hi_lo, "eval.omaha_hi_lo"),
+        (rank_players, "showdown.rank_players"),
+        (monte_carlo_equity, "equity.monte_carlo_equity"),
+        (exact_equity, "equity.exact_equity"),
+        (range_equity, "ranges.range_equity"),
+    ]
+    try:
+        from .eval.batch import evaluate_classes
+
+        functions.append((evaluate_classes, "eval.evaluate_classes"))
+    except ImportError:
+        pass
+    return functions
+
+
+def _timed(function, stats):
+    clock = perf_counter_ns
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats.record(clock() - start)
+
+    return wrapper
+
+
+def _classification_cache(method, stats):
+    @wraps(method)
+    def wrapper(hand):
+        if hand._classification is None:
+            stats.misses += 1
+        else:
+            stats.hits += 1
+        return method(hand)
+
+    return wrapper
+
+
+def _equity_cache(method, stats):
+    @wraps(method)
+    def wrapper(cache, *args, **kwargs):
+        hits = cache.hits
+        result = method(cache, *args, **kwargs)
+        if cache.hits != hits:
+            stats.hits += 1
+        else:
+            stats.misses += 1
+        return result
+
+    return wrapper
+
+
+def _patch(owner, name, replacement):
+    _patches.append((owner, name, getattr(owner, name)))
+    setattr(owner, name, replacement)
+
+
+def _patch_function(function, replacement):
+    # Functions are imported by name into other modules, so replace every
+    # reference held by a loaded module, the callers' included
+    for module in list(sys.modules.values()):
+        namespace = getattr(module, "__dict__", None)
+        if not isinstance(namespace, dict):
+            continue
+        for name, value in list(namespace.items()):
+            if value is function:
+                _patch(module, name, replacement)
+
+
+def is_enabled():
+    return bool(_patches)
+
+
+def enable():
+    """Start counting and timing the instrumented operations."""
+    if _patches:
+        return
+    from .equity import EquityCache
+    from .hand import Hand
+
+    for owner, name, operation in _timed_methods():
+        stats = _operations.setdefault(operation, OperationStats())
+        _patch(owner, name, _timed(getattr(owner, name), stats))
+    for function, operation in _timed_functions():
+        stats = _operations.setdefault(operation, OperationStats())
+        _patch_function(function, _timed(function, stats))
+    _patch(
+        Hand,
+        "_classify",
+        _classification_cache(
+            Hand._classify, _caches.setdefault("hand.classification", CacheStats())
+        ),
+    )
+    _patch(
+        EquityCache,
+        "equity",
+        _equity_cache(
+            EquityCache.equity, _caches.setdefault("equity.cache", CacheStats())
+        ),
+    )
+
+
+def disable():
+    """Put the original functions back, keeping the statistics gathered."""
+    while _patches:
+        owner, name, original = _patches.pop()
+        setattr(owner, name, original)
+
+
+def reset():
+    _operations.clear()
+    _caches.clear()
+    if _patches:
+        # Reinstall so the wrappers record into the new statistics
+        disable()
+        enable()
+
+
+@contextmanager
+def instrumented():
+    """Instrument the calls made in a block, or by a decorated function."""
+    was_enabled = is_enabled()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+
+@contextmanager
+def profiled(path=None, sort="cumulative", limit=25):
+    """Run cProfile over a block, or a decorated function.
+
+    The statistics are written to ``path`` for pstats or snakeviz when it is
+    given, and the top ``limit`` entries are logged otherwise.
+    """
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
+        if path is not None:
+            profile.dump_stats(path)
+        else:
+            text = io.StringIO()
+            pstats.Stats(profile, stream=text).sort_stats(sort).print_stats(limit)
+            log.info("Profile:\n%s", text.getvalue())
+
+
+def get_operation_stats(operation):
+    return _operations.get(operation)
+
+
+def get_cache_stats(cache):
+    return _caches.get(cache)
+
+
+def get_report():
+    """Return the statistics of every operation called and every cache used."""
+    return {
+        "operations": {
+            operation: {
+                "calls": stats.calls,
+                "total_ms": stats.total_ns / 1e6,
+                "mean_us": stats.get_mean_ns() / 1e3,
+                "p50_us": stats.get_percentile_ns(0.5) / 1e3,
+                "p99_us": stats.get_percentile_ns(0.99) / 1e3,
+            }
+            for operation, stats in _operations.items()
+            if stats.calls
+        },
+        "caches": {
+            cache: {
+                "hits": stats.hits,
+                "misses": stats.misses,
+                "hit_rate": stats.get_hit_rate(),
+            }
+            for cache, stats in _caches.items()
+            if stats.hits or stats.misses
+        },
+    }
+
+
+def log_report(logger=log, level=logging.INFO):
+    """Log one line per operation, slowest in total first, then the caches."""
+    report = get_report()
+    operations = sorted(
+        report["operations"].items(), key=lambda item: -item[1]["total_ms"]
+    )
+    for operation, stats in operations:
+        logger.log(
+            level,
+            "%-28s %10d calls %10.1f ms  mean %8.2f us  p50 < %8.2f us  p99 < %8.2f us",
+            operation,
+            stats["calls"],
+            stats["total_ms"],
+            stats["mean_us"],
+            stats["p50_us"],
+            stats["p99_us"],
+        )
+    for cache, stats in report["caches"].items():
+        logger.log(
+            level,
+            "%-28s %10d hits %10d misses  hit rate %.1f%%",
+            cache,
+            stats["hits"],
+            stats["misses"],
+            100 * stats["hit_rate"],
+        )
@@ -0,0 +1,323 @@
+"""Preflop equities of the 169 starting hands, stored as a mapped file.
+
+The 1326 two-card combinations fall into 169 classes up to suit: 13 pairs,
+78 suited and 78 offsuit hands. A class is indexed on a 13x13 grid by rank
+index (deuce 0 to ace 12): pairs on the diagonal, suited hands at
+``high * 13 + low`` and offsuit hands at ``low * 13 + high``.
+
+The table file holds a header followed by float32 arrays: the heads-up
+equity of every class against every other class, and the equity of every
+class against 1 to ``max_players - 1`` random hands. ``PreflopTable`` maps
+the file read-only, so lookups read straight from the shared pages. Build
+it with ``python -m pokerhands.preflop build PATH`` (requires numpy).
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from .card import Card
+
+NUMBER_OF_STARTING_HANDS = 169
+RANK_CHARACTERS = "23456789TJQKA"
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", "preflop.bin")
+
+_MAGIC = b"PFEQ"
+_VERSION = 1
+# Magic, version, max players, boards sampled, deals sampled, padding
+_HEADER = struct.Struct("<4sHHII4x")
+_FLOAT_SIZE = struct.calcsize("<f")
+
+
+def starting_hand_index(first, second):
+    """Return the class index of two cards (or two card codes)."""
+    first = first if isinstance(first, int) else first.code
+    second = second if isinstance(second, int) else second.code
+    high, low = max(first >> 2, second >> 2), min(first >> 2, second >> 2)
+    if high == low or (first & 3) == (second & 3):
+        return high * 13 + low
+    return low * 13 + high
+
+
+def starting_hand_name(index):
+    row, column = divmod(index, 13)
+    if row == column:
+        return RANK_CHARACTERS[row] * 2
+    if row > column:
+        return RANK_CHARACTERS[row] + RANK_CHARACTERS[column] + "s"
+    return RANK_CHARACTERS[column] + RANK_CHARACTERS[row] + "o"
+
+
+def parse_starting_hand(name):
+    """Return the class index of a name such as ``"QQ"``, ``"AKs"`` or ``"T9o"``."""
+    if len(name) not in (2, 3) or any(c not in RANK_CHARACTERS for c in name[:2]):
+        raise ValueError("Not a starting hand: {}".format(name))
+    high, low = RANK_CHARACTERS.index(name[0]), RANK_CHARACTERS.index(name[1])
+    if high < low:
+        high, low = low, high
+    if high == low:
+        if len(name) == 3:
+            raise ValueError("A pair cannot be suited or offsuit: {}".format(name))
+        return high * 13 + low
+    if len(name) == 2 or name[2] not in "so":
+        raise ValueError("Say whether {} is suited or offsuit".format(name))
+    return high * 13 + low if name[2] == "s" else low * 13 + high
+
+
+def starting_hand_combos(index):
+    """Return every (code, code) combination of a class, lower code first."""
+    row, column = divmod(index, 13)
+    high, low = max(row, column), min(row, column)
+    combos = []
+    for first_suit in range(4):
+        for second_suit in range(4):
+            if high == low and first_suit >= second_suit:
+                continue
+            if high != low and (first_suit == second_suit) != (row > column):
+                continue
+            first, second = high * 4 + first_suit, low * 4 + second_suit
+            combos.append((min(first, second), max(first, second)))
+    return combos
+
+
+def starting_hand_cards(index):
+    return [
+        (Card.from_code(first), Card.from_code(second))
+        for first, second in starting_hand_combos(index)
+    ]
+
+
+def _index(hand):
+    if isinstance(hand, str):
+        return parse_starting_hand(hand)
+    if not 0 <= hand < NUMBER_OF_STARTING_HANDS:
+        raise ValueError("Not a starting hand index: {}".format(hand))
+    return hand
+
+
+class PreflopTable:
+    """Read-only view of a preflop equity file mapped into memory."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, "rb") as table_file:
+            self._map = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            self._map.close()
+            raise ValueError(
+                "{} is too short to be a preflop equity table".format(path)
+            )
+        magic, version, max_players, boards, deals = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC or version != _VERSION:
+            self._map.close()
+            raise ValueError("{} is not a preflop equity table".format(path))
+        # A heads-up row per starting hand, then one row per table size
+        expected = NUMBER_OF_STARTING_HANDS * (
+            NUMBER_OF_STARTING_HANDS + max_players - 1
+        )
+        if len(self._map) - _HEADER.size != expected * _FLOAT_SIZE:
+            self._map.close()
+            raise ValueError("{} has the wrong size".format(path))
+        self.max_players = max_players
+        self.boards = boards
+        self.deals = deals
+        values = memoryview(self._map)[_HEADER.size :]
+        if sys.byteorder == "little":
+            self._values = values.cast("f")
+        else:
+            # The file holds little-endian floats: read a swapped copy
+            # rather than the mapped pages
+            swapped = array("f", values.tobytes())
+            swapped.byteswap()
+            values.release()
+            self._values = memoryview(swapped)
+
+    def close(self):
+        self._values.release()
+        self._map.close()
+
+    def heads_up(self, hand, other):
+        """Equity of ``hand`` against ``other``, by name or class index."""
+        return self._values[_index(hand) * NUMBER_OF_STARTING_HANDS + _index(other)]
+
+    def versus_random(self, hand, number_of_players=2):
+        """Equity of ``hand`` against ``number_of_players - 1`` random hands."""
+        if not 2 <= number_of_players <= self.max_players:
+            raise ValueError(
+                "The table covers 2 to {} players".format(self.max_players)
+            )
+        offset = NUMBER_OF_STARTING_HANDS * (
+            NUMBER_OF_STARTING_HANDS + number_of_players - 2
+        )
+        return self._values[offset + _index(hand)]
+
+
+def _combo_classes(np):
+    combos = [
+        combo
+        for index in range(NUMBER_OF_STARTING_HANDS)
+        for combo in starting_hand_combos(index)
+    ]
+    classes = [
+        index
+        for index in range(NUMBER_OF_STARTING_HANDS)
+        for _ in starting_hand_combos(index)
+    ]
+    return np.array(combos), np.array(classes)
+
+
+def _heads_up_matrix(np, boards, seed):
+    from .eval.batch import evaluate_classes
+    from .eval.tables import NUMBER_OF_CLASSES
+
+    rng = np.random.default_rng(seed)
+    combos, classes = _combo_classes(np)
+    number_of_combos = len(combos)
+    indicator = np.zeros((number_of_combos, NUMBER_OF_STARTING_HANDS))
+    indicator[np.arange(number_of_combos), classes] = 1.0
+    # Pairs of combinations sharing a card (each with itself included), which
+    # can never be dealt together
+    first, second = np.nonzero(
+        (combos[:, None, :, None] == combos[None, :, None, :]).any(axis=(2, 3))
+    )
+    cells = first * NUMBER_OF_STARTING_HANDS + classes[second]
+    # Queries of every combination against every starting hand class
+    class_offsets = np.arange(NUMBER_OF_STARTING_HANDS) * (NUMBER_OF_CLASSES + 1)
+
+    wins = np.zeros((NUMBER_OF_STARTING_HANDS, NUMBER_OF_STARTING_HANDS))
+    ties = np.zeros_like(wins)
+    deals = np.zeros_like(wins)
+    size = number_of_combos * NUMBER_OF_STARTING_HANDS
+    for _ in range(boards):
+        board = rng.choice(52, 5, replace=False)
+        live = ~np.isin(combos, board).any(axis=1)
+        hands = np.concatenate(
+            [combos, np.broadcast_to(board, (number_of_combos, 5))], axis=1
+        )
+        eq_classes = evaluate_classes(hands)
+
+        # For every combination count the live combinations of each class
+        # that it beats or ties, by searching the live combinations sorted by
+        # (starting hand class, equivalence class)
+        keys = np.sort(classes[live] * (NUMBER_OF_CLASSES + 1) + eq_classes[live])
+        queries = class_offsets[None, :] + eq_classes[:, None]
+        tied_from = np.searchsorted(keys, queries, side="left")
+        beaten_from = np.searchsorted(keys, queries, side="right")
+        class_ends = np.searchsorted(keys, class_offsets + NUMBER_OF_CLASSES + 1)
+        class_starts = np.searchsorted(keys, class_offsets)
+        beaten = class_ends[None, :] - beaten_from
+        tied = beaten_from - tied_from
+        dealt = (class_ends - class_starts)[None, :] + np.zeros_like(beaten)
+
+        # Take back the combinations that share a card
+        both_live = live[first] & live[second]
+        lower = eq_classes[first] < eq_classes[second]
+        equal = eq_classes[first] == eq_classes[second]
+        beaten -= np.bincount(cells[both_live & lower], minlength=size).reshape(
+            beaten.shape
+        )
+        tied -= np.bincount(cells[both_live & equal], minlength=size).reshape(
+            tied.shape
+        )
+        dealt -= np.bincount(cells[both_live], minlength=size).reshape(dealt.shape)
+
+        live_indicator = indicator * live[:, None]
+        wins += live_indicator.T @ beaten
+        ties += live_indicator.T @ tied
+        deals += live_indicator.T @ dealt
+    return wins, ties, deals
+
+
+def _versus_random_rows(np, max_players, deal_count, seed):
+    from .deck import Deck
+    from .eval.batch import evaluate_classes
+
+    rows = np.zeros((max_players - 2, NUMBER_OF_STARTING_HANDS))
+    for players in range(3, max_players + 1):
+        shares = np.zeros(NUMBER_OF_STARTING_HANDS)
+        counts = np.zeros(NUMBER_OF_STARTING_HANDS)
+        for deals in Deck.deal_arrays(
+            players, 2, seed=seed + players, count=deal_count
+        ):
+            deals = deals.astype(np.intp)
+            board = deals[:, 2 * players :]
+            eq_classes = np.stack(
+                [
+                    evaluate_classes(
+                        np.concatenate([deals[:, 2 * p : 2 * p + 2], board], axis=1)
+                    )
+                    for p in range(players)
+                ],
+                axis=1,
+            )
+            best = eq_classes.min(axis=1, keepdims=True)
+            winners = eq_classes == best
+            share = winners / winners.sum(axis=1, keepdims=True)
+            for player in range(players):
+                first, second = deals[:, 2 * player], deals[:, 2 * player + 1]
+                high, low = (
+                    np.maximum(first >> 2, second >> 2),
+                    np.minimum(first >> 2, second >> 2),
+                )
+                suited = (first & 3) == (second & 3)
+                index = np.where(
+                    (high == low) | suited, high * 13 + low, low * 13 + high
+                )
+                np.add.at(shares, index, share[:, player])
+                np.add.at(counts, index, 1)
+        rows[players - 3] = shares / np.maximum(counts, 1)
+    return rows
+
+
+def build_preflop_table(path, boards=20000, max_players=9, deals=200000, seed=0):
+    """Estimate every preflop equity and write the table file to ``path``.
+
+    Heads-up equities come from ``boards`` random boards, each ranking all
+    1326 combinations at once and crediting every pair of combinations that
+    can be dealt together, so each matchup is weighted by its real number of
+    deals. Equities against 2 or more random hands come from ``deals``
+    random deals per table size.
+    """
+    import numpy as np
+
+    if not 2 <= max_players <= 9:
+        raise ValueError("max_players must be between 2 and 9")
+    wins, ties, dealt = _heads_up_matrix(np, boards, seed)
+    heads_up = (wins + ties / 2) / np.maximum(dealt, 1)
+    versus_one = (wins + ties / 2).sum(axis=1) / dealt.sum(axis=1)
+    rows = [heads_up.ravel(), versus_one]
+    if max_players > 2:
+        rows.append(_versus_random_rows(np, max_players, deals, seed).ravel())
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as table_file:
+        table_file.write(_HEADER.pack(_MAGIC, _VERSION, max_players, boards, deals))
+        table_file.write(np.concatenate(rows).astype("<f4").tobytes())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pokerhands.preflop")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="compute and write a preflop table")
+    build.add_argument("path", nargs="?", default=DEFAULT_PATH)
+    build.add_argument("--boards", type=int, default=20000)
+    build.add_argument("--players", type=int, default=9)
+    build.add_argument("--deals", type=int, default=200000)
+    build.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args(argv)
+    build_preflop_table(
+        arguments.path,
+        boards=arguments.boards,
+        max_players=arguments.players,
+        deals=arguments.deals,
+        seed=arguments.seed,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,368 @@
+"""Hand ranges in standard notation and range-against-range equity.
+
+A range is a comma-separated list of:
+
+* starting hands: ``QQ``, ``AKs``, ``T9o`` or ``AK`` (suited and offsuit)
+* ``+`` for every better hand of the same shape: ``QQ+`` is QQ, KK and AA,
+  ``KTo+`` is KTo, KJo and KQo
+* spans: ``QQ-88`` or ``A5s-A2s``
+* exact combinations: ``AsKh``
+
+Any entry may carry a weight, ``AKo:0.5`` dealing half of those combinations.
+A later entry overrides the weight of a combination listed before.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from .card import Card
+from .preflop import RANK_CHARACTERS, parse_starting_hand, starting_hand_combos
+
+_SUIT_CHARACTERS = "shcd"
+
+# Runouts are evaluated in chunks of this many boards, one chunk per task
+CHUNK_RUNOUTS = 128
+
+
+class Range:
+    """Weighted two-card combinations, each a pair of card codes low first."""
+
+    def __init__(self, weighted_combos):
+        self._weights = {}
+        for (first, second), weight in weighted_combos:
+            if first == second:
+                raise ValueError("A combination needs two different cards")
+            if weight < 0:
+                raise ValueError("Weights may not be negative")
+            self._weights[(min(first, second), max(first, second))] = weight
+
+    @classmethod
+    def parse(cls, text):
+        return parse_range(text)
+
+    def number_of_combos(self):
+        return len(self._weights)
+
+    def get_combos(self):
+        return list(self._weights)
+
+    def get_weights(self):
+        return list(self._weights.values())
+
+    def get_weight(self, first, second):
+        return self._weights.get((min(first, second), max(first, second)), 0.0)
+
+    def get_cards(self):
+        return [
+            (Card.from_code(first), Card.from_code(second))
+            for first, second in self._weights
+        ]
+
+    def without_cards(self, codes):
+        """Return the range less every combination holding one of ``codes``."""
+        dead = set(codes)
+        return Range(
+            (combo, weight)
+            for combo, weight in self._weights.items()
+            if combo[0] not in dead and combo[1] not in dead
+        )
+
+    def to_arrays(self):
+        """Return ``(codes, weights)``: an (N, 2) int8 and an (N,) float64 array.
+
+        Requires numpy.
+        """
+        import numpy as np
+
+        codes = np.array(self.get_combos(), dtype=np.int8).reshape(-1, 2)
+        return codes, np.array(self.get_weights(), dtype=np.float64)
+
+
+def _parse_card(text):
+    return Card.parse(text).code
+
+
+def _shapes(hand):
+    # AK stands for both AKs and AKo
+    if len(hand) == 2 and hand[0] != hand[1]:
+        return [hand + "s", hand + "o"]
+    return [hand]
+
+
+def _expand(hand):
+    """Return the starting hand names an entry without a weight stands for."""
+    if len(hand) == 4 and hand[1] in _SUIT_CHARACTERS:
+        return None
+    if "-" in hand:
+        top, bottom = hand.split("-")
+        parse_starting_hand(_shapes(top)[0])
+        parse_starting_hand(_shapes(bottom)[0])
+        if top[0] == top[1] and bottom[0] == bottom[1]:
+            high = RANK_CHARACTERS.index(top[0])
+            low = RANK_CHARACTERS.index(bottom[0])
+            return [
+                RANK_CHARACTERS[rank] * 2
+                for rank in range(min(high, low), max(high, low) + 1)
+            ]
+        if top[0] != bottom[0] or top[2:] != bottom[2:] or top[0] == top[1]:
+            raise ValueError("A span must keep its top card and shape: {}".format(hand))
+        first = RANK_CHARACTERS.index(top[1])
+        last = RANK_CHARACTERS.index(bottom[1])
+        return [
+            name
+            for rank in range(min(first, last), max(first, last) + 1)
+            for name in _shapes(top[0] + RANK_CHARACTERS[rank] + top[2:])
+        ]
+    if hand.endswith("+"):
+        base = hand[:-1]
+        for name in _shapes(base):
+            parse_starting_hand(name)
+        high = RANK_CHARACTERS.index(base[0])
+        low = RANK_CHARACTERS.index(base[1])
+        if high == low:
+            return [RANK_CHARACTERS[rank] * 2 for rank in range(high, 13)]
+        if high < low:
+            raise ValueError("Write the higher card first: {}".format(hand))
+        return [
+            name
+            for rank in range(low, high)
+            for name in _shapes(base[0] + RANK_CHARACTERS[rank] + base[2:])
+        ]
+    return _shapes(hand)
+
+
+def parse_range(text):
+    """Parse range notation such as ``"QQ+, AKs, A5s-A2s, KTo+:0.5"``."""
+    weighted_combos = []
+    for entry in text.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        hand, _, weight = entry.partition(":")
+        hand = hand.strip()
+        weight = weight.strip()
+        try:
+            weight = float(weight) if weight else 1.0
+        except ValueError:
+            raise ValueError("Not a weight: {}".format(entry)) from None
+        names = _expand(hand)
+        if names is None:
+            combos = [(_parse_card(hand[:2]), _parse_card(hand[2:]))]
+        else:
+            combos = [
+                combo
+                for name in names
+                for combo in starting_hand_combos(parse_starting_hand(name))
+            ]
+        weighted_combos.extend((combo, weight) for combo in combos)
+    return Range(weighted_combos)
+
+
+class RangeEquityResult:
+    """Equity of a hero range against a villain range.
+
+    For every hero combination the weighted count of villain combinations it
+    beats, ties and meets over the runouts, counting only deals where no
+    card is held twice.
+    """
+
+    def __init__(self, combos, weights, wins, ties, totals, runouts, exact):
+        self.combos = combos
+        self.runouts = runouts
+        self.exact = exact
+        self._weights = weights
+        self._wins = wins
+        self._ties = ties
+        self._totals = totals
+
+    def get_equity(self):
+        shares = sum(
+            weight * (win + tie / 2)
+            for weight, win, tie in zip(self._weights, self._wins, self._ties)
+        )
+        deals = sum(
+            weight * total for weight, total in zip(self._weights, self._totals)
+        )
+        return shares / deals if deals else 0.0
+
+    def get_villain_equity(self):
+        return 1.0 - self.get_equity()
+
+    def get_combo_equities(self):
+        # Equity of each hero combination against the whole villain range
+        return [
+            (win + tie / 2) / total if total else 0.0
+            for win, tie, total in zip(self._wins, self._ties, self._totals)
+        ]
+
+
+def _as_range(hand_range):
+    return parse_range(hand_range) if isinstance(hand_range, str) else hand_range
+
+
+def range_equity(
+    hero,
+    villain,
+    board=None,
+    dead_cards=None,
+    boards=1000,
+    seed=None,
+    workers=None,
+):
+    """Compute the equity of the ``hero`` range against the ``villain`` range.
+
+    Ranges may be Range objects or range notation. If the board can be
+    completed in at most ``boards`` ways every runout is enumerated,
+    otherwise ``boards`` runouts are sampled with ``seed``. Each runout
+    ranks every combination of both ranges in one vectorised pass, and
+    pairs of combinations sharing a card are taken out, so blockers weigh
+    in exactly. Chunks of runouts are spread over ``workers`` processes
+    (one per CPU by default, in-process for 1); the result does not depend
+    on the number of workers. Requires numpy.
+    """
+    import numpy as np
+
+    board_codes = [card.code for card in board] if board is not None else []
+    dead_codes = [card.code for card in dead_cards] if dead_cards is not None else []
+    if len(board_codes) > 5:
+        raise ValueError("A board may not have more than 5 cards")
+    if len(set(board_codes + dead_codes)) != len(board_codes) + len(dead_codes):
+        raise ValueError("A card may only be dealt once")
+    hero = _as_range(hero).without_cards(board_codes + dead_codes)
+    villain = _as_range(villain).without_cards(board_codes + dead_codes)
+    if not hero.number_of_combos() or not villain.number_of_combos():
+        raise ValueError("Both ranges need a combination the board leaves live")
+
+    known = set(board_codes + dead_codes)
+    remaining = [code for code in range(52) if code not in known]
+    missing = 5 - len(board_codes)
+    exact = math.comb(len(remaining), missing) <= boards
+    if exact:
+        runouts = np.array(list(combinations(remaining, missing)), dtype=np.int8)
+    else:
+        rng = np.random.default_rng(seed)
+        keys = rng.random((boards, len(remaining)))
+        picks = np.argsort(keys, axis=1)[:, :missing]
+        runouts = np.array(remaining, dtype=np.int8)[picks]
+    runouts = runouts.reshape(-1, missing)
+
+    hero_codes, hero_weights = hero.to_arrays()
+    villain_codes, villain_weights = villain.to_arrays()
+    board_array = np.array(board_codes, dtype=np.int8)
+    chunks = [
+        (
+            hero_codes,
+            villain_codes,
+            villain_weights,
+            board_array,
+            runouts[start : start + CHUNK_RUNOUTS],
+        )
+        for start in range(0, len(runouts), CHUNK_RUNOUTS)
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) == 1:
+        totals = [_range_chunk(*chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            totals = list(executor.map(_range_chunk, *zip(*chunks)))
+
+    # Sum in chunk order so the result is the same for any number of workers
+    wins, ties, deals = totals[0]
+    for chunk_wins, chunk_ties, chunk_deals in totals[1:]:
+        wins = wins + chunk_wins
+        ties = ties + chunk_ties
+        deals = deals + chunk_deals
+    return RangeEquityResult(
+        hero.get_combos(),
+        hero.get_weights(),
+        wins.tolist(),
+        ties.tolist(),
+        deals.tolist(),
+        len(runouts),
+        exact,
+    )
+
+
+def _range_chunk(hero_codes, villain_codes, villain_weights, board, runouts):
+    import numpy as np
+
+    hero_codes = hero_codes.astype(np.intp)
+    villain_codes = villain_codes.astype(np.intp)
+    number_of_heroes = len(hero_codes)
+    number_of_villains = len(villain_codes)
+    # Every (hero, villain) pair of combinations sharing a card
+    hero_cards = np.zeros((number_of_heroes, 52))
+    hero_cards[np.arange(number_of_heroes)[:, None], hero_codes] = 1
+    villain_cards = np.zeros((number_of_villains, 52))
+    villain_cards[np.arange(number_of_villains)[:, None], villain_codes] = 1
+    blocked_heroes, blocked_villains = np.nonzero(hero_cards @ villain_cards.T)
+
+    # Rank every combination of both ranges on every runout in one pass
+    number_of_runouts = len(runouts)
+    boards = np.concatenate(
+        [np.broadcast_to(board, (number_of_runouts, len(board))), runouts], axis=1
+    ).astype(np.intp)
+    hero_classes = _classes_on_boards(np, hero_codes, boards)
+    villain_classes = _classes_on_boards(np, villain_codes, boards)
+
+    wins = np.zeros(number_of_heroes)
+    ties = np.zeros(number_of_heroes)
+    deals = np.zeros(number_of_heroes)
+    for runout in range(number_of_runouts):
+        board_cards = np.zeros(52, dtype=bool)
+        board_cards[boards[runout]] = True
+        hero_live = ~board_cards[hero_codes].any(axis=1)
+        live_weights = villain_weights * ~board_cards[villain_codes].any(axis=1)
+
+        # Weighted counts of villain hands ranked at or below each class
+        classes = villain_classes[runout]
+        order = np.argsort(classes, kind="stable")
+        sorted_classes = classes[order]
+        cumulative = np.concatenate([[0.0], np.cumsum(live_weights[order])])
+        total = cumulative[-1]
+        ranks = hero_classes[runout]
+        tied_from = np.searchsorted(sorted_classes, ranks, side="left")
+        beaten_from = np.searchsorted(sorted_classes, ranks, side="right")
+        runout_wins = total - cumulative[beaten_from]
+        runout_ties = cumulative[beaten_from] - cumulative[tied_from]
+        runout_deals = np.full(number_of_heroes, total)
+
+        # Take back the villain hands that share a card with the hero hand
+        blocked_weights = live_weights[blocked_villains]
+        hero_ranks = ranks[blocked_heroes]
+        villain_ranks = classes[blocked_villains]
+        runout_wins -= np.bincount(
+            blocked_heroes,
+            weights=blocked_weights * (hero_ranks < villain_ranks),
+            minlength=number_of_heroes,
+        )
+        runout_ties -= np.bincount(
+            blocked_heroes,
+            weights=blocked_weights * (hero_ranks == villain_ranks),
+            minlength=number_of_heroes,
+        )
+        runout_deals -= np.bincount(
+            blocked_heroes, weights=blocked_weights, minlength=number_of_heroes
+        )
+        wins += runout_wins * hero_live
+        ties += runout_ties * hero_live
+        deals += runout_deals * hero_live
+    return wins, ties, deals
+
+
+def _classes_on_boards(np, codes, boards):
+    # (runouts, combinations) classes of every combination on every board
+    from .eval.batch import evaluate_classes
+
+    number_of_runouts, board_size = boards.shape
+    hands = np.concatenate(
+        [
+            np.broadcast_to(codes[None, :, :], (number_of_runouts, len(codes), 2)),
+            np.broadcast_to(
+                boards[:, None, :], (number_of_runouts, len(codes), board_size)
+            ),
+        ],
+        axis=2,
+    ).reshape(-1, 2 + board_size)
+    return evaluate_classes(hands).reshape(number_of_runouts, len(codes))
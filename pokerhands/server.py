@@ -0,0 +1,442 @@
+"""A local evaluation service that batches concurrent requests.
+
+Clients connect over TCP (localhost by default) and send one JSON request
+per line, getting one JSON response per line back, matched by ``id``.
+Responses may come back in any order.
+
+* ``{"id": 1, "op": "rank", "board": "AhKdQs2c3d", "players": ["AsKs", "7h7d"]}``
+  answers ``{"id": 1, "classes": [...], "ranks": [...], "winners": [...]}``
+* ``{"id": 2, "op": "equity", "players": ["AsKs", "7h7d"], "board": "",
+  "trials": 20000, "seed": 1}`` answers ``{"id": 2, "equities": [...]}``,
+  exact when ``"exact": true``
+
+Any request may carry ``deadline_ms``: if no answer is ready that long after
+it arrived, the client gets ``{"id": ..., "error": "deadline exceeded"}``
+instead. At most ``max_pending`` requests are queued or being worked on at
+once; a server at that limit stops reading from its clients until some
+work finishes. Requests arriving within ``batch_delay`` seconds of each
+other are batched: rank requests are ranked together in one task,
+vectorised when numpy is installed, and equity requests are split into at
+most one task per worker. All CPU work runs on a process pool so the event
+loop only moves bytes.
+
+Run it with ``python -m pokerhands.server [--port PORT]``.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from .card import Card, parse_cards
+from .equity import exact_equity, monte_carlo_equity
+from .eval import class_category
+from .showdown import rank_players
+
+DEFAULT_PORT = 8765
+
+log = logging.getLogger(__name__)
+
+
+def _rank_request(request):
+    board = parse_cards(request.get("board", ""))
+    holes = [parse_cards(hole) for hole in request["players"]]
+    codes = board + [code for hole in holes for code in hole]
+    if not holes or len(set(codes)) != len(codes):
+        raise ValueError("Give at least one player and every card once")
+    if any(len(board) + len(hole) < 5 for hole in holes):
+        raise ValueError("Every player needs at least 5 cards with the board")
+    return board, holes
+
+
+def _equity_request(request):
+    board = parse_cards(request.get("board", ""))
+    holes = [parse_cards(hole) for hole in request["players"]]
+    codes = board + [code for hole in holes for code in hole]
+    if len(holes) < 2 or not all(holes) or len(set(codes)) != len(codes):
+        raise ValueError("Give at least two players and every card once")
+    if len(board) > 5:
+        raise ValueError("The board has at most 5 cards")
+    trials = request.get("trials", 10000)
+    if isinstance(trials, bool) or not isinstance(trials, int) or trials < 1:
+        raise ValueError("trials must be a positive integer")
+    return board, holes, trials
+
+
+def rank_batch(deals):
+    """Return (classes, ranks, winners) for every (board, holes) deal.
+
+    The 7-card hands of the whole batch are ranked in one vectorised call
+    when numpy is installed, other hands one at a time.
+    """
+    try:
+        import numpy as np
+
+        from .eval.batch import evaluate_classes
+    except ImportError:
+        np = None
+
+    classes = [[None] * len(holes) for _, holes in deals]
+    if np is not None:
+        rows = []
+        positions = []
+        for deal_index, (board, holes) in enumerate(deals):
+            for player, hole in enumerate(holes):
+                if len(board) + len(hole) == 7:
+                    rows.append(hole + board)
+                    positions.append((deal_index, player))
+        if rows:
+            for (deal_index, player), eq_class in zip(
+                positions, evaluate_classes(np.array(rows)).tolist()
+            ):
+                classes[deal_index][player] = eq_class
+
+    results = []
+    for (board, holes), deal_classes in zip(deals, classes):
+        if None in deal_classes:
+            deal_classes = rank_players(holes, board)
+        best = min(deal_classes)
+        results.append(
+            {
+                "classes": deal_classes,
+                "ranks": [class_category(eq_class) for eq_class in deal_classes],
+                "winners": [
+                    player
+                    for player, eq_class in enumerate(deal_classes)
+                    if eq_class == best
+                ],
+            }
+        )
+    return results
+
+
+def equity_batch(requests):
+    """Return the run_equity answer, or an error, of every request."""
+    results = []
+    for request in requests:
+        try:
+            results.append(run_equity(request))
+        except Exception as error:
+            # One bad request must not fail the others of its batch
+            results.append({"error": str(error)})
+    return results
+
+
+def run_equity(request):
+    board, holes, trials = _equity_request(request)
+    holes = [[Card.from_code(code) for code in hole] for hole in holes]
+    board = [Card.from_code(code) for code in board]
+    if request.get("exact"):
+        result = exact_equity(holes, board=board)
+    else:
+        result = monte_carlo_equity(
+            holes,
+            board=board,
+            trials=trials,
+            seed=request.get("seed"),
+            workers=1,
+        )
+    return {
+        "equities": result.get_equities(),
+        "standard_errors": result.get_standard_errors(),
+        "trials": result.trials,
+    }
+
+
+def _discard_result(future):
+    if not future.cancelled():
+        future.exception()
+
+
+class _Pending:
+    # A request waiting for its answer, with the loop time it must meet
+    def __init__(self, request, future, deadline):
+        self.request = request
+        self.future = future
+        self.deadline = deadline
+        self.released = False
+
+
+class EvaluationServer:
+    """Serve rank and equity requests, batching them onto a process pool.
+
+    ``workers`` is the pool size (one per CPU by default). Up to
+    ``batch_size`` requests arriving within ``batch_delay`` seconds are
+    batched, and at most ``max_pending`` requests are queued or running at
+    once.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=DEFAULT_PORT,
+        workers=None,
+        batch_size=256,
+        batch_delay=0.002,
+        max_pending=10000,
+    ):
+        self.host = host
+        self.port = port
+        self._workers = workers or os.cpu_count() or 1
+        self._batch_size = batch_size
+        self._batch_delay = batch_delay
+        self._max_pending = max_pending
+        self._executor = None
+        self._server = None
+        self._queue = None
+        self._slots = None
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._batcher = None
+        self._tasks = set()
+        # Handler task and writer of every open connection
+        self._clients = {}
+
+    async def start(self):
+        self._executor = ProcessPoolExecutor(max_workers=self._workers)
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self._max_pending)
+        self._batcher = asyncio.create_task(self._run_batches())
+        self._server = await asyncio.start_server(
+            self._handle_client, self.host, self.port
+        )
+        # Report the port actually bound when asked for any free one
+        self.port = self._server.sockets[0].getsockname()[1]
+        log.info("Serving on %s:%d", self.host, self.port)
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        clients = list(self._clients.items())
+        for task, writer in clients:
+            writer.close()
+            task.cancel()
+        await asyncio.gather(*(task for task, _ in clients), return_exceptions=True)
+        await self._server.wait_closed()
+        tasks = [self._batcher, *self._tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Waiting for running work would block the event loop
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _handle_client(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        write_lock = asyncio.Lock()
+        replies = set()
+        task = asyncio.current_task()
+        self._clients[task] = writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    request_id = request.get("id")
+                except (ValueError, AttributeError):
+                    await self._write(writer, write_lock, {"error": "invalid JSON"})
+                    continue
+                try:
+                    deadline_ms = request.get("deadline_ms")
+                    deadline = (
+                        loop.time() + float(deadline_ms) / 1000
+                        if deadline_ms is not None
+                        else None
+                    )
+                except (ValueError, TypeError):
+                    await self._write(
+                        writer,
+                        write_lock,
+                        {"id": request_id, "error": "deadline_ms must be a number"},
+                    )
+                    continue
+                pending = _Pending(request, loop.create_future(), deadline)
+                # Waits while max_pending requests are queued or running,
+                # which stops reading from this client until some finish
+                await self._slots.acquire()
+                self._in_flight += 1
+                self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+                await self._queue.put(pending)
+                reply = asyncio.create_task(
+                    self._reply(writer, write_lock, request_id, pending)
+                )
+                replies.add(reply)
+                reply.add_done_callback(replies.discard)
+            if replies:
+                await asyncio.gather(*replies, return_exceptions=True)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for reply in replies:
+                reply.cancel()
+            writer.close()
+            del self._clients[task]
+
+    async def _reply(self, writer, write_lock, request_id, pending):
+        try:
+            if pending.deadline is None:
+                response = await pending.future
+            else:
+                timeout = pending.deadline - asyncio.get_running_loop().time()
+                # Shielded so a late answer still releases its slot when the
+                # work it is waiting on finishes
+                response = await asyncio.wait_for(
+                    asyncio.shield(pending.future), max(timeout, 0)
+                )
+        except asyncio.TimeoutError:
+            # Nobody waits for the answer any more; retrieve it so a late
+            # error is not logged as never retrieved
+            pending.future.add_done_callback(_discard_result)
+            response = {"error": "deadline exceeded"}
+        except Exception as error:
+            response = {"error": str(error)}
+        response = dict(response, id=request_id)
+        try:
+            await self._write(writer, write_lock, response)
+        except ConnectionError:
+            pass
+
+    async def _write(self, writer, write_lock, response):
+        async with write_lock:
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            batch_end = loop.time() + self._batch_delay
+            while len(batch) < self._batch_size:
+                timeout = batch_end - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                self._dispatch(batch, loop.time())
+            except Exception:
+                # Never let one batch end the batcher: fail what is left of it
+                log.exception("Failed to dispatch a batch")
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(ValueError("internal error"))
+                    self._release([pending])
+
+    def _dispatch(self, batch, now):
+        # Answer the requests that need no work and send the others to the
+        # pool, rank requests in one task and equity requests in one per worker
+        ranks = []
+        equities = []
+        for pending in batch:
+            if pending.future.done():
+                self._release([pending])
+                continue
+            if pending.deadline is not None and pending.deadline <= now:
+                # Too late to be worth computing
+                pending.future.set_exception(asyncio.TimeoutError())
+                self._release([pending])
+                continue
+            try:
+                operation = pending.request.get("op", "rank")
+                if operation == "rank":
+                    ranks.append((pending, _rank_request(pending.request)))
+                elif operation == "equity":
+                    _equity_request(pending.request)
+                    equities.append((pending, pending.request))
+                else:
+                    raise ValueError("Unknown op: {}".format(operation))
+            except Exception as error:
+                pending.future.set_exception(ValueError(str(error)))
+                self._release([pending])
+        if ranks:
+            self._spawn_batch(rank_batch, ranks)
+        # Equity runs are long, so spread them over the workers
+        tasks = min(self._workers, len(equities))
+        for start in range(tasks):
+            self._spawn_batch(equity_batch, equities[start::tasks])
+
+    def _release(self, pendings):
+        # Free the slots of the requests, each one once
+        for pending in pendings:
+            if not pending.released:
+                pending.released = True
+                self._in_flight -= 1
+                self._slots.release()
+
+    def _spawn_batch(self, function, items):
+        self._spawn(
+            self._run(
+                function,
+                [pending for pending, _ in items],
+                [argument for _, argument in items],
+            )
+        )
+
+    def _spawn(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, function, pendings, arguments):
+        # Run function(arguments) on the pool and answer each pending request
+        # with the matching result
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self._executor, function, arguments)
+        except Exception as error:
+            for pending in pendings:
+                if not pending.future.done():
+                    pending.future.set_exception(ValueError(str(error)))
+            return
+        finally:
+            self._release(pendings)
+        for pending, response in zip(pendings, results):
+            if not pending.future.done():
+                pending.future.set_result(response)
+
+
+async def _serve(arguments):
+    async with EvaluationServer(
+        arguments.host,
+        arguments.port,
+        workers=arguments.workers,
+        batch_size=arguments.batch_size,
+        max_pending=arguments.max_pending,
+    ) as server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pokerhands.server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--max-pending", type=int, default=10000)
+    arguments = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(arguments))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Settle a showdown between any number of players, side pots included.
+
+Every player still in the hand gets one score, their best equivalence class
+(lower is better), so ranking N players takes N evaluations instead of
+pairwise comparisons. The pot is then split into layers by contribution:
+each side pot holds what every player put in up to the next all-in amount,
+and goes to the best hands among the players who matched it and did not
+fold.
+"""
+from .eval import best_class
+from .eval.seven_card import (
+    FLUSH_BITS,
+    FLUSH_CARRY,
+    RANK_KEYS,
+    SUIT_FIELDS,
+    flush_suit,
+    get_seven_card_tables,
+)
+
+
+class Pot:
+    """A main or side pot: its chips, who may win it and who did."""
+
+    def __init__(self, amount, eligible, winners):
+        self.amount = amount
+        self.eligible = eligible
+        self.winners = winners
+
+
+class ShowdownResult:
+    """The outcome of a showdown.
+
+    ``classes`` holds every player's equivalence class (None for a folded
+    player, or for everyone when a single player is left), ``pots`` the
+    pots from the main pot up and ``payouts`` the chips paid to each player.
+    """
+
+    def __init__(self, classes, pots, payouts):
+        self.classes = classes
+        self.pots = pots
+        self.payouts = payouts
+
+    def get_winners(self):
+        # Players winning at least part of the main pot
+        return self.pots[0].winners if self.pots else ()
+
+
+def rank_players(hole_codes, board_codes):
+    """Return the best equivalence class of each hole, None for a folded one.
+
+    With two hole cards and a full board the board's rank key and suit counts
+    are computed once and shared by every player, each then costing one
+    addition and one table lookup.
+    """
+    live = [hole for hole in hole_codes if hole is not None]
+    if len(board_codes) == 5 and all(len(hole) == 2 for hole in live):
+        return _rank_seven_card(hole_codes, board_codes)
+    return [
+        best_class(list(hole) + list(board_codes)) if hole is not None else None
+        for hole in hole_codes
+    ]
+
+
+def _rank_seven_card(hole_codes, board_codes):
+    tables = get_seven_card_tables()
+    board_key = 0
+    board_suits = 0
+    for code in board_codes:
+        board_key += RANK_KEYS[code]
+        board_suits += SUIT_FIELDS[code]
+
+    classes = []
+    for hole in hole_codes:
+        if hole is None:
+            classes.append(None)
+            continue
+        first, second = hole
+        suit_field = board_suits + SUIT_FIELDS[first] + SUIT_FIELDS[second]
+        if (suit_field + FLUSH_CARRY) & FLUSH_BITS:
+            suit = flush_suit(suit_field)
+            mask = 0
+            for code in (first, second, *board_codes):
+                if code & 3 == suit:
+                    mask |= 1 << (code >> 2)
+            classes.append(tables.flushes[mask])
+        else:
+            classes.append(
+                tables.ranks[board_key + RANK_KEYS[first] + RANK_KEYS[second]]
+            )
+    return classes
+
+
+def build_pots(contributions, folded):
+    """Split contributions into (amount, eligible players) from the main pot up.
+
+    Chips in a layer that no live player matched, such as the part of a
+    folded player's bet above every all-in, go to the pot below it, or to a
+    pot for every live player when there is none below.
+    """
+    pots = []
+    carried = 0
+    previous_level = 0
+    for level in sorted(set(contributions)):
+        if level <= 0:
+            continue
+        amount = carried + sum(
+            min(contribution, level) - min(contribution, previous_level)
+            for contribution in contributions
+        )
+        previous_level = level
+        eligible = tuple(
+            player
+            for player, contribution in enumerate(contributions)
+            if contribution >= level and not folded[player]
+        )
+        if eligible:
+            pots.append((amount, eligible))
+            carried = 0
+        elif pots:
+            pots[-1] = (pots[-1][0] + amount, pots[-1][1])
+        else:
+            carried = amount
+    if carried:
+        # No live player matched any bet, e.g. the only live player put in
+        # nothing: every live player may still win the chips
+        if pots:
+            pots[0] = (pots[0][0] + carried, pots[0][1])
+        else:
+            live = tuple(player for player, fold in enumerate(folded) if not fold)
+            pots.append((carried, live))
+    return pots
+
+
+def settle(hole_cards, board, contributions, folded=None, button=None):
+    """Rank every live player once and pay out the main and side pots.
+
+    ``hole_cards`` holds each player's cards (None for a player who folded
+    without showing), ``contributions`` the chips each player put in, in
+    the same order. A pot tied between k winners is split evenly and any
+    odd chips go one at a time to the winners nearest the left of
+    ``button``, or in seat order when no button is given.
+    """
+    number_of_players = len(hole_cards)
+    if len(contributions) != number_of_players:
+        raise ValueError("Give one contribution per player")
+    if any(contribution < 0 for contribution in contributions):
+        raise ValueError("Contributions may not be negative")
+    if folded is None:
+        folded = [hole is None for hole in hole_cards]
+    elif len(folded) != number_of_players:
+        raise ValueError("Give one folded flag per player")
+    folded = [bool(fold) or hole is None for fold, hole in zip(folded, hole_cards)]
+    if all(folded):
+        raise ValueError("At least one player must reach the showdown")
+
+    board_codes = [card.code for card in board]
+    hole_codes = [
+        None if fold else tuple(card.code for card in hole)
+        for fold, hole in zip(folded, hole_cards)
+    ]
+    dealt = board_codes + [code for hole in hole_codes if hole for code in hole]
+    if len(set(dealt)) != len(dealt):
+        raise ValueError("A card may only be dealt once")
+
+    if folded.count(False) > 1:
+        classes = rank_players(hole_codes, board_codes)
+    else:
+        classes = [None] * number_of_players
+    if button is None:
+        seat_order = list(range(number_of_players))
+    else:
+        seat_order = [
+            (button + 1 + offset) % number_of_players
+            for offset in range(number_of_players)
+        ]
+
+    pots = []
+    payouts = [0] * number_of_players
+    for amount, eligible in build_pots(contributions, folded):
+        if len(eligible) == 1:
+            winners = eligible
+        else:
+            best = min(classes[player] for player in eligible)
+            winners = tuple(player for player in eligible if classes[player] == best)
+        share, odd_chips = divmod(amount, len(winners))
+        for player in winners:
+            payouts[player] += share
+        for player in [seat for seat in seat_order if seat in winners][:odd_chips]:
+            payouts[player] += 1
+        pots.append(Pot(amount, eligible, winners))
+    return ShowdownResult(classes, pots, payouts)
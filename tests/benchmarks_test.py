@@ -0,0 +1,35 @@
+import unittest
+
+from benchmarks.hot_paths import BENCHMARKS
+from benchmarks.run import compare, run_benchmark
+
+
+class BenchmarksTest(unittest.TestCase):
+    def test_every_benchmark_runs(self):
+        for name, setup in BENCHMARKS.items():
+            result = run_benchmark(setup, repeat=1)
+            self.assertGreater(result["ops_per_sec"], 0, name)
+            self.assertLessEqual(result["batch_p50_us"], result["batch_p95_us"], name)
+
+    def test_compare(self):
+        baseline = {
+            "results": {
+                "fast": {"ops_per_sec": 1000.0},
+                "noisy": {"ops_per_sec": 1000.0},
+            },
+            "thresholds": {"noisy": 0.5},
+        }
+        results = {
+            "results": {
+                "fast": {"ops_per_sec": 850.0},
+                "noisy": {"ops_per_sec": 600.0},
+                "new": {"ops_per_sec": 1.0},
+            }
+        }
+        regressions = compare(results, baseline, threshold=0.1)
+        self.assertEqual(["fast"], [name for name, *_ in regressions])
+        self.assertEqual([], compare(results, baseline, threshold=0.2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from pokerhands.canonical import canonical_codes, canonical_key
+from pokerhands.card import Card
+from pokerhands.rank import Rank
+from pokerhands.suit import Suit
+
+
+class CanonicalTest(unittest.TestCase):
+    def test_suit_permutations_share_a_key(self):
+        hearts = [[Card(Rank.ACE, Suit.HEARTS), Card(Rank.KING, Suit.HEARTS)]]
+        spades = [[Card(Rank.ACE, Suit.SPADES), Card(Rank.KING, Suit.SPADES)]]
+        queens_sd = [Card(Rank.QUEEN, Suit.SPADES), Card(Rank.QUEEN, Suit.DIAMONDS)]
+        queens_hc = [Card(Rank.QUEEN, Suit.HEARTS), Card(Rank.QUEEN, Suit.CLUBS)]
+        self.assertEqual(
+            canonical_key(hearts + [queens_sd]), canonical_key(spades + [queens_hc])
+        )
+
+    def test_board_is_relabelled_with_the_hands(self):
+        hole_cards = [
+            [Card(Rank.ACE, Suit.HEARTS), Card(Rank.KING, Suit.HEARTS)],
+            [Card(Rank.TWO, Suit.CLUBS), Card(Rank.TWO, Suit.DIAMONDS)],
+        ]
+        suited_board = [Card(Rank.NINE, Suit.HEARTS), Card(Rank.FIVE, Suit.HEARTS)]
+        offsuit_board = [Card(Rank.NINE, Suit.SPADES), Card(Rank.FIVE, Suit.SPADES)]
+        self.assertNotEqual(
+            canonical_key(hole_cards, suited_board),
+            canonical_key(hole_cards, offsuit_board),
+        )
+
+    def test_card_order_does_not_matter(self):
+        self.assertEqual(
+            canonical_codes([[48, 44], [0, 1]], [20, 8, 4]),
+            canonical_codes([[44, 48], [1, 0]], [4, 8, 20]),
+        )
+
+    def test_player_order_matters(self):
+        self.assertNotEqual(
+            canonical_codes([[48, 49], [0, 4]]), canonical_codes([[0, 4], [48, 49]])
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
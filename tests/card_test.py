@@ -1,6 +1,8 @@
+import copy
+import pickle
 import unittest
 
-from pokerhands.card import Card
+from pokerhands.card import Card, parse_cards
 from pokerhands.rank import Rank
 from pokerhands.suit import Suit
 
@@ -55,6 +57,56 @@ class CardTest(unittest.TestCase):
 
         self.assertNotEqual(king_hearts_1, None)
 
+    def test_cards_are_interned(self):
+        self.assertIs(Card(Rank.KING, Suit.HEARTS), Card(Rank.KING, Suit.HEARTS))
+        self.assertIsNot(Card(Rank.KING, Suit.HEARTS), Card(Rank.KING, Suit.CLUBS))
+
+    def test_code(self):
+        codes = set()
+        for rank in Rank:
+            for suit in Suit:
+                card = Card(rank, suit)
+                self.assertIs(card, Card.from_code(card.code))
+                self.assertEqual(rank.value - 2, card.code >> 2)
+                codes.add(card.code)
+        self.assertEqual(set(range(52)), codes)
+
+    def test_copies_are_the_same_card(self):
+        card = Card(Rank.ACE, Suit.SPADES)
+        self.assertIs(card, copy.copy(card))
+        self.assertIs(card, copy.deepcopy(card))
+        self.assertIs(card, pickle.loads(pickle.dumps(card)))
+
+    def test_card_is_immutable(self):
+        card = Card(Rank.ACE, Suit.SPADES)
+        with self.assertRaises(AttributeError):
+            card.rank = Rank.TWO
+        self.assertFalse(hasattr(card, "__dict__"))
+
+    def test_hash(self):
+        self.assertEqual(
+            {Card(Rank.ACE, Suit.SPADES), Card(Rank.TWO, Suit.CLUBS)},
+            {Card(Rank.TWO, Suit.CLUBS), Card(Rank.ACE, Suit.SPADES)},
+        )
+
+    def test_parse_short_names(self):
+        self.assertIs(Card(Rank.ACE, Suit.HEARTS), Card.parse("Ah"))
+        self.assertIs(Card(Rank.TEN, Suit.DIAMONDS), Card.parse("Td"))
+        for code in range(52):
+            card = Card.from_code(code)
+            self.assertIs(card, Card.parse(card.short_name()))
+        for text in ["", "A", "1h", "Ax", "ah", "Ahh"]:
+            self.assertRaises(ValueError, lambda: Card.parse(text))
+
+    def test_parse_cards(self):
+        self.assertEqual(
+            [Card(Rank.ACE, Suit.HEARTS).code, Card(Rank.TEN, Suit.DIAMONDS).code],
+            parse_cards("Ah Td"),
+        )
+        self.assertEqual(parse_cards("AhTd"), parse_cards(["Ah", "Td"]))
+        with self.assertRaises(ValueError):
+            parse_cards("AhT")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,18 @@
+import random
 import unittest
-from pokerhands.deck import Deck
+from itertools import islice
+from pokerhands.card import Card
+from pokerhands.deck import Deck, NotEnoughCardsException, Shoe
+from pokerhands.rank import Rank
+from pokerhands.suit import Suit
+
+from pokerhands.eval import best_class
+
+try:
+    import numpy as np
+    from pokerhands.eval.batch import evaluate_classes
+except ImportError:
+    np = None
 
 
 class DeckTest(unittest.TestCase):
@@ -25,6 +38,146 @@ class DeckTest(unittest.TestCase):
         self.assertEqual(52, len(cards))
         self.assertEqual(0, deck.number_of_cards())
 
+    def test_deck_pick_too_many(self):
+        deck = Deck()
+        deck.pick(50)
+        self.assertRaises(NotEnoughCardsException, lambda: deck.pick(3))
+        self.assertEqual(2, deck.number_of_cards())
+
+    def test_deck_pick_negative(self):
+        deck = Deck()
+        self.assertRaises(ValueError, lambda: deck.pick(-1))
+        self.assertEqual(52, deck.number_of_cards())
+
+    def test_deck_deals_every_card_once(self):
+        deck = Deck()
+        cards = deck.pick(20) + deck.pick(32)
+        self.assertEqual(52, len(set(cards)))
+
+    def test_seeded_decks_are_replayable(self):
+        first = Deck(random.Random(1234))
+        second = Deck(random.Random(1234))
+        self.assertEqual(first.pick(5), second.pick(5))
+        self.assertEqual(first.pick(47), second.pick(47))
+
+    def test_reset(self):
+        deck = Deck(random.Random(1))
+        deck.pick(30)
+        deck.reset()
+        self.assertEqual(52, deck.number_of_cards())
+        self.assertEqual(52, len(set(deck.pick(52))))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy_generator(self):
+        first = Deck(np.random.default_rng(7))
+        second = Deck(np.random.default_rng(7))
+        self.assertEqual(first.pick(9), second.pick(9))
+
+    def test_invalid_rng(self):
+        self.assertRaises(ValueError, lambda: Deck(object()))
+
+    def test_deal_stream(self):
+        deals = list(Deck.deal_stream(3, 2, board=5, seed=8, count=100))
+        self.assertEqual(100, len(deals))
+        for holes, board in deals:
+            self.assertEqual(3, len(holes))
+            self.assertEqual(5, len(board))
+            codes = [code for hole in holes for code in hole] + list(board)
+            self.assertEqual(11, len(set(codes)))
+            for hole in holes:
+                self.assertTrue(1 <= best_class(list(hole) + list(board)) <= 7462)
+        self.assertEqual(
+            deals, list(Deck.deal_stream(3, 2, board=5, seed=8, count=100))
+        )
+
+    def test_deal_stream_is_lazy(self):
+        stream = Deck.deal_stream(2, 2, seed=1)
+        self.assertEqual(10, len(list(islice(stream, 10))))
+
+    def test_deal_stream_too_many_cards(self):
+        stream = Deck.deal_stream(10, 5, board=5)
+        self.assertRaises(NotEnoughCardsException, lambda: next(stream))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_deal_arrays(self):
+        chunks = [
+            chunk.copy()
+            for chunk in Deck.deal_arrays(
+                2, 2, board=5, chunk_size=400, seed=3, count=1000
+            )
+        ]
+        self.assertEqual([400, 400, 200], [len(chunk) for chunk in chunks])
+        deals = np.concatenate(chunks)
+        self.assertEqual((1000, 9), deals.shape)
+        for deal in deals.tolist():
+            self.assertEqual(9, len(set(deal)))
+        first_player = evaluate_classes(
+            np.concatenate([deals[:, 0:2], deals[:, 4:]], axis=1)
+        )
+        self.assertEqual(
+            best_class(deals[0, [0, 1, 4, 5, 6, 7, 8]].tolist()), first_player[0]
+        )
+
+
+class ShoeTest(unittest.TestCase):
+    def test_shoe_size(self):
+        self.assertEqual(52, Shoe().number_of_cards())
+        self.assertEqual(312, Shoe(6).number_of_cards())
+        self.assertRaises(ValueError, lambda: Shoe(0))
+
+    def test_remove(self):
+        shoe = Shoe()
+        ace = Card(Rank.ACE, Suit.SPADES)
+        self.assertIn(ace, shoe)
+        shoe.remove(ace)
+        self.assertNotIn(ace, shoe)
+        self.assertEqual(51, shoe.number_of_cards())
+        self.assertEqual((1 << 52) - 1 - (1 << ace.code), shoe.get_mask())
+        self.assertRaises(ValueError, lambda: shoe.remove(ace))
+
+    def test_remove_from_several_decks(self):
+        shoe = Shoe(2)
+        king = Card(Rank.KING, Suit.HEARTS)
+        shoe.remove(king)
+        self.assertEqual(1, shoe.count(king))
+        self.assertTrue(shoe.contains(king))
+        shoe.remove(king)
+        self.assertFalse(shoe.contains(king))
+        self.assertEqual(102, len(shoe.remaining_codes()))
+        self.assertNotIn(king.code, shoe.remaining_codes())
+
+    def test_remove_every_card(self):
+        shoe = Shoe(3)
+        cards = [Card(rank, suit) for rank in Rank for suit in Suit] * 3
+        random.Random(4).shuffle(cards)
+        for index, card in enumerate(cards):
+            shoe.remove(card)
+            self.assertEqual(len(cards) - index - 1, shoe.number_of_cards())
+        self.assertEqual(0, shoe.get_mask())
+
+    def test_pick(self):
+        shoe = Shoe(rng=random.Random(2))
+        cards = shoe.pick(10)
+        self.assertEqual(10, len(set(cards)))
+        self.assertEqual(42, shoe.number_of_cards())
+        for card in cards:
+            self.assertNotIn(card, shoe)
+        self.assertRaises(NotEnoughCardsException, lambda: shoe.pick(43))
+        self.assertRaises(ValueError, lambda: shoe.pick(-1))
+        self.assertRaises(ValueError, lambda: shoe.sample_codes(-1))
+        self.assertEqual(42, shoe.number_of_cards())
+
+    def test_sample_leaves_shoe_untouched(self):
+        shoe = Shoe(rng=random.Random(2))
+        ace = Card(Rank.ACE, Suit.SPADES)
+        shoe.remove(ace)
+        cards = shoe.sample(51)
+        self.assertEqual(51, len(set(cards)))
+        self.assertNotIn(ace, cards)
+        self.assertEqual(51, shoe.number_of_cards())
+        shoe.reset()
+        self.assertEqual(52, shoe.number_of_cards())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,221 @@
+import unittest
+
+from pokerhands.card import Card
+from pokerhands.deck import NotEnoughCardsException
+from itertools import combinations
+
+from pokerhands.equity import EquityCache, exact_equity, monte_carlo_equity
+from pokerhands.hand import Hand
+from pokerhands.rank import Rank
+from pokerhands.suit import Suit
+
+ACES = [Card(Rank.ACE, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS)]
+KINGS = [Card(Rank.KING, Suit.SPADES), Card(Rank.KING, Suit.HEARTS)]
+
+
+class MonteCarloEquityTest(unittest.TestCase):
+    def test_aces_against_kings(self):
+        result = monte_carlo_equity([ACES, KINGS], trials=10000, seed=3, workers=1)
+        aces, kings = result.get_equities()
+        self.assertAlmostEqual(0.82, aces, delta=0.02)
+        self.assertAlmostEqual(1.0, aces + kings)
+        self.assertEqual(10000, result.trials)
+        for player in range(2):
+            self.assertEqual(
+                10000, result.wins[player] + result.ties[player] + result.losses[player]
+            )
+
+    def test_seed_is_reproducible(self):
+        first = monte_carlo_equity([ACES, KINGS], trials=6000, seed=11, workers=1)
+        second = monte_carlo_equity([ACES, KINGS], trials=6000, seed=11, workers=1)
+        self.assertEqual(first.wins, second.wins)
+        self.assertEqual(first.get_equities(), second.get_equities())
+
+    def test_workers_do_not_change_the_result(self):
+        inline = monte_carlo_equity([ACES, KINGS], trials=12000, seed=5, workers=1)
+        pooled = monte_carlo_equity([ACES, KINGS], trials=12000, seed=5, workers=2)
+        self.assertEqual(inline.wins, pooled.wins)
+        self.assertEqual(inline.ties, pooled.ties)
+
+    def test_complete_board(self):
+        board = [
+            Card(Rank.TWO, Suit.CLUBS),
+            Card(Rank.SEVEN, Suit.DIAMONDS),
+            Card(Rank.NINE, Suit.CLUBS),
+            Card(Rank.JACK, Suit.DIAMONDS),
+            Card(Rank.FOUR, Suit.SPADES),
+        ]
+        result = monte_carlo_equity([ACES, KINGS], board=board, trials=10, workers=1)
+        self.assertEqual([1.0, 0.0], result.get_equities())
+        self.assertEqual([0.0, 0.0], result.get_standard_errors())
+
+    def test_board_plays(self):
+        board = [
+            Card(Rank.TEN, Suit.CLUBS),
+            Card(Rank.JACK, Suit.CLUBS),
+            Card(Rank.QUEEN, Suit.CLUBS),
+            Card(Rank.KING, Suit.CLUBS),
+            Card(Rank.ACE, Suit.CLUBS),
+        ]
+        result = monte_carlo_equity([ACES, KINGS], board=board, trials=10, workers=1)
+        self.assertEqual([0.5, 0.5], result.get_equities())
+        self.assertEqual([10, 10], result.ties)
+
+    def test_target_error_stops_early(self):
+        result = monte_carlo_equity(
+            [ACES, KINGS], trials=100000, target_error=0.01, seed=1, workers=1
+        )
+        self.assertTrue(result.trials < 100000)
+        self.assertTrue(max(result.get_standard_errors()) <= 0.01)
+
+    def test_invalid_input(self):
+        self.assertRaises(ValueError, lambda: monte_carlo_equity([ACES]))
+        self.assertRaises(ValueError, lambda: monte_carlo_equity([ACES, ACES]))
+        self.assertRaises(
+            ValueError, lambda: monte_carlo_equity([ACES, KINGS], board=KINGS[:1])
+        )
+        for trials in (0, -1):
+            self.assertRaises(
+                ValueError, lambda: monte_carlo_equity([ACES, KINGS], trials=trials)
+            )
+        self.assertRaises(
+            ValueError, lambda: monte_carlo_equity([ACES, KINGS], target_error=0)
+        )
+        dead_cards = [Card(rank, suit) for rank in Rank for suit in Suit]
+        for card in ACES + KINGS:
+            dead_cards.remove(card)
+        self.assertRaises(
+            NotEnoughCardsException,
+            lambda: monte_carlo_equity([ACES, KINGS], dead_cards=dead_cards[4:]),
+        )
+
+
+class ExactEquityTest(unittest.TestCase):
+    def test_flop_matches_brute_force(self):
+        flop = [
+            Card(Rank.TWO, Suit.SPADES),
+            Card(Rank.SEVEN, Suit.SPADES),
+            Card(Rank.KING, Suit.CLUBS),
+        ]
+        result = exact_equity([ACES, KINGS], board=flop)
+        self.assertTrue(result.exact)
+        self.assertEqual(990, result.trials)
+
+        remaining = [
+            Card(rank, suit)
+            for rank in Rank
+            for suit in Suit
+            if Card(rank, suit) not in ACES + KINGS + flop
+        ]
+        wins = [0, 0]
+        ties = 0
+        for turn_and_river in combinations(remaining, 2):
+            board = flop + list(turn_and_river)
+            aces = Hand(ACES + board).find_best_hand()
+            kings = Hand(KINGS + board).find_best_hand()
+            comparison = aces.compare_to(kings)
+            if comparison > 0:
+                wins[0] += 1
+            elif comparison < 0:
+                wins[1] += 1
+            else:
+                ties += 1
+        self.assertEqual(wins, result.wins)
+        self.assertEqual([ties, ties], result.ties)
+
+    def test_three_players_on_the_turn(self):
+        queens = [Card(Rank.QUEEN, Suit.CLUBS), Card(Rank.QUEEN, Suit.DIAMONDS)]
+        board = [
+            Card(Rank.TWO, Suit.CLUBS),
+            Card(Rank.SEVEN, Suit.CLUBS),
+            Card(Rank.NINE, Suit.CLUBS),
+            Card(Rank.FOUR, Suit.SPADES),
+        ]
+        result = exact_equity([ACES, KINGS, queens], board=board)
+        self.assertEqual(42, result.trials)
+        self.assertAlmostEqual(1.0, sum(result.get_equities()))
+        self.assertEqual([0.0, 0.0, 0.0], result.get_standard_errors())
+
+    def test_reproducible(self):
+        flop = [
+            Card(Rank.TEN, Suit.SPADES),
+            Card(Rank.JACK, Suit.SPADES),
+            Card(Rank.QUEEN, Suit.HEARTS),
+        ]
+        first = exact_equity([ACES, KINGS], board=flop)
+        second = exact_equity([ACES, KINGS], board=flop)
+        self.assertEqual(first.get_equities(), second.get_equities())
+
+    def test_three_card_holes_are_enumerated(self):
+        # The best five of all the cards, not the Omaha two-plus-three rule
+        board = [
+            Card(Rank.TWO, Suit.CLUBS),
+            Card(Rank.SEVEN, Suit.DIAMONDS),
+            Card(Rank.NINE, Suit.CLUBS),
+            Card(Rank.JACK, Suit.DIAMONDS),
+        ]
+        extra = [Card(Rank.THREE, Suit.HEARTS)]
+        result = exact_equity([ACES + extra, KINGS], board=board)
+        self.assertEqual(43, result.trials)
+
+
+class EquityCacheTest(unittest.TestCase):
+    FLOP = [
+        Card(Rank.TWO, Suit.SPADES),
+        Card(Rank.SEVEN, Suit.SPADES),
+        Card(Rank.NINE, Suit.CLUBS),
+    ]
+
+    def test_isomorphic_queries_hit(self):
+        cache = EquityCache()
+        first = cache.equity([ACES, KINGS], self.FLOP)
+        # Swap spades with diamonds and hearts with clubs
+        swapped = {
+            Suit.SPADES: Suit.DIAMONDS,
+            Suit.HEARTS: Suit.CLUBS,
+            Suit.CLUBS: Suit.HEARTS,
+        }
+
+        def relabel(cards):
+            return [
+                Card(card.rank, swapped.get(card.suit, card.suit)) for card in cards
+            ]
+
+        second = cache.equity([relabel(ACES), relabel(KINGS)], relabel(self.FLOP))
+        self.assertIs(first, second)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(0.5, cache.hit_rate())
+
+    def test_options_are_part_of_the_key(self):
+        cache = EquityCache(compute=monte_carlo_equity)
+        cache.equity([ACES, KINGS], self.FLOP, trials=100, seed=1, workers=1)
+        cache.equity([ACES, KINGS], self.FLOP, trials=200, seed=1, workers=1)
+        self.assertEqual(2, cache.misses)
+        self.assertEqual(2, cache.size())
+
+    def test_least_recently_used_entry_is_evicted(self):
+        calls = []
+
+        def compute(hole_cards, board, dead_cards):
+            calls.append(board)
+            return len(calls)
+
+        cache = EquityCache(compute=compute, max_size=2)
+        boards = [self.FLOP[:1], self.FLOP[1:2], self.FLOP[2:]]
+        cache.equity([ACES, KINGS], boards[0])
+        cache.equity([ACES, KINGS], boards[1])
+        cache.equity([ACES, KINGS], boards[0])
+        cache.equity([ACES, KINGS], boards[2])
+        self.assertEqual(2, cache.size())
+        self.assertEqual(1, cache.equity([ACES, KINGS], boards[0]))
+        cache.equity([ACES, KINGS], boards[1])
+        self.assertEqual(4, len(calls))
+
+        cache.clear()
+        self.assertEqual(0, cache.size())
+        self.assertEqual(0.0, cache.hit_rate())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from pokerhands.eval.artifact import DEFAULT_PATH, TableArtifact
+from pokerhands.eval.seven_card import build_seven_card_tables
+from pokerhands.eval.tables import build_tables
+
+
+class TableArtifactTest(unittest.TestCase):
+    def setUp(self):
+        with open(DEFAULT_PATH, "rb") as artifact_file:
+            self.contents = artifact_file.read()
+
+    def _write_copy(self, contents):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "evaluator.bin")
+        with open(path, "wb") as artifact_file:
+            artifact_file.write(contents)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_shipped_file_matches_built_tables(self):
+        artifact = TableArtifact()
+        tables = build_tables()
+        mapped = artifact.get_tables()
+        self.assertEqual(tables.flushes, list(mapped.flushes))
+        self.assertEqual(tables.unique5, list(mapped.unique5))
+        self.assertEqual(tables.products, mapped.products)
+        self.assertEqual(tables.class_scores, list(mapped.class_scores))
+        self.assertEqual(tables.straight_high, list(mapped.straight_high))
+        self.assertEqual(tables.top_five, list(mapped.top_five))
+        self.assertEqual(tables.bit_count, list(mapped.bit_count))
+
+        seven_card = build_seven_card_tables()
+        mapped_seven_card = artifact.get_seven_card_tables()
+        self.assertEqual(seven_card.ranks, mapped_seven_card.ranks)
+        self.assertEqual(seven_card.flushes, list(mapped_seven_card.flushes))
+
+    def test_corrupt_file_fails_checksum(self):
+        contents = bytearray(self.contents)
+        contents[-100] ^= 1
+        with self.assertRaises(ValueError):
+            TableArtifact(self._write_copy(bytes(contents)))
+
+    def test_other_version_is_rejected(self):
+        contents = bytearray(self.contents)
+        contents[6] += 1
+        with self.assertRaises(ValueError):
+            TableArtifact(self._write_copy(bytes(contents)))
+
+    def test_truncated_file_is_rejected(self):
+        with self.assertRaises(ValueError):
+            TableArtifact(self._write_copy(self.contents[:-8]))
+        with self.assertRaises(ValueError):
+            TableArtifact(self._write_copy(self.contents[:10]))
+
+    def test_import_does_not_load_tables(self):
+        script = (
+            "import sys, pokerhands.hand\n"
+            "from pokerhands.eval import evaluator\n"
+            "assert evaluator._TABLES is None\n"
+            "assert 'pokerhands.eval.artifact' not in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", script], check=True)
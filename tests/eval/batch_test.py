@@ -0,0 +1,57 @@
+import random
+import unittest
+
+from pokerhands.eval import best_class, class_score, evaluate5
+from pokerhands.hand import Hand
+
+try:
+    import numpy as np
+    from pokerhands.eval.batch import evaluate, evaluate_classes
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class BatchTest(unittest.TestCase):
+    def random_deals(self, number_of_hands, number_of_cards):
+        rng = random.Random(number_of_hands * 100 + number_of_cards)
+        return np.array(
+            [rng.sample(range(52), number_of_cards) for _ in range(number_of_hands)]
+        )
+
+    def test_five_card_classes(self):
+        deals = self.random_deals(1000, 5)
+        eq_classes = evaluate_classes(deals)
+        self.assertEqual((1000,), eq_classes.shape)
+        for deal, eq_class in zip(deals.tolist(), eq_classes.tolist()):
+            self.assertEqual(evaluate5(*deal), eq_class)
+
+    def test_seven_card_classes(self):
+        deals = self.random_deals(500, 7)
+        eq_classes = evaluate_classes(deals)
+        for deal, eq_class in zip(deals.tolist(), eq_classes.tolist()):
+            self.assertEqual(best_class(deal), eq_class)
+
+    def test_scores_and_categories_match_hand(self):
+        deals = self.random_deals(200, 5)
+        scores, categories = evaluate(deals)
+        for deal, score, category in zip(
+            deals.tolist(), scores.tolist(), categories.tolist()
+        ):
+            hand = Hand.from_codes(sorted(deal))
+            self.assertEqual(hand.get_hand_score(), score)
+            self.assertEqual(hand.get_hand_rank(), category)
+
+    def test_royal_flush(self):
+        # Ten to ace of spades
+        scores, categories = evaluate([[32, 36, 40, 44, 48]])
+        self.assertEqual([class_score(1)], scores.tolist())
+        self.assertEqual([10], categories.tolist())
+
+    def test_invalid_shape(self):
+        self.assertRaises(ValueError, lambda: evaluate_classes([0, 1, 2, 3, 4]))
+        self.assertRaises(ValueError, lambda: evaluate_classes([[0, 1, 2, 3]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
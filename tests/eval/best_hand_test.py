@@ -0,0 +1,46 @@
+import random
+import unittest
+from itertools import combinations
+
+from pokerhands.eval import best_class, best_hand, evaluate5
+
+
+class BestHandTest(unittest.TestCase):
+    def assert_matches_combinations(self, codes):
+        eq_class, five = best_hand(codes)
+        self.assertEqual(
+            min(evaluate5(*combo) for combo in combinations(codes, 5)), eq_class
+        )
+        self.assertEqual(5, len(set(five)))
+        self.assertTrue(set(five) <= set(codes))
+        self.assertEqual(eq_class, evaluate5(*five))
+
+    def test_random_seven_card_hands(self):
+        rng = random.Random(42)
+        for _ in range(500):
+            self.assert_matches_combinations(rng.sample(range(52), 7))
+
+    def test_random_large_hands(self):
+        rng = random.Random(43)
+        for number_of_cards in (5, 6, 9, 12):
+            for _ in range(20):
+                self.assert_matches_combinations(rng.sample(range(52), number_of_cards))
+
+    def test_wheel_straight_flush_beats_flush(self):
+        # Ace to five of spades plus the nine and jack of spades
+        codes = [48, 0, 4, 8, 12, 28, 36]
+        self.assert_matches_combinations(codes)
+        self.assertEqual(10, best_class(codes))
+
+    def test_full_house_from_two_trips(self):
+        # Three queens, three tens and a five
+        codes = [40, 41, 42, 32, 33, 34, 12]
+        eq_class, five = best_hand(codes)
+        self.assertEqual(sorted([40, 41, 42, 32, 33]), sorted(five))
+
+    def test_not_enough_cards(self):
+        self.assertRaises(ValueError, lambda: best_hand([0, 1, 2, 3]))
+
+
+if __name__ == "__main__":
+    unittest.main()
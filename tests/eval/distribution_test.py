@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from itertools import combinations
+
+from pokerhands.eval import class_category
+from pokerhands.eval.distribution import (
+    REFERENCE_COUNTS,
+    DistributionResult,
+    _SUFFIX_NAMES,
+    _five_card_range,
+    _get_suffixes,
+    _save_suffixes,
+    _seven_card_range,
+    hand_category,
+    hand_distribution,
+)
+
+try:
+    import numpy as np
+
+    from pokerhands.eval.batch import evaluate_classes
+except ImportError:
+    np = None
+
+
+class DistributionTest(unittest.TestCase):
+    def test_every_five_card_hand(self):
+        result = hand_distribution(5, workers=1)
+        self.assertEqual(REFERENCE_COUNTS[5], result.counts)
+        self.assertEqual(2598960, result.get_total())
+        self.assertTrue(result.is_correct())
+
+    def test_custom_ranking_matches_the_tables(self):
+        by_class = _five_card_range(40)
+        expected = [0] * 11
+        for eq_class, count in enumerate(by_class):
+            if count:
+                expected[class_category(eq_class)] += count
+        self.assertEqual(expected, _five_card_range(40, hand_category))
+
+    def test_mismatches(self):
+        counts = {**REFERENCE_COUNTS[5], 10: 3, 9: 37}
+        result = DistributionResult(5, counts, 1.0)
+        self.assertFalse(result.is_correct())
+        self.assertEqual([(10, 3, 4), (9, 37, 36)], result.get_mismatches())
+        with self.assertRaises(ValueError):
+            hand_distribution(6)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_seven_card_range(self):
+        prefix = (40, 41)
+        rows = [prefix + rest for rest in combinations(range(42, 52), 5)]
+        expected = np.bincount(evaluate_classes(np.array(rows)), minlength=7463)
+        self.assertEqual(expected.tolist(), _seven_card_range(prefix))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_saved_suffixes(self):
+        # What pool workers map instead of building their own copy
+        with tempfile.TemporaryDirectory() as directory:
+            _save_suffixes(np, directory)
+            for name, values in zip(_SUFFIX_NAMES, _get_suffixes(np)):
+                path = os.path.join(directory, name + ".npy")
+                mapped = np.load(path, mmap_mode="r")
+                self.assertEqual(values.dtype, mapped.dtype)
+                self.assertTrue(np.array_equal(values, mapped))
+                del mapped
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import random
+import unittest
+from collections import Counter
+
+from pokerhands.card import Card
+from pokerhands.deck import Deck
+from pokerhands.eval import (
+    NUMBER_OF_CLASSES,
+    class_category,
+    class_score,
+    describe_class,
+    evaluate5,
+    evaluate_cards,
+    hand_rank,
+    hand_strength,
+    score_class,
+)
+from pokerhands.handrank.hand_strength import HandStrength
+from pokerhands.handrank.score import score_ranks
+from pokerhands.rank import Rank
+from pokerhands.suit import Suit
+
+
+class EvaluatorTest(unittest.TestCase):
+    def test_classes_per_category(self):
+        categories = Counter(
+            class_category(eq_class) for eq_class in range(1, NUMBER_OF_CLASSES + 1)
+        )
+        self.assertEqual(
+            {
+                10: 1,
+                9: 9,
+                8: 156,
+                7: 156,
+                6: 1277,
+                5: 10,
+                4: 858,
+                3: 858,
+                2: 2860,
+                1: 1277,
+            },
+            dict(categories),
+        )
+
+    def test_classes_are_ordered_by_score(self):
+        for eq_class in range(1, NUMBER_OF_CLASSES):
+            self.assertTrue(class_score(eq_class) > class_score(eq_class + 1))
+            self.assertEqual(eq_class, score_class(class_score(eq_class)))
+
+    def test_royal_flush(self):
+        cards = [
+            Card(Rank.ACE, Suit.CLUBS),
+            Card(Rank.KING, Suit.CLUBS),
+            Card(Rank.QUEEN, Suit.CLUBS),
+            Card(Rank.JACK, Suit.CLUBS),
+            Card(Rank.TEN, Suit.CLUBS),
+        ]
+        eq_class = evaluate_cards(cards)
+        self.assertEqual(1, eq_class)
+        self.assertEqual(HandStrength.ROYAL_FLUSH, hand_strength(eq_class))
+        self.assertEqual(
+            "Royal flush of clubs", hand_rank(eq_class, cards).describe_hand()
+        )
+
+    def test_describe_class(self):
+        # Every hand of a class shares one cached description, except that
+        # high cards and royal flushes name the suit of their top card
+        deck = Deck(random.Random(3))
+        for _ in range(2000):
+            deck.reset()
+            cards = deck.pick(5)
+            codes = [card.code for card in cards]
+            eq_class = evaluate5(*codes)
+            description = describe_class(eq_class, codes)
+            self.assertEqual(hand_rank(eq_class, cards).describe_hand(), description)
+            self.assertIs(description, describe_class(eq_class, codes))
+
+        royal_clubs = [Card(rank, Suit.CLUBS).code for rank in Rank if rank.value >= 10]
+        royal_hearts = [
+            Card(rank, Suit.HEARTS).code for rank in Rank if rank.value >= 10
+        ]
+        self.assertEqual("Royal flush of clubs", describe_class(1, royal_clubs))
+        self.assertEqual("Royal flush of hearts", describe_class(1, royal_hearts))
+
+    def test_worst_high_card(self):
+        cards = [
+            Card(Rank.SEVEN, Suit.CLUBS),
+            Card(Rank.FIVE, Suit.HEARTS),
+            Card(Rank.FOUR, Suit.CLUBS),
+            Card(Rank.THREE, Suit.CLUBS),
+            Card(Rank.TWO, Suit.CLUBS),
+        ]
+        eq_class = evaluate_cards(cards)
+        self.assertEqual(NUMBER_OF_CLASSES, eq_class)
+        self.assertEqual(HandStrength.HI_CARD, hand_strength(eq_class))
+
+    def test_order_of_cards_does_not_matter(self):
+        codes = [card.code for card in Deck().pick(5)]
+        self.assertEqual(evaluate5(*codes), evaluate5(*reversed(codes)))
+
+    def test_matches_rank_scoring(self):
+        rng = random.Random(7)
+        codes = list(range(52))
+        for _ in range(2000):
+            hand = rng.sample(codes, 5)
+            is_flush = len(set(code & 3 for code in hand)) == 1
+            score = score_ranks([(code >> 2) + 2 for code in hand], is_flush)
+            self.assertEqual(score, class_score(evaluate5(*hand)))
+
+    def test_evaluate_cards_needs_five_cards(self):
+        self.assertRaises(ValueError, lambda: evaluate_cards(Deck().pick(4)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import random
+import unittest
+from itertools import combinations
+
+from pokerhands.eval import (
+    NUMBER_OF_LOW_CLASSES,
+    best_hand,
+    hi_lo_hand,
+    low_class,
+    low_rank,
+    omaha_hi_lo,
+)
+from pokerhands.eval.omaha import omaha_best_class
+from pokerhands.rank import Rank
+
+
+def _low_values(codes):
+    # Sorted-down ranks of five cards as an ace-to-five low, None if they do
+    # not make an eight-or-better low
+    values = sorted(
+        {1 if code >> 2 == 12 else (code >> 2) + 2 for code in codes}, reverse=True
+    )
+    if len(values) != 5 or values[0] > 8:
+        return None
+    return tuple(values)
+
+
+QUALIFYING_LOWS = sorted(
+    tuple(sorted(values, reverse=True)) for values in combinations(range(1, 9), 5)
+)
+
+
+def _reference_low(codes):
+    lows = [_low_values(five) for five in combinations(codes, 5)]
+    lows = [low for low in lows if low is not None]
+    return QUALIFYING_LOWS.index(min(lows)) + 1 if lows else 0
+
+
+class LowTest(unittest.TestCase):
+    def test_class_order(self):
+        self.assertEqual(56, NUMBER_OF_LOW_CLASSES)
+        self.assertEqual(
+            [Rank.FIVE, Rank.FOUR, Rank.THREE, Rank.TWO, Rank.ACE], low_rank(1).ranks
+        )
+        self.assertEqual(
+            [Rank.EIGHT, Rank.SEVEN, Rank.SIX, Rank.FIVE, Rank.FOUR],
+            low_rank(56).ranks,
+        )
+        for eq_class in range(1, NUMBER_OF_LOW_CLASSES):
+            self.assertGreater(low_rank(eq_class).compare_to(low_rank(eq_class + 1)), 0)
+        self.assertIsNone(low_rank(0))
+
+    def test_random_hands(self):
+        rng = random.Random(19)
+        for number_of_cards in (5, 7, 9):
+            for _ in range(300):
+                codes = rng.sample(range(52), number_of_cards)
+                self.assertEqual(_reference_low(codes), low_class(codes))
+
+    def test_hi_lo_hand(self):
+        rng = random.Random(20)
+        for _ in range(300):
+            codes = rng.sample(range(52), 7)
+            eq_class, five, low = hi_lo_hand(codes)
+            self.assertEqual(best_hand(codes), (eq_class, five))
+            self.assertEqual(low_class(codes), low)
+
+    def test_omaha_hi_lo(self):
+        rng = random.Random(21)
+        for _ in range(300):
+            codes = rng.sample(range(52), 9)
+            hole, board = codes[:4], codes[4:]
+            low = min(
+                (
+                    _reference_low(pair + triple)
+                    for pair in combinations(hole, 2)
+                    for triple in combinations(board, 3)
+                    if _reference_low(pair + triple)
+                ),
+                default=0,
+            )
+            self.assertEqual(
+                (omaha_best_class(hole, board), low), omaha_hi_lo(hole, board)
+            )
+
+    def test_omaha_low_needs_two_low_hole_cards(self):
+        # Ace-deuce-three-four on board, but only one low card in hand
+        board = [12 * 4, 0 * 4 + 1, 1 * 4 + 2, 2 * 4 + 3, 11 * 4]
+        self.assertEqual(0, omaha_hi_lo([3 * 4, 11 * 4 + 1, 10 * 4, 9 * 4], board)[1])
+        self.assertEqual(1, omaha_hi_lo([3 * 4, 2 * 4, 10 * 4, 9 * 4], board)[1])
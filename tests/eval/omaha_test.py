@@ -0,0 +1,74 @@
+import random
+import unittest
+from itertools import combinations
+
+from pokerhands.eval import evaluate5, omaha_best_class, omaha_best_hand
+from pokerhands.eval.omaha import omaha_classes
+
+
+def _code(rank_index, suit):
+    return rank_index * 4 + suit
+
+
+class OmahaTest(unittest.TestCase):
+    def assert_matches_combinations(self, hole, board):
+        eq_class, five = omaha_best_hand(hole, board)
+        self.assertEqual(
+            min(
+                evaluate5(*pair, *triple)
+                for pair in combinations(hole, 2)
+                for triple in combinations(board, 3)
+            ),
+            eq_class,
+        )
+        self.assertEqual(2, len(set(five) & set(hole)))
+        self.assertEqual(3, len(set(five) & set(board)))
+        self.assertEqual(eq_class, evaluate5(*five))
+
+    def test_random_hands(self):
+        rng = random.Random(18)
+        for number_of_hole_cards in (4, 5):
+            for board_size in (3, 4, 5):
+                for _ in range(300):
+                    codes = rng.sample(range(52), number_of_hole_cards + board_size)
+                    self.assert_matches_combinations(
+                        codes[:number_of_hole_cards], codes[number_of_hole_cards:]
+                    )
+
+    def test_one_suited_hole_card_makes_no_flush(self):
+        # Four spades on the board and only the ace of spades in hand
+        board = [_code(1, 0), _code(4, 0), _code(7, 0), _code(9, 0), _code(10, 3)]
+        hole = [_code(12, 0), _code(12, 1), _code(2, 2), _code(3, 3)]
+        flush = min(evaluate5(_code(12, 0), *board[:4]), evaluate5(*board))
+        self.assertLess(flush, omaha_best_class(hole, board))
+        self.assertEqual(
+            min(evaluate5(*hole[:2], *triple) for triple in combinations(board, 3)),
+            omaha_best_class(hole, board),
+        )
+
+    def test_board_quads_play_only_three(self):
+        board = [_code(8, suit) for suit in range(4)] + [_code(0, 0)]
+        hole = [_code(12, 0), _code(11, 1), _code(5, 2), _code(3, 3)]
+        # Three eights and the best two hole cards, never four of a kind
+        self.assertEqual(
+            evaluate5(
+                _code(8, 0), _code(8, 1), _code(8, 2), _code(12, 0), _code(11, 1)
+            ),
+            omaha_best_class(hole, board),
+        )
+
+    def test_classes_for_every_player(self):
+        rng = random.Random(5)
+        codes = rng.sample(range(52), 5 + 4 * 6)
+        board = codes[:5]
+        holes = [codes[start : start + 4] for start in range(5, len(codes), 4)]
+        self.assertEqual(
+            [omaha_best_class(hole, board) for hole in holes],
+            omaha_classes(holes, board),
+        )
+
+    def test_invalid_hands(self):
+        with self.assertRaises(ValueError):
+            omaha_best_class([0], [4, 8, 12, 16, 20])
+        with self.assertRaises(ValueError):
+            omaha_best_class([0, 1, 2, 3], [4, 8])
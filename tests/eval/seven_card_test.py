@@ -0,0 +1,37 @@
+import random
+import unittest
+
+from pokerhands.eval import best_class
+from pokerhands.eval.seven_card import (
+    RANK_KEYS,
+    SUIT_FIELDS,
+    flush_suit,
+    get_seven_card_tables,
+)
+
+
+class SevenCardTest(unittest.TestCase):
+    def test_matches_best_class(self):
+        tables = get_seven_card_tables()
+        rng = random.Random(9)
+        for _ in range(2000):
+            codes = rng.sample(range(52), 7)
+            suit = flush_suit(sum(SUIT_FIELDS[code] for code in codes))
+            if suit < 0:
+                eq_class = tables.ranks[sum(RANK_KEYS[code] for code in codes)]
+            else:
+                mask = 0
+                for code in codes:
+                    if code & 3 == suit:
+                        mask |= 1 << (code >> 2)
+                eq_class = tables.flushes[mask]
+            self.assertEqual(best_class(codes), eq_class)
+
+    def test_flush_suit(self):
+        self.assertEqual(-1, flush_suit(0x2221))
+        self.assertEqual(1, flush_suit(0x0150))
+        self.assertEqual(3, flush_suit(0x7000))
+
+
+if __name__ == "__main__":
+    unittest.main()
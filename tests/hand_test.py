@@ -1,3 +1,5 @@
+import copy
+import pickle
 import unittest
 from pokerhands.hand import Hand
 from pokerhands.card import Card
@@ -16,6 +18,53 @@ class HandTest(unittest.TestCase):
         hand = Hand(None)
         self.assertEqual(0, hand.number_of_cards())
 
+    def test_hand_shares_cards(self):
+        cards = Deck().pick(7)
+        hand = Hand(cards)
+        self.assertIsInstance(hand.cards, tuple)
+        self.assertEqual(set(cards), set(hand.cards))
+        for card in hand.cards:
+            self.assertIn(card, cards)
+
+    def test_hands_with_same_cards_are_equal(self):
+        cards = Deck().pick(5)
+        hand = Hand(cards)
+        reversed_hand = Hand(list(reversed(cards)))
+        self.assertEqual(hand, reversed_hand)
+        self.assertEqual(hash(hand), hash(reversed_hand))
+        self.assertEqual(1, len({hand, reversed_hand}))
+
+    def test_from_codes(self):
+        hand = Hand(Deck().pick(5))
+        self.assertEqual(hand, Hand.from_codes(hand.get_codes()))
+        self.assertEqual(sorted(hand.get_codes()), list(hand.get_codes()))
+
+    def test_hand_is_immutable(self):
+        hand = Hand.from_codes((0, 5, 10, 15, 20))
+        self.assertRaises(AttributeError, setattr, hand, "cards", ())
+        self.assertRaises(AttributeError, setattr, hand, "_classification", 1)
+        self.assertEqual(5, hand.number_of_cards())
+        self.assertEqual(hand, pickle.loads(pickle.dumps(hand)))
+        self.assertEqual(hand, copy.copy(hand))
+
+    def test_rank_histogram_and_suit_masks(self):
+        cards = [
+            Card(Rank.NINE, Suit.CLUBS),
+            Card(Rank.NINE, Suit.HEARTS),
+            Card(Rank.TEN, Suit.CLUBS),
+            Card(Rank.TWO, Suit.SPADES),
+        ]
+        hand = Hand(cards)
+        histogram = hand.get_rank_histogram()
+        self.assertEqual(2, histogram[Rank.NINE.value - 2])
+        self.assertEqual(1, histogram[Rank.TEN.value - 2])
+        self.assertEqual(4, sum(histogram))
+        spades, hearts, clubs, diamonds = hand.get_suit_masks()
+        self.assertEqual(1 << 0, spades)
+        self.assertEqual(1 << 7, hearts)
+        self.assertEqual((1 << 7) | (1 << 8), clubs)
+        self.assertEqual(0, diamonds)
+
     def test_invalid_hand_rank(self):
         cards = [
             Card(Rank.ACE, Suit.CLUBS),
@@ -48,6 +97,20 @@ class HandTest(unittest.TestCase):
         hand = Hand(cards)
         self.assertEqual(10, hand.get_hand_rank())
         self.assertEqual("Royal flush of clubs", hand.describe_hand_rank())
+        self.assertEqual(
+            "Royal flush of clubs", hand.get_hand_rank_object().describe_hand()
+        )
+
+    def test_equivalence_class(self):
+        cards = [
+            Card(Rank.ACE, Suit.CLUBS),
+            Card(Rank.KING, Suit.CLUBS),
+            Card(Rank.QUEEN, Suit.CLUBS),
+            Card(Rank.JACK, Suit.CLUBS),
+            Card(Rank.TEN, Suit.CLUBS),
+        ]
+        self.assertEqual(1, Hand(cards).get_equivalence_class())
+        self.assertEqual(0, Hand(cards[:4]).get_equivalence_class())
 
     def test_four_of_a_kind(self):
         cards = [
@@ -108,6 +171,66 @@ class HandTest(unittest.TestCase):
         self.assertEqual(9, hand.get_hand_rank())
         self.assertEqual("Straight flush, king high", hand.describe_hand_rank())
 
+    def test_wheel_straight(self):
+        cards = [
+            Card(Rank.ACE, Suit.CLUBS),
+            Card(Rank.TWO, Suit.HEARTS),
+            Card(Rank.THREE, Suit.CLUBS),
+            Card(Rank.FOUR, Suit.DIAMONDS),
+            Card(Rank.FIVE, Suit.CLUBS),
+        ]
+        hand = Hand(cards)
+        self.assertTrue(hand.is_straight())
+        self.assertEqual(5, hand.get_hand_rank())
+        self.assertEqual("Straight, five high", hand.describe_hand_rank())
+
+    def test_wheel_straight_flush(self):
+        cards = [
+            Card(Rank.ACE, Suit.SPADES),
+            Card(Rank.TWO, Suit.SPADES),
+            Card(Rank.THREE, Suit.SPADES),
+            Card(Rank.FOUR, Suit.SPADES),
+            Card(Rank.FIVE, Suit.SPADES),
+        ]
+        hand = Hand(cards)
+        self.assertFalse(hand.is_royal_flush())
+        self.assertEqual(9, hand.get_hand_rank())
+        self.assertEqual("Straight flush, five high", hand.describe_hand_rank())
+
+    def test_predicates_are_exclusive(self):
+        cards = [
+            Card(Rank.NINE, Suit.CLUBS),
+            Card(Rank.NINE, Suit.HEARTS),
+            Card(Rank.NINE, Suit.DIAMONDS),
+            Card(Rank.TEN, Suit.SPADES),
+            Card(Rank.TEN, Suit.CLUBS),
+        ]
+        hand = Hand(cards)
+        predicates = [
+            hand.is_royal_flush(),
+            hand.is_straight_flush(),
+            hand.is_four_of_a_kind(),
+            hand.is_full_house(),
+            hand.is_flush(),
+            hand.is_straight(),
+            hand.is_three_of_a_kind(),
+            hand.is_two_pair(),
+            hand.is_one_pair(),
+        ]
+        self.assertEqual(1, predicates.count(True))
+        self.assertTrue(hand.is_full_house())
+
+    def test_unrankable_hand_predicates(self):
+        hand = Hand(
+            [
+                Card(Rank.NINE, Suit.CLUBS),
+                Card(Rank.NINE, Suit.HEARTS),
+                Card(Rank.NINE, Suit.DIAMONDS),
+            ]
+        )
+        self.assertFalse(hand.is_three_of_a_kind())
+        self.assertEqual(0, hand.get_hand_rank())
+
     def test_three_of_a_kind(self):
         cards = [
             Card(Rank.NINE, Suit.CLUBS),
@@ -151,6 +274,10 @@ class HandTest(unittest.TestCase):
         ]
         hand = Hand(cards)
         self.assertEqual("High card ten of diamonds", hand.describe_hand_rank())
+        other_suit = [Card(card.rank, Suit.HEARTS) for card in cards[:3]] + cards[3:]
+        self.assertEqual(
+            "High card ten of hearts", Hand(other_suit).describe_hand_rank()
+        )
 
     def test_flush_compared_to_straight(self):
         flush_cards = [
@@ -220,6 +347,79 @@ class HandTest(unittest.TestCase):
         self.assertEqual("One pair of tens", pair_hand.describe_hand_rank())
         self.assertTrue(high_card_hand.compare_to(pair_hand) < 0)
 
+    def test_pair_compared_on_kickers(self):
+        pair_with_queen = Hand(
+            [
+                Card(Rank.NINE, Suit.CLUBS),
+                Card(Rank.NINE, Suit.HEARTS),
+                Card(Rank.QUEEN, Suit.DIAMONDS),
+                Card(Rank.SIX, Suit.SPADES),
+                Card(Rank.TWO, Suit.CLUBS),
+            ]
+        )
+        pair_with_queen_three = Hand(
+            [
+                Card(Rank.NINE, Suit.DIAMONDS),
+                Card(Rank.NINE, Suit.SPADES),
+                Card(Rank.QUEEN, Suit.CLUBS),
+                Card(Rank.SIX, Suit.HEARTS),
+                Card(Rank.THREE, Suit.CLUBS),
+            ]
+        )
+        self.assertTrue(pair_with_queen.compare_to(pair_with_queen_three) < 0)
+        self.assertTrue(pair_with_queen_three.compare_to(pair_with_queen) > 0)
+
+    def test_equal_hands_in_different_suits(self):
+        clubs_high = Hand(
+            [
+                Card(Rank.ACE, Suit.CLUBS),
+                Card(Rank.JACK, Suit.HEARTS),
+                Card(Rank.NINE, Suit.DIAMONDS),
+                Card(Rank.SIX, Suit.SPADES),
+                Card(Rank.TWO, Suit.CLUBS),
+            ]
+        )
+        spades_high = Hand(
+            [
+                Card(Rank.ACE, Suit.SPADES),
+                Card(Rank.JACK, Suit.CLUBS),
+                Card(Rank.NINE, Suit.HEARTS),
+                Card(Rank.SIX, Suit.DIAMONDS),
+                Card(Rank.TWO, Suit.SPADES),
+            ]
+        )
+        self.assertEqual(0, clubs_high.compare_to(spades_high))
+        self.assertEqual(clubs_high.get_hand_score(), spades_high.get_hand_score())
+
+    def test_wheel_compared_to_six_high_straight(self):
+        wheel = Hand(
+            [
+                Card(Rank.ACE, Suit.CLUBS),
+                Card(Rank.TWO, Suit.HEARTS),
+                Card(Rank.THREE, Suit.CLUBS),
+                Card(Rank.FOUR, Suit.DIAMONDS),
+                Card(Rank.FIVE, Suit.CLUBS),
+            ]
+        )
+        six_high = Hand(
+            [
+                Card(Rank.SIX, Suit.CLUBS),
+                Card(Rank.TWO, Suit.HEARTS),
+                Card(Rank.THREE, Suit.CLUBS),
+                Card(Rank.FOUR, Suit.DIAMONDS),
+                Card(Rank.FIVE, Suit.CLUBS),
+            ]
+        )
+        self.assertTrue(wheel.compare_to(six_high) < 0)
+
+    def test_sort_hands_by_score(self):
+        deck = Deck()
+        hands = [Hand(deck.pick(5)) for _ in range(10)]
+        ordered = sorted(hands, key=Hand.get_hand_score)
+        for lower, higher in zip(ordered, ordered[1:]):
+            self.assertTrue(lower.compare_to(higher) <= 0)
+        self.assertIs(ordered[-1], max(hands, key=Hand.get_hand_score))
+
     def test_best_hand_straight_flush(self):
         # Test when the best hand is a royal flush of hearts
         cards = [
@@ -248,6 +448,40 @@ class HandTest(unittest.TestCase):
         best_hand = Hand(cards).find_best_hand()
         self.assertEqual(best_hand.describe_hand_rank(), "Full house, queens over tens")
 
+    def test_best_hand_resolves_kickers(self):
+        cards = [
+            Card(Rank.ACE, Suit.HEARTS),
+            Card(Rank.ACE, Suit.DIAMONDS),
+            Card(Rank.KING, Suit.HEARTS),
+            Card(Rank.NINE, Suit.CLUBS),
+            Card(Rank.SEVEN, Suit.SPADES),
+            Card(Rank.FOUR, Suit.CLUBS),
+            Card(Rank.TWO, Suit.CLUBS),
+        ]
+        best_hand = Hand(cards).find_best_hand()
+        self.assertEqual(5, best_hand.number_of_cards())
+        self.assertEqual(
+            [Rank.SEVEN, Rank.NINE, Rank.KING, Rank.ACE, Rank.ACE],
+            [card.rank for card in best_hand.cards],
+        )
+
+    def test_best_hand_wheel(self):
+        cards = [
+            Card(Rank.ACE, Suit.HEARTS),
+            Card(Rank.TWO, Suit.DIAMONDS),
+            Card(Rank.THREE, Suit.HEARTS),
+            Card(Rank.FOUR, Suit.CLUBS),
+            Card(Rank.FIVE, Suit.SPADES),
+            Card(Rank.KING, Suit.CLUBS),
+            Card(Rank.KING, Suit.DIAMONDS),
+        ]
+        best_hand = Hand(cards).find_best_hand()
+        self.assertEqual("Straight, five high", best_hand.describe_hand_rank())
+
+    def test_best_hand_from_whole_deck(self):
+        best_hand = Hand(Deck().pick(52)).find_best_hand()
+        self.assertEqual(10, best_hand.get_hand_rank())
+
     def test_not_enough_cards(self):
         # Test when there are not enough cards to form a hand
         cards = [
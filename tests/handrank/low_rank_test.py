@@ -0,0 +1,27 @@
+import unittest
+
+from pokerhands.handrank.low_rank import LowRank
+from pokerhands.rank import Rank
+
+
+class LowRankTest(unittest.TestCase):
+    def test_compare(self):
+        wheel = LowRank([Rank.ACE, Rank.TWO, Rank.THREE, Rank.FOUR, Rank.FIVE])
+        six_low = LowRank([Rank.SIX, Rank.FOUR, Rank.THREE, Rank.TWO, Rank.ACE])
+        seven_six = LowRank([Rank.SEVEN, Rank.SIX, Rank.TWO, Rank.THREE, Rank.ACE])
+        seven_five = LowRank([Rank.SEVEN, Rank.FIVE, Rank.FOUR, Rank.THREE, Rank.TWO])
+        self.assertGreater(wheel.compare_to(six_low), 0)
+        self.assertLess(seven_six.compare_to(seven_five), 0)
+        self.assertEqual(0, wheel.compare_to(wheel))
+
+    def test_describe(self):
+        low = LowRank([Rank.ACE, Rank.EIGHT, Rank.THREE, Rank.SIX, Rank.FOUR])
+        self.assertEqual("Low eight, six, four, three, ace", low.describe_hand())
+
+    def test_invalid_lows(self):
+        with self.assertRaises(ValueError):
+            LowRank([Rank.NINE, Rank.FIVE, Rank.FOUR, Rank.THREE, Rank.TWO])
+        with self.assertRaises(ValueError):
+            LowRank([Rank.TWO, Rank.TWO, Rank.FOUR, Rank.THREE, Rank.ACE])
+        with self.assertRaises(ValueError):
+            LowRank(None)
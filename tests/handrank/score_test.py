@@ -0,0 +1,23 @@
+import unittest
+
+from pokerhands.handrank.score import pack_score, score_category, score_tiebreaks
+
+
+class ScoreTest(unittest.TestCase):
+    def test_round_trip(self):
+        score = pack_score(3, [10, 9, 2])
+        self.assertEqual(3, score_category(score))
+        self.assertEqual([10, 9, 2], score_tiebreaks(score))
+
+    def test_category_outranks_tiebreaks(self):
+        self.assertTrue(
+            pack_score(2, [2, 5, 4, 3]) > pack_score(1, [14, 13, 12, 11, 9])
+        )
+
+    def test_tiebreaks_in_order(self):
+        self.assertTrue(pack_score(2, [9, 12, 6, 3]) > pack_score(2, [9, 12, 6, 2]))
+        self.assertTrue(pack_score(2, [10, 4, 3, 2]) > pack_score(2, [9, 14, 13, 12]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import importlib
+import os
+import pstats
+import tempfile
+import unittest
+
+from pokerhands import hand as hand_module
+from pokerhands import instrument
+from pokerhands.card import Card
+from pokerhands.deck import Deck
+from pokerhands.eval import evaluator
+from pokerhands.hand import Hand
+from pokerhands.instrument import OperationStats
+
+best_hand = importlib.import_module("pokerhands.eval.best_hand")
+
+
+class InstrumentTest(unittest.TestCase):
+    def setUp(self):
+        instrument.reset()
+
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+    def test_disabled_leaves_the_originals(self):
+        get_hand_rank = Hand.get_hand_rank
+        evaluate5 = evaluator.evaluate5
+        with instrument.instrumented():
+            self.assertTrue(instrument.is_enabled())
+            self.assertIsNot(get_hand_rank, Hand.get_hand_rank)
+            self.assertIsNot(evaluate5, hand_module.evaluate5)
+            self.assertIs(hand_module.evaluate5, best_hand.evaluate5)
+        self.assertFalse(instrument.is_enabled())
+        self.assertIs(get_hand_rank, Hand.get_hand_rank)
+        self.assertIs(evaluate5, evaluator.evaluate5)
+        self.assertIs(evaluate5, hand_module.evaluate5)
+        self.assertIs(evaluate5, best_hand.evaluate5)
+
+    def test_counts_calls_and_cache_hits(self):
+        Hand([Card.from_code(code) for code in range(5)]).get_hand_rank()
+        self.assertEqual({"operations": {}, "caches": {}}, instrument.get_report())
+
+        with instrument.instrumented():
+            deck = Deck()
+            hand = Hand(deck.pick(5))
+            hand.get_hand_rank()
+            hand.get_hand_rank()
+            hand.describe_hand_rank()
+
+        self.assertEqual(1, instrument.get_operation_stats("deck.new").calls)
+        self.assertEqual(1, instrument.get_operation_stats("deck.pick").calls)
+        self.assertEqual(2, instrument.get_operation_stats("hand.get_hand_rank").calls)
+        self.assertEqual(1, instrument.get_operation_stats("eval.evaluate5").calls)
+        cache = instrument.get_cache_stats("hand.classification")
+        self.assertEqual((2, 1), (cache.hits, cache.misses))
+        report = instrument.get_report()
+        self.assertAlmostEqual(
+            2 / 3, report["caches"]["hand.classification"]["hit_rate"]
+        )
+
+        # Statistics are kept after disabling, and nothing more is recorded
+        Hand(Deck().pick(5)).get_hand_rank()
+        self.assertEqual(2, instrument.get_operation_stats("hand.get_hand_rank").calls)
+
+    def test_histogram(self):
+        stats = OperationStats()
+        for elapsed_ns in [100, 100, 100, 5000]:
+            stats.record(elapsed_ns)
+        self.assertEqual([(128, 3), (8192, 1)], stats.get_histogram())
+        self.assertEqual(128, stats.get_percentile_ns(0.5))
+        self.assertEqual(8192, stats.get_percentile_ns(0.99))
+        self.assertEqual(1325, stats.get_mean_ns())
+
+    def test_profiled(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rank.prof")
+
+            @instrument.profiled(path)
+            def rank():
+                return Hand(Deck().pick(5)).get_hand_rank()
+
+            rank()
+            names = [function for _, _, function in pstats.Stats(path).stats]
+        self.assertIn("get_hand_rank", names)
+
+
+if __name__ == "__main__":
+    unittest.main()
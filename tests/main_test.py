@@ -0,0 +1,67 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from main import main, process
+
+TEXT = """# board | players
+Ah Kd Qs 2c 3d | As Ks | 7h 7d
+2h3h4h5h6h
+Jc Jd 9s 9h 2d | Js 3c | Jh 4c
+"""
+
+
+def _results(output):
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+class MainTest(unittest.TestCase):
+    def test_text(self):
+        output = io.StringIO()
+        self.assertEqual(3, process(io.StringIO(TEXT), output, "text"))
+        first, second, third = _results(output)
+        self.assertEqual(2, first["id"])
+        self.assertEqual([0], first["winners"])
+        self.assertEqual([3, 2], first["ranks"])
+        self.assertEqual([9], second["ranks"])
+        self.assertEqual([0, 1], third["winners"])
+
+    def test_csv_and_ndjson(self):
+        csv_output = io.StringIO()
+        process(
+            io.StringIO("id,board,p1,p2\ndeal-1,AhKdQs2c3d,AsKs,7h7d\n"),
+            csv_output,
+            "csv",
+        )
+        ndjson_output = io.StringIO()
+        record = {"id": "deal-1", "board": "AhKdQs2c3d", "players": ["AsKs", "7h7d"]}
+        process(io.StringIO(json.dumps(record) + "\n"), ndjson_output, "ndjson")
+        self.assertEqual(csv_output.getvalue(), ndjson_output.getvalue())
+        self.assertEqual("deal-1", _results(csv_output)[0]["id"])
+
+    def test_chunks_and_workers_keep_the_order(self):
+        lines = TEXT * 20
+        inline = io.StringIO()
+        process(io.StringIO(lines), inline, "text", chunk_size=7)
+        pooled = io.StringIO()
+        process(io.StringIO(lines), pooled, "text", chunk_size=7, workers=2)
+        self.assertEqual(inline.getvalue(), pooled.getvalue())
+        self.assertEqual(60, len(_results(inline)))
+
+    def test_bad_lines(self):
+        lines = "Ah Kd | xx\nAh Kd Qs 2c 3d | Ah Ks\n2h3h4h5h6h\n"
+        with self.assertLogs(level="WARNING"):
+            output = io.StringIO()
+            self.assertEqual(1, process(io.StringIO(lines), output, "text"))
+        with self.assertRaises(ValueError):
+            process(io.StringIO(lines), io.StringIO(), "text", strict=True)
+
+    def test_missing_input(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.ndjson")
+            missing = os.path.join(directory, "missing.txt")
+            with self.assertLogs(level="ERROR"):
+                self.assertEqual(1, main([missing, "-o", output]))
+            self.assertFalse(os.path.exists(output))
@@ -0,0 +1,144 @@
+import os
+import tempfile
+import unittest
+from array import array
+from unittest import mock
+
+from pokerhands import preflop
+from pokerhands.card import Card
+from pokerhands.preflop import (
+    DEFAULT_PATH,
+    NUMBER_OF_STARTING_HANDS,
+    PreflopTable,
+    build_preflop_table,
+    parse_starting_hand,
+    starting_hand_cards,
+    starting_hand_combos,
+    starting_hand_index,
+    starting_hand_name,
+)
+from pokerhands.rank import Rank
+from pokerhands.suit import Suit
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class StartingHandTest(unittest.TestCase):
+    def test_every_combination_has_one_class(self):
+        combos = [
+            combo
+            for index in range(NUMBER_OF_STARTING_HANDS)
+            for combo in starting_hand_combos(index)
+        ]
+        self.assertEqual(1326, len(set(combos)))
+        for index in range(NUMBER_OF_STARTING_HANDS):
+            for first, second in starting_hand_combos(index):
+                self.assertEqual(index, starting_hand_index(first, second))
+
+    def test_names(self):
+        names = [starting_hand_name(index) for index in range(NUMBER_OF_STARTING_HANDS)]
+        self.assertEqual(169, len(set(names)))
+        for index, name in enumerate(names):
+            self.assertEqual(index, parse_starting_hand(name))
+        self.assertEqual(parse_starting_hand("AKs"), parse_starting_hand("KAs"))
+        self.assertEqual(6, len(starting_hand_combos(parse_starting_hand("QQ"))))
+        self.assertEqual(4, len(starting_hand_combos(parse_starting_hand("AKs"))))
+        self.assertEqual(12, len(starting_hand_combos(parse_starting_hand("T9o"))))
+
+    def test_invalid_names(self):
+        for name in ["", "A", "AK", "QQs", "AKx", "1Ks", "AKso"]:
+            self.assertRaises(ValueError, lambda: parse_starting_hand(name))
+
+    def test_cards(self):
+        index = starting_hand_index(
+            Card(Rank.ACE, Suit.HEARTS), Card(Rank.KING, Suit.HEARTS)
+        )
+        self.assertEqual("AKs", starting_hand_name(index))
+        self.assertIn(
+            (Card(Rank.KING, Suit.HEARTS), Card(Rank.ACE, Suit.HEARTS)),
+            starting_hand_cards(index),
+        )
+
+
+class PreflopTableTest(unittest.TestCase):
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_build_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "preflop.bin")
+            build_preflop_table(path, boards=30, max_players=3, deals=2000)
+            table = PreflopTable(path)
+            try:
+                self.assertEqual(3, table.max_players)
+                for hand, other in [("AA", "KK"), ("AKs", "QQ"), ("72o", "T9s")]:
+                    self.assertAlmostEqual(
+                        1.0,
+                        table.heads_up(hand, other) + table.heads_up(other, hand),
+                        5,
+                    )
+                self.assertTrue(table.heads_up("AA", "72o") > 0.7)
+                self.assertTrue(
+                    table.versus_random("AA") > table.versus_random("AA", 3)
+                )
+                self.assertRaises(ValueError, lambda: table.versus_random("AA", 4))
+            finally:
+                table.close()
+
+    def test_rejects_other_files(self):
+        with tempfile.NamedTemporaryFile(suffix=".bin", delete=False) as other:
+            other.write(b"\0" * 64)
+        try:
+            self.assertRaises(ValueError, lambda: PreflopTable(other.name))
+        finally:
+            os.remove(other.name)
+
+    def test_rejects_truncated_tables(self):
+        # The header promises rows up to 3 players, the file stops at 2
+        with tempfile.NamedTemporaryFile(suffix=".bin", delete=False) as table_file:
+            table_file.write(
+                preflop._HEADER.pack(preflop._MAGIC, preflop._VERSION, 3, 10, 10)
+            )
+            table_file.write(array("f", [0.5] * (169 * 170)).tobytes())
+        try:
+            self.assertRaises(ValueError, lambda: PreflopTable(table_file.name))
+        finally:
+            os.remove(table_file.name)
+
+    def test_big_endian_host(self):
+        # A big-endian host reads the little-endian floats swapped, which is
+        # what this host sees of a file written big-endian
+        values = array("f", [index / 1000 for index in range(169 * 170)])
+        values.byteswap()
+        with tempfile.NamedTemporaryFile(suffix=".bin", delete=False) as table_file:
+            table_file.write(
+                preflop._HEADER.pack(preflop._MAGIC, preflop._VERSION, 2, 10, 10)
+            )
+            table_file.write(values.tobytes())
+        try:
+            with mock.patch.object(preflop.sys, "byteorder", "big"):
+                table = PreflopTable(table_file.name)
+            try:
+                self.assertAlmostEqual(0.001, table.heads_up(0, 1), places=6)
+                self.assertAlmostEqual(28.561, table.versus_random(0), places=3)
+            finally:
+                table.close()
+        finally:
+            os.remove(table_file.name)
+
+    @unittest.skipUnless(os.path.exists(DEFAULT_PATH), "no preflop table shipped")
+    def test_shipped_table(self):
+        table = PreflopTable()
+        try:
+            self.assertEqual(9, table.max_players)
+            self.assertAlmostEqual(0.82, table.heads_up("AA", "KK"), delta=0.01)
+            self.assertAlmostEqual(0.85, table.versus_random("AA"), delta=0.01)
+            self.assertAlmostEqual(0.35, table.versus_random("72o"), delta=0.01)
+            self.assertTrue(table.versus_random("AA", 9) < table.versus_random("AA", 3))
+        finally:
+            table.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
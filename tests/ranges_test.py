@@ -0,0 +1,135 @@
+import unittest
+
+from pokerhands.card import Card
+from pokerhands.equity import exact_equity
+from pokerhands.ranges import Range, parse_range, range_equity
+from pokerhands.rank import Rank
+from pokerhands.suit import Suit
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FLOP = [
+    Card(Rank.TWO, Suit.CLUBS),
+    Card(Rank.SEVEN, Suit.DIAMONDS),
+    Card(Rank.KING, Suit.CLUBS),
+]
+TURN = FLOP + [Card(Rank.ACE, Suit.HEARTS)]
+
+
+class ParseRangeTest(unittest.TestCase):
+    def test_pairs(self):
+        self.assertEqual(6, parse_range("QQ").number_of_combos())
+        self.assertEqual(18, parse_range("QQ+").number_of_combos())
+        self.assertEqual(30, parse_range("QQ-88").number_of_combos())
+        self.assertEqual(30, parse_range("88-QQ").number_of_combos())
+
+    def test_unpaired_hands(self):
+        self.assertEqual(4, parse_range("AKs").number_of_combos())
+        self.assertEqual(12, parse_range("AKo").number_of_combos())
+        self.assertEqual(16, parse_range("AK").number_of_combos())
+        self.assertEqual(36, parse_range("KTo+").number_of_combos())
+        self.assertEqual(
+            parse_range("KTo, KJo, KQo").get_combos(), parse_range("KTo+").get_combos()
+        )
+        self.assertEqual(
+            parse_range("A2s, A3s, A4s, A5s").get_combos(),
+            parse_range("A5s-A2s").get_combos(),
+        )
+
+    def test_exact_combos(self):
+        ace_of_spades = Card(Rank.ACE, Suit.SPADES).code
+        king_of_hearts = Card(Rank.KING, Suit.HEARTS).code
+        self.assertEqual(
+            [(king_of_hearts, ace_of_spades)], parse_range("AsKh").get_combos()
+        )
+        self.assertEqual(
+            [(king_of_hearts, ace_of_spades)], parse_range("KhAs").get_combos()
+        )
+
+    def test_weights(self):
+        hand_range = parse_range("QQ+, AKs:0.25, AsKs:0.5")
+        self.assertEqual(22, hand_range.number_of_combos())
+        self.assertEqual(0.5, hand_range.get_weight(48, 44))
+        self.assertEqual(0.25, hand_range.get_weight(49, 45))
+        self.assertEqual(1.0, hand_range.get_weight(48, 49))
+        self.assertEqual(0.0, hand_range.get_weight(0, 1))
+        # Spaces around the colon are allowed
+        self.assertEqual(
+            parse_range("AKs:0.5, AsKs:0.25").get_weights(),
+            parse_range("AKs : 0.5, AsKs :0.25").get_weights(),
+        )
+
+    def test_without_cards(self):
+        hand_range = parse_range("AA").without_cards([51])
+        self.assertEqual(3, hand_range.number_of_combos())
+
+    def test_invalid_ranges(self):
+        for text in [
+            "QQs",
+            "AK+s",
+            "AX",
+            "A5s-K2s",
+            "A5s-A2o",
+            "AsKx",
+            "AKs:x",
+            "KAo+",
+        ]:
+            with self.assertRaises(ValueError, msg=text):
+                parse_range(text)
+        with self.assertRaises(ValueError):
+            Range([((3, 3), 1.0)])
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class RangeEquityTest(unittest.TestCase):
+    def test_single_combos_match_exact_equity(self):
+        result = range_equity("AsKs", "QhQd", board=FLOP, boards=2000, workers=1)
+        self.assertTrue(result.exact)
+        expected = exact_equity(
+            [parse_range("AsKs").get_cards()[0], parse_range("QhQd").get_cards()[0]],
+            board=FLOP,
+        )
+        self.assertAlmostEqual(expected.get_equities()[0], result.get_equity())
+
+    def test_blockers_and_weights(self):
+        hero = parse_range("AA, KQs:0.5")
+        villain = parse_range("KK, AQo")
+        result = range_equity(hero, villain, board=TURN, workers=1)
+        self.assertTrue(result.exact)
+
+        # Average the exact equity of every pair of combinations that can be
+        # dealt together, weighted by both ranges
+        live_hero = hero.without_cards([card.code for card in TURN])
+        live_villain = villain.without_cards([card.code for card in TURN])
+        shares = 0.0
+        total = 0.0
+        for hero_combo, hero_cards in zip(
+            live_hero.get_combos(), live_hero.get_cards()
+        ):
+            for villain_combo, villain_cards in zip(
+                live_villain.get_combos(), live_villain.get_cards()
+            ):
+                if set(hero_combo) & set(villain_combo):
+                    continue
+                weight = live_hero.get_weight(*hero_combo)
+                weight *= live_villain.get_weight(*villain_combo)
+                equity = exact_equity([hero_cards, villain_cards], board=TURN)
+                shares += weight * equity.get_equities()[0]
+                total += weight
+        self.assertAlmostEqual(shares / total, result.get_equity())
+        self.assertAlmostEqual(1.0, result.get_equity() + result.get_villain_equity())
+
+    def test_sampled_runouts_do_not_depend_on_workers(self):
+        inline = range_equity("QQ+, AK", "TT-88", boards=300, seed=2, workers=1)
+        pooled = range_equity("QQ+, AK", "TT-88", boards=300, seed=2, workers=2)
+        self.assertFalse(inline.exact)
+        self.assertEqual(300, inline.runouts)
+        self.assertEqual(inline.get_equity(), pooled.get_equity())
+        self.assertEqual(inline.get_combo_equities(), pooled.get_combo_equities())
+
+    def test_no_live_combos(self):
+        with self.assertRaises(ValueError):
+            range_equity("AsKs", "QQ", board=[Card(Rank.ACE, Suit.SPADES)])
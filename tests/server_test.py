@@ -0,0 +1,159 @@
+import asyncio
+import json
+import unittest
+
+from pokerhands.card import parse_cards
+from pokerhands.server import EvaluationServer, equity_batch, rank_batch
+from pokerhands.showdown import rank_players
+
+BOARD = "AhKdQs2c3d"
+PLAYERS = ["AsKs", "7h7d", "QhQd"]
+
+
+async def _exchange(requests, **options):
+    # Return the responses by id and the most requests the server ever had
+    # queued or running at once
+    async with EvaluationServer(port=0, workers=1, **options) as server:
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        for request in requests:
+            writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        responses = {}
+        for _ in requests:
+            response = json.loads(await reader.readline())
+            responses[response.get("id")] = response
+        writer.close()
+        await writer.wait_closed()
+        return responses, server._peak_in_flight
+
+
+class ServerTest(unittest.TestCase):
+    def test_rank_batch(self):
+        deals = [
+            (parse_cards(BOARD), [parse_cards(hole) for hole in PLAYERS]),
+            ([], [parse_cards("2h3h4h5h6h")]),
+        ]
+        results = rank_batch(deals)
+        self.assertEqual(rank_players(deals[0][1], deals[0][0]), results[0]["classes"])
+        self.assertEqual([2], results[0]["winners"])
+        self.assertEqual([9], results[1]["ranks"])
+
+    def test_concurrent_rank_requests(self):
+        requests = [
+            {"id": index, "op": "rank", "board": BOARD, "players": PLAYERS}
+            for index in range(50)
+        ]
+        responses, _ = asyncio.run(_exchange(requests))
+        self.assertEqual(set(range(50)), set(responses))
+        for response in responses.values():
+            self.assertEqual([2], response["winners"])
+            self.assertEqual([3, 2, 4], response["ranks"])
+
+    def test_equity_request(self):
+        request = {
+            "id": "equity",
+            "op": "equity",
+            "players": ["AsKs", "7h7d"],
+            "board": "AhKdQs",
+            "exact": True,
+        }
+        response = asyncio.run(_exchange([request]))[0]["equity"]
+        self.assertAlmostEqual(1.0, sum(response["equities"]))
+        self.assertGreater(response["equities"][0], 0.9)
+
+    def test_errors(self):
+        requests = [
+            {"id": 1, "op": "shuffle"},
+            {"id": 2, "op": "rank", "board": BOARD, "players": ["AhKs"]},
+            {
+                "id": 3,
+                "op": "rank",
+                "board": BOARD,
+                "players": PLAYERS,
+                "deadline_ms": 0,
+            },
+            {"id": 4, "board": BOARD, "players": PLAYERS, "deadline_ms": "soon"},
+            {"id": 5, "board": BOARD, "players": PLAYERS},
+            {"id": 6, "op": "equity", "players": ["AsKs"], "trials": 100},
+            {"id": 7, "op": "equity", "players": ["AsKs", "7h7d"], "trials": "many"},
+            {"id": 8, "op": "equity", "players": ["AsKs", "7h7d"], "trials": 100},
+        ]
+        responses, _ = asyncio.run(_exchange(requests))
+        self.assertIn("error", responses[1])
+        self.assertIn("error", responses[2])
+        self.assertEqual("deadline exceeded", responses[3]["error"])
+        # A bad deadline only fails its own request
+        self.assertEqual("deadline_ms must be a number", responses[4]["error"])
+        self.assertEqual([2], responses[5]["winners"])
+        self.assertIn("error", responses[6])
+        self.assertIn("error", responses[7])
+        self.assertEqual(100, responses[8]["trials"])
+
+    def test_malformed_requests_keep_the_server_running(self):
+        malformed = [
+            {"id": 1, "board": None, "players": PLAYERS},
+            {"id": 2, "board": BOARD, "players": [5]},
+            {"id": 3, "op": "equity", "players": None},
+        ]
+
+        async def exchange():
+            async with EvaluationServer(port=0, workers=1) as server:
+                reader, writer = await asyncio.open_connection(server.host, server.port)
+                responses = []
+                # Each request waits for the answer to the one before, so the
+                # valid request comes in a batch of its own
+                for request in malformed + [
+                    {"id": 4, "board": BOARD, "players": PLAYERS}
+                ]:
+                    writer.write(json.dumps(request).encode() + b"\n")
+                    responses.append(
+                        json.loads(await asyncio.wait_for(reader.readline(), 5))
+                    )
+                writer.close()
+                await writer.wait_closed()
+                return responses
+
+        responses = asyncio.run(exchange())
+        self.assertTrue(all("error" in response for response in responses[:3]))
+        self.assertEqual([2], responses[3]["winners"])
+
+    def test_equity_batch_answers_errors_per_request(self):
+        good = {"players": ["AsKs", "7h7d"], "board": "AhKdQs", "exact": True}
+        results = equity_batch([{"players": ["AsKs"]}, good])
+        self.assertIn("error", results[0])
+        self.assertGreater(results[1]["equities"][0], 0.9)
+
+    def test_close_with_open_connections(self):
+        async def connect_and_close():
+            server = EvaluationServer(port=0, workers=1)
+            await server.start()
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            writer.write(b"{}")
+            await writer.drain()
+            await asyncio.sleep(0.05)
+            await server.close()
+            self.assertEqual({}, server._clients)
+            # The server closed its end
+            self.assertEqual(b"", await reader.read())
+            writer.close()
+
+        asyncio.run(connect_and_close())
+
+    def test_backpressure_bounds_the_work_in_flight(self):
+        requests = [
+            {"id": index, "board": BOARD, "players": PLAYERS} for index in range(40)
+        ] + [
+            {
+                "id": 40 + index,
+                "op": "equity",
+                "players": ["AsKs", "7h7d"],
+                "trials": 200,
+                "seed": index,
+            }
+            for index in range(40)
+        ]
+        responses, peak = asyncio.run(_exchange(requests, max_pending=2, batch_size=4))
+        self.assertEqual(80, len(responses))
+        self.assertTrue(all("error" not in response for response in responses.values()))
+        self.assertLessEqual(peak, 2)
+        self.assertEqual(2, peak)
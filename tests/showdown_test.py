@@ -0,0 +1,95 @@
+import random
+import unittest
+
+from pokerhands.card import Card
+from pokerhands.eval import best_class
+from pokerhands.rank import Rank
+from pokerhands.showdown import build_pots, rank_players, settle
+from pokerhands.suit import Suit
+
+ACES = [Card(Rank.ACE, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS)]
+KINGS = [Card(Rank.KING, Suit.SPADES), Card(Rank.KING, Suit.HEARTS)]
+QUEENS = [Card(Rank.QUEEN, Suit.SPADES), Card(Rank.QUEEN, Suit.HEARTS)]
+OTHER_KINGS = [Card(Rank.KING, Suit.CLUBS), Card(Rank.KING, Suit.DIAMONDS)]
+BOARD = [
+    Card(Rank.TWO, Suit.CLUBS),
+    Card(Rank.SEVEN, Suit.DIAMONDS),
+    Card(Rank.NINE, Suit.CLUBS),
+    Card(Rank.JACK, Suit.DIAMONDS),
+    Card(Rank.FOUR, Suit.SPADES),
+]
+
+
+class ShowdownTest(unittest.TestCase):
+    def test_best_hand_takes_the_pot(self):
+        result = settle([KINGS, ACES, QUEENS], BOARD, [100, 100, 100])
+        self.assertEqual([0, 300, 0], result.payouts)
+        self.assertEqual((1,), result.get_winners())
+        self.assertEqual(1, len(result.pots))
+
+    def test_side_pots(self):
+        # The short stack with aces wins the main pot, kings win the side pot
+        # and the uncalled part of the biggest bet goes back to its owner
+        result = settle([ACES, KINGS, QUEENS], BOARD, [50, 200, 120])
+        self.assertEqual(
+            [(150, (0, 1, 2)), (140, (1, 2)), (80, (1,))],
+            [(pot.amount, pot.eligible) for pot in result.pots],
+        )
+        self.assertEqual([150, 220, 0], result.payouts)
+        self.assertEqual(370, sum(result.payouts))
+
+    def test_tie_splits_the_pot_and_odd_chips(self):
+        result = settle([KINGS, OTHER_KINGS, QUEENS], BOARD, [35, 35, 31])
+        self.assertEqual([51, 50, 0], result.payouts)
+        result = settle([KINGS, OTHER_KINGS, QUEENS], BOARD, [35, 35, 31], button=0)
+        self.assertEqual([50, 51, 0], result.payouts)
+
+    def test_folded_players_pay_but_cannot_win(self):
+        result = settle([ACES, KINGS, QUEENS], BOARD, [40, 100, 100], folded=[1, 0, 0])
+        self.assertEqual([0, 240, 0], result.payouts)
+        self.assertIsNone(result.classes[0])
+        result = settle([None, KINGS, QUEENS], BOARD, [40, 100, 100])
+        self.assertEqual([0, 240, 0], result.payouts)
+
+    def test_last_player_standing_needs_no_board(self):
+        result = settle([ACES, KINGS], [], [10, 30], folded=[True, False])
+        self.assertEqual([0, 40], result.payouts)
+
+    def test_payouts_add_up_to_the_contributions(self):
+        result = settle([ACES, KINGS], BOARD, [10, 0], folded=[True, False])
+        self.assertEqual([0, 10], result.payouts)
+
+        rng = random.Random(5)
+        for _ in range(300):
+            contributions = [rng.choice([0, 5, 10, 25, 40]) for _ in range(3)]
+            folded = [rng.random() < 0.4 for _ in range(3)]
+            if all(folded):
+                folded[rng.randrange(3)] = False
+            result = settle([ACES, KINGS, QUEENS], BOARD, contributions, folded)
+            self.assertEqual(sum(contributions), sum(result.payouts))
+
+    def test_build_pots_moves_unmatched_chips_down(self):
+        self.assertEqual(
+            [(130, (1, 2))], build_pots([90, 20, 20], [True, False, False])
+        )
+
+    def test_rank_players_matches_best_class(self):
+        rng = random.Random(4)
+        for _ in range(500):
+            codes = rng.sample(range(52), 11)
+            holes = [tuple(codes[start : start + 2]) for start in range(0, 6, 2)]
+            board = codes[6:]
+            self.assertEqual(
+                [best_class(list(hole) + board) for hole in holes],
+                rank_players(holes, board),
+            )
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            settle([ACES, KINGS], BOARD, [10])
+        with self.assertRaises(ValueError):
+            settle([ACES, KINGS], BOARD, [10, -1])
+        with self.assertRaises(ValueError):
+            settle([ACES, ACES], BOARD, [10, 10])
+        with self.assertRaises(ValueError):
+            settle([None, None], BOARD, [10, 10])